@@ -64,6 +64,7 @@ def merge(
     with barecat_.Barecat(
         target_path, shard_size_limit=shard_size_limit, readonly=False, overwrite=overwrite
     ) as writer:
+        path_filter = _make_path_filter(pattern, filter_rules)
         for source_path in source_paths:
             # Build prefix for this archive
             parts = []
@@ -80,7 +81,7 @@ def merge(
 
             if is_traditional_archive(source_path):
                 for file_or_dir_info, fileobj in iter_archive(source_path):
-                    if not _should_include(file_or_dir_info.path, pattern, filter_rules):
+                    if path_filter is not None and not path_filter(file_or_dir_info.path):
                         continue
                     if path_prefix:
                         file_or_dir_info.path = f'{path_prefix}/{file_or_dir_info.path}'
@@ -483,26 +484,19 @@ def get_subdir_name(archive_path):
     return name
 
 
-def _should_include(path, pattern, filter_rules):
-    """Check if path should be included based on pattern or filter rules."""
-    import re
-    from ..util.glob_to_regex import glob_to_regex
+def _make_path_filter(pattern, filter_rules):
+    """Build a predicate telling whether a path should be included based on pattern or rules.
 
-    if pattern is not None:
-        recursive = '**' in pattern
-        regex = glob_to_regex(pattern, recursive=recursive, include_hidden=True)
-        return bool(re.match(regex, path))
+    Returns None if neither a pattern nor filter rules are given (include everything).
+    """
+    from ..util.filter_rules import compile_filter
 
+    if pattern is not None:
+        return compile_filter([('+', pattern)], default_include=False)
     if filter_rules:
         # rsync-style first-match-wins
-        for sign, pat in filter_rules:
-            recursive = '**' in pat
-            regex = glob_to_regex(pat, recursive=recursive, include_hidden=True)
-            if re.match(regex, path):
-                return sign == '+'
-        return True  # default include
-
-    return True
+        return compile_filter(filter_rules, default_include=True)
+    return None
 
 
 def write_index(dictionary, target_path):
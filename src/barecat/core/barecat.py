@@ -238,6 +238,20 @@ class Barecat(MutableMapping[str, Any], AbstractContextManager):
         """
         return self.index.isfile(path)
 
+    def contains_many(self, paths: list[str]) -> dict[str, bool]:
+        """Check which of several files exist in the archive.
+
+        Equivalent to ``{p: p in self for p in paths}`` but runs a single index query.
+        Directories are ignored in this check.
+
+        Args:
+            paths: Paths to the files within the archive.
+
+        Returns:
+            A dict mapping each path to True if the file exists, False otherwise.
+        """
+        return self.index.contains_many(paths)
+
     def __len__(self) -> int:
         """Get the number of files in the archive.
 
@@ -933,6 +947,7 @@ class Barecat(MutableMapping[str, Any], AbstractContextManager):
         prefix: str = '',
         pattern: str = None,
         filter_rules: list = None,
+        workers: int = 1,
     ):
         """Merge the contents of another Barecat archive into this one.
 
@@ -943,13 +958,15 @@ class Barecat(MutableMapping[str, Any], AbstractContextManager):
             prefix: Path prefix to prepend to all paths (default: '', no prefix).
             pattern: Glob pattern to filter files (uses optimized iterglob_infos).
             filter_rules: Rsync-style include/exclude rules as list of ('+'/'-', pattern) tuples.
+            workers: Number of threads evaluating filter_rules on the source paths. Copying and
+                indexing stay serial. Mostly useful for many regex rules on free-threaded builds.
 
         Raises:
             ValueError: If the shard size limit is set and a file in the source archive is larger
                 than the shard size limit.
         """
         self._merge_helper.merge_from_other_barecat(
-            source_path, ignore_duplicates, prefix, pattern, filter_rules
+            source_path, ignore_duplicates, prefix, pattern, filter_rules, workers
         )
 
     @property
@@ -92,9 +92,13 @@ class Index(AbstractContextManager):
 
         if is_new:
             sql_dir = osp.join(osp.dirname(__file__), '../sql')
-            self.cursor.executescript(misc.read_file(f'{sql_dir}/schema.sql'))
-            self.cursor.executescript(misc.read_file(f'{sql_dir}/indexes.sql'))
-            self.cursor.executescript(misc.read_file(f'{sql_dir}/triggers.sql'))
+            # One transaction for the whole schema, otherwise each statement is committed (and
+            # synced to disk) separately, which dominates the time to create a small archive
+            scripts = [
+                misc.read_file(f'{sql_dir}/{name}.sql')
+                for name in ('schema', 'indexes', 'triggers')
+            ]
+            self.cursor.executescript('BEGIN;\n' + '\n'.join(scripts) + '\nCOMMIT;')
             with self.no_triggers():
                 self.cursor.execute(
                     "INSERT INTO dirs (path, uid, gid, mtime_ns) VALUES ('', ?, ?, ?)",
@@ -349,6 +353,23 @@ class Index(AbstractContextManager):
         path = normalize_path(path)
         return self.fetch_one('SELECT 1 FROM files WHERE path=?', (path,)) is not None
 
+    def contains_many(self, paths: list[str]) -> dict[str, bool]:
+        """Check which of several files exist in the index, using a single query.
+
+        Args:
+            paths: File paths to check. They are normalized before the check.
+
+        Returns:
+            A dict mapping each given path (as passed in) to whether a file with that path exists.
+        """
+        if not paths:
+            return {}
+        normalized_paths = [normalize_path(p) for p in paths]
+        placeholders = ','.join('?' for _ in normalized_paths)
+        query = f'SELECT path FROM files WHERE path IN ({placeholders})'
+        found = {row[0] for row in self.fetch_all(query, tuple(normalized_paths))}
+        return {p: np in found for p, np in zip(paths, normalized_paths)}
+
     def isdir(self, path):
         """Check if a directory exists in the index.
 
@@ -771,6 +792,7 @@ class Index(AbstractContextManager):
         default_include: bool = True,
         only_files: bool = False,
         bufsize: Optional[int] = None,
+        workers: int = 1,
     ) -> Iterator[BarecatEntryInfo]:
         r"""Iterate over infos matching rsync-style include/exclude rules.
 
@@ -783,12 +805,13 @@ class Index(AbstractContextManager):
             default_include: If no rule matches, include (True) or exclude (False).
             only_files: Whether to return only files, not directories.
             bufsize: Buffer size for fetching rows.
+            workers: Number of threads evaluating the rules, on batches of fetched rows.
 
         Returns:
             An iterator over matching file/directory info objects.
         """
         return self._glob_helper.iterglob_infos_incl_excl(
-            rules, default_include, only_files, bufsize
+            rules, default_include, only_files, bufsize, workers
         )
 
     ## walking
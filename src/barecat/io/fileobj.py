@@ -236,7 +236,8 @@ class BarecatReadOnlyFileObject(BarecatFileObject):
 
         size = min(len(buffer), remaining)
         self.shard_file.seek(self.position)
-        num_read = self.shard_file.readinto(buffer[:size])
+        # Slice a memoryview, since slicing a bytearray would read into a copy
+        num_read = self.shard_file.readinto(memoryview(buffer)[:size])
         self.position += num_read
         return num_read
 
@@ -425,6 +426,44 @@ class BarecatReadWriteFileObject(BarecatFileObject):
 
         return shard_data + spillover_data
 
+    def readinto(self, buffer: Union[bytearray, memoryview]) -> int:
+        """Read bytes into a buffer, starting from the current position.
+
+        Will read up to the length of the buffer or until the end of the file.
+
+        Args:
+            buffer: destination buffer to read into
+
+        Returns:
+            Number of bytes read into the buffer.
+        """
+        if not self.can_read:
+            raise io.UnsupportedOperation('not readable')
+
+        buffer = memoryview(buffer).cast('B')
+        size = min(len(buffer), self.size - self.position)
+        if size <= 0:
+            return 0
+
+        # Read from shard (original region) directly into the buffer
+        shard_read_size = min(size, max(0, self.original_size - self.position))
+        if shard_read_size > 0:
+            self.shard_file.seek(self.offset + self.position)
+            if self.shard_file.readinto(buffer[:shard_read_size]) < shard_read_size:
+                raise EOFError('Unexpected end of shard file during read')
+
+        # Read from spillover (beyond original region)
+        spillover_read_size = size - shard_read_size
+        if spillover_read_size > 0:
+            self.spillover.seek(self.position + shard_read_size - self.original_size)
+            spillover_data = self.spillover.read(spillover_read_size)
+            if len(spillover_data) < spillover_read_size:
+                raise EOFError('Unexpected end of spillover file during read')
+            buffer[shard_read_size:size] = spillover_data
+
+        self.position += size
+        return size
+
     def write(self, data: Union[bytes, bytearray, memoryview]) -> int:
         if not data:
             return 0
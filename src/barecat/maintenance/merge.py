@@ -193,6 +193,7 @@ class BarecatMergeHelper:
         prefix: str = '',
         pattern: str = None,
         filter_rules: list = None,
+        workers: int = 1,
     ):
         """Merge the contents of another Barecat archive into this one.
 
@@ -203,6 +204,8 @@ class BarecatMergeHelper:
             prefix: Path prefix to prepend to all paths (default: '', no prefix).
             pattern: Glob pattern to filter files (uses optimized iterglob_infos).
             filter_rules: Rsync-style include/exclude rules as list of ('+'/'-', pattern) tuples.
+            workers: Number of threads evaluating filter_rules on the source paths. Copying and
+                indexing stay serial. Mostly useful for many regex rules on free-threaded builds.
 
         Raises:
             ValueError: If the shard size limit is set and a file in the source archive is larger
@@ -213,7 +216,7 @@ class BarecatMergeHelper:
 
         if pattern is not None or filter_rules:
             self._merge_from_other_barecat_filtered(
-                source_path, ignore_duplicates, prefix, pattern, filter_rules
+                source_path, ignore_duplicates, prefix, pattern, filter_rules, workers
             )
             return
 
@@ -438,6 +441,7 @@ class BarecatMergeHelper:
         prefix: str,
         pattern: Union[str, None],
         filter_rules: Union[list, None],
+        workers: int = 1,
     ):
         """Merge with filtering using hybrid SQL/Python approach.
 
@@ -470,7 +474,9 @@ class BarecatMergeHelper:
                 )
             else:
                 file_infos = list(
-                    source.index.iterglob_infos_incl_excl(filter_rules, only_files=True)
+                    source.index.iterglob_infos_incl_excl(
+                        filter_rules, only_files=True, workers=workers
+                    )
                 )
 
             if not file_infos:
@@ -555,23 +561,23 @@ class BarecatMergeHelper:
                     )
                 )
 
-            # Step 4: Copy blocks
+            # Step 4: Copy blocks. With explicit offsets, copy() uses copy_file_range at those
+            # offsets, no seeking needed. Source shards need no Python-side buffering.
             src_shard_files = {}  # cache open shard files
             try:
                 for src_shard, src_offset, dst_shard_num, dst_off, size in blocks:
                     # Open source shard if needed
                     if src_shard not in src_shard_files:
                         src_shard_path = f'{source_path}-shard-{src_shard:05d}'
-                        src_shard_files[src_shard] = open(src_shard_path, 'rb')
-
-                    src_file = src_shard_files[src_shard]
-                    src_file.seek(src_offset)
-
-                    # Get dest shard file
-                    dst_file = sharder.shard_files[dst_shard_num]
-                    dst_file.seek(dst_off)
-
-                    copy(src_file, dst_file, size)
+                        src_shard_files[src_shard] = open(src_shard_path, 'rb', buffering=0)
+
+                    copy(
+                        src_shard_files[src_shard],
+                        sharder.shard_files[dst_shard_num],
+                        size,
+                        src_offset=src_offset,
+                        dst_offset=dst_off,
+                    )
             finally:
                 for f in src_shard_files.values():
                     f.close()
@@ -580,15 +586,14 @@ class BarecatMergeHelper:
         with index.no_triggers():
             maybe_ignore = 'OR IGNORE' if ignore_duplicates else ''
 
-            # Prepare file data for insert
-            file_rows = []
-            for fi, new_shard, new_offset in placements:
-                if prefix:
-                    new_path = f'{prefix}/{fi.path}' if fi.path else prefix
-                else:
-                    new_path = fi.path
-                file_rows.append(
-                    (
+            # Rows are generated while executemany consumes them, without an intermediate list
+            def file_rows():
+                for fi, new_shard, new_offset in placements:
+                    if prefix:
+                        new_path = f'{prefix}/{fi.path}' if fi.path else prefix
+                    else:
+                        new_path = fi.path
+                    yield (
                         new_path,
                         new_shard,
                         new_offset,
@@ -599,13 +604,12 @@ class BarecatMergeHelper:
                         fi.gid,
                         fi.mtime_ns,
                     )
-                )
 
             index.cursor.executemany(
                 f"""INSERT {maybe_ignore} INTO files
                     (path, shard, offset, size, crc32c, mode, uid, gid, mtime_ns)
                     VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)""",
-                file_rows,
+                file_rows(),
             )
 
         # Step 6: Create ancestor directories and update stats
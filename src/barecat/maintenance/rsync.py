@@ -9,10 +9,10 @@ Supports:
     barecat rsync --delete src/ archive.barecat::  # sync with deletion
 """
 
+import functools
 import os
 import os.path as osp
 import fnmatch
-import re
 import shutil
 import time
 from dataclasses import dataclass
@@ -37,9 +37,9 @@ TAR_EXTENSIONS = ('.tar', '.tar.gz', '.tgz', '.tar.bz2', '.tbz2', '.tar.xz', '.t
 ZIP_EXTENSIONS = ('.zip',)
 
 
-@dataclass
+@dataclass(frozen=True)
 class ParsedPath:
-    """Parsed source or destination path."""
+    """Parsed source or destination path (immutable, as parse_path caches its results)."""
 
     path_type: PathType
     host: Optional[str]  # SSH host or barecat server host:port
@@ -256,6 +256,29 @@ def _unescape(s: str) -> str:
     return ''.join(result)
 
 
+def _split_host(s: str):
+    """Split 'host:/path' into (host, '/path'), or return None if s is not of that form."""
+    colon = s.find(':')
+    if colon <= 0 or not s.startswith('/', colon + 1) or '/' in s[:colon]:
+        return None
+    return s[:colon], s[colon + 1 :]
+
+
+def _split_ssh(path: str):
+    """Split '[user@]host:/path' into (user, host, '/path'), or return None if not SSH."""
+    # Optional user@, then hostname, then :, then / (absolute path)
+    at = path.find('@')
+    if at > 0:
+        split = _split_host(path[at + 1 :])
+        if split is not None:
+            return (path[:at],) + split
+    split = _split_host(path)
+    if split is not None:
+        return (None,) + split
+    return None
+
+
+@functools.lru_cache(maxsize=1024)
 def parse_path(path: str) -> ParsedPath:
     """Parse a path with new syntax.
 
@@ -310,12 +333,9 @@ def parse_path(path: str) -> ParsedPath:
         )
 
     # Check for SSH: [user@]host:/path
-    # Pattern: optional user@, then hostname, then :, then / (absolute path)
-    ssh_match = re.match(r'^(?:([^@]+)@)?([^:/]+):(/.*?)$', path)
-    if ssh_match:
-        user = ssh_match.group(1)
-        host = ssh_match.group(2)
-        remote_path = ssh_match.group(3)
+    ssh_split = _split_ssh(path)
+    if ssh_split is not None:
+        user, host, remote_path = ssh_split
 
         # Check if remote path contains unescaped :: (archive)
         delim_idx = _find_unescaped(remote_path, '::')
@@ -0,0 +1,334 @@
+"""Compiled rsync-style include/exclude filter rules.
+
+Rules are ``(sign, pattern)`` tuples, where sign is ``'+'`` (include) or ``'-'`` (exclude) and
+pattern is a Python glob pattern with ``**`` support. Hidden files are matched by wildcards.
+A path is tested against the rules in order and the first matching rule decides ("first match
+wins"). If no rule matches, the default decides.
+"""
+
+import functools
+import re
+from typing import Iterable, Optional
+
+from .glob_to_regex import _translate, glob_to_regex
+
+_re_star_runs_sub = re.compile(r'\*{2,}').sub
+_re_magic_search = re.compile(r'[*?[]').search
+
+
+def _rule_regex(pattern: str) -> str:
+    """Translate a rule's glob pattern to a regex string (cached by glob_to_regex)."""
+    return glob_to_regex(pattern, recursive='**' in pattern, include_hidden=True)
+
+
+@functools.lru_cache(maxsize=1024)
+def _compile_rules(rules: tuple[tuple[int, str], ...]) -> re.Pattern:
+    """Compile (index, pattern) rules into one alternation regex with a named group per rule.
+
+    The alternatives are tried left to right, so the group that matched (``m.lastgroup``, named
+    ``r{index}``, or its number ``m.lastindex``) is the first of these rules matching the path.
+    Cached, so repeated rule lists compile once.
+    """
+    return re.compile('|'.join(f'(?P<r{i}>{_rule_regex(p)})' for i, p in rules))
+
+
+# Patterns matching every path, mapped to whether they need a non-empty last segment
+# (** also matches '' and 'dir/', **/* does not). Note that * alone only matches top-level names.
+_CATCH_ALL_PATTERNS = {'**': False, '**/*': True}
+
+
+# Decisions are cached per filter only if it has this many rules that need the regex. The cache
+# is kept small, since compile_filter keeps up to 64 filters (and their caches) alive
+_DECISION_CACHE_MIN_REGEX_RULES = 8
+_DECISION_CACHE_SIZE = 4096
+
+# Bracket classes are expanded to literal patterns only up to this many combinations
+_MAX_BRACKET_EXPANSIONS = 64
+
+
+def _normalize_pattern(pattern: str) -> str:
+    """Rewrite a pattern to the simplest equivalent form, so that more rules take a fast path.
+
+    Repeated ``**`` segments collapse into one (``a/**/**/b`` -> ``a/**/b``) and runs of stars
+    within a segment into a single star (``***.txt`` -> ``*.txt``), like glob_to_regex does when
+    translating. A whole segment of three or more stars is kept, since unlike ``*`` it can match
+    an empty segment.
+    """
+    if '**' not in pattern:
+        return pattern
+    parts = pattern.split('/')
+    result = []
+    for i, part in enumerate(parts):
+        if part == '**':
+            if i + 1 < len(parts) and parts[i + 1] == '**':
+                continue
+        elif '**' in part:
+            collapsed = _re_star_runs_sub('*', part)
+            if collapsed != '*':
+                part = collapsed
+        result.append(part)
+    return '/'.join(result)
+
+
+def _has_magic(pattern: str) -> bool:
+    return '*' in pattern or '?' in pattern or '[' in pattern
+
+
+def _is_name_end(s: str) -> bool:
+    """Whether s is a literal that can end a file name, like the '.txt' in '*.txt'."""
+    return bool(s) and '/' not in s and not _has_magic(s)
+
+
+def _expand_brackets(pattern: str) -> Optional[list[str]]:
+    """Expand the bracket classes of a pattern into the list of patterns they stand for.
+
+    For example, ``file_[ab].txt`` expands to ``['file_a.txt', 'file_b.txt']``. Each class is
+    resolved to its set of ASCII characters once, by testing them against the class's regex.
+
+    Returns:
+        The expanded patterns, or None if a class is negated, non-ASCII or matches a glob
+        metacharacter, or if there would be more than ``_MAX_BRACKET_EXPANSIONS`` of them.
+    """
+    expansions = ['']
+    for i_segment, segment in enumerate(pattern.split('/')):
+        if i_segment > 0:
+            expansions = [e + '/' for e in expansions]
+        i, n = 0, len(segment)
+        while i < n:
+            c = segment[i]
+            i += 1
+            chars = c
+            if c == '[':
+                # Find the closing bracket the same way glob_to_regex does
+                j = i
+                if j < n and segment[j] == '!':
+                    j += 1
+                if j < n and segment[j] == ']':
+                    j += 1
+                while j < n and segment[j] != ']':
+                    j += 1
+                if j < n:
+                    bracket = segment[i - 1 : j + 1]
+                    if bracket[1] == '!' or not bracket.isascii():
+                        return None
+                    chars = _bracket_chars(bracket)
+                    # A class escaping a wildcard ([*], [?], [[]) would expand to a character
+                    # that the literal lookups take for a wildcard again
+                    if _re_magic_search(chars):
+                        return None
+                    i = j + 1
+            expansions = [e + ch for e in expansions for ch in chars]
+            if len(expansions) > _MAX_BRACKET_EXPANSIONS:
+                return None
+    return expansions
+
+
+@functools.lru_cache(maxsize=256)
+def _bracket_chars(bracket: str) -> str:
+    """Return the ASCII characters matched by a glob bracket class such as ``[a-c_]``."""
+    regex = re.compile(''.join(_translate(bracket, '', '')[0]))
+    return ''.join(ch for ch in map(chr, range(128)) if regex.fullmatch(ch))
+
+
+class RuleFilter:
+    """A set of include/exclude rules compiled once, for testing many paths.
+
+    Rules whose pattern is a literal (``a/b.txt``), a literal directory subtree (``thumbs/**``) or
+    a literal name at any depth (``**/error.log``) are decided by dict lookups on the path and
+    its ``/``-delimited prefixes and suffixes. So are name endings (``**/*.txt``, ``*.txt``), and a
+    filter of only extension rules needs just one lookup per path. Small ASCII bracket classes
+    (``file_[abc].txt``) are expanded into several such literals. The remaining rules are fused
+    into one regex, which is only run if it could still find an earlier matching rule than the
+    lookups.
+
+    Args:
+        rules: List of (sign, pattern) tuples. sign is '+' for include, '-' for exclude.
+        default_include: If no rule matches, include (True) or exclude (False).
+    """
+
+    def __init__(self, rules: Iterable[tuple[str, str]], default_include: bool = True):
+        self.rules = list(rules)
+        self.default_include = default_include
+        # Parallel to the rules, plus the default at the end, so that index -1 picks the default
+        self._decisions = [sign == '+' for sign, _ in self.rules] + [default_include]
+
+        # A catch-all rule is not matched like the others: it decides every path that no earlier
+        # rule does (** for all paths, **/* for those with a name). Only rules after a **/* can
+        # still decide the paths without a name, such as '' and 'dir/'
+        self._catch_all_rule = None
+        self._catch_all_needs_name = False
+
+        # Literal lookup tables mapping a key to the index of the first rule with that key
+        self._exact = {}
+        self._prefixes = {}  # 'thumbs/' for thumbs/**
+        self._suffixes = {}  # 'error.log' for **/error.log
+        self._name_ends = {}  # '.txt' for **/*.txt
+        self._top_name_ends = {}  # '.txt' for *.txt
+        regex_rules = []
+        seen_patterns = set()
+        for i, (sign, pattern) in enumerate(self.rules):
+            pattern = _normalize_pattern(pattern)
+            # Skip rules that can never decide: repeated patterns and those under an earlier
+            # LITERAL/** rule's directory (e.g. thumbs/sub/** after thumbs/**)
+            if pattern in seen_patterns or self._is_under_prefix(pattern):
+                continue
+            seen_patterns.add(pattern)
+
+            if pattern in _CATCH_ALL_PATTERNS and self._catch_all_rule is None:
+                self._catch_all_rule = i
+                self._catch_all_needs_name = _CATCH_ALL_PATTERNS[pattern]
+            else:
+                # Bracket classes like file_[ab].txt are expanded to several literal keys
+                literals = [pattern] if '[' not in pattern else _expand_brackets(pattern)
+                keys = [self._literal_key(p) for p in literals] if literals is not None else [None]
+                if all(key is not None for key in keys):
+                    for table, key in keys:
+                        table.setdefault(key, i)
+                else:
+                    regex_rules.append((i, pattern))
+
+            # ** matches every path, so the rules after it are never reached
+            if pattern == '**':
+                break
+
+        self._name_end_lengths = sorted({len(k) for k in self._name_ends})
+        self._top_name_end_lengths = sorted({len(k) for k in self._top_name_ends})
+        self._regex = _compile_rules(tuple(regex_rules)) if regex_rules else None
+        self._first_regex_rule = regex_rules[0][0] if regex_rules else None
+        # Rule index for each group number of the fused regex (m.lastindex is the outermost group)
+        self._group_rules = [None] + [i for i, _ in regex_rules]
+
+        # Rule sets of only file extensions (**/*.jpg, *.png, ...) are decided by looking up the
+        # part of the name from its last dot, a single probe per table instead of one per length
+        if (
+            self._regex is None
+            and not (self._exact or self._prefixes or self._suffixes)
+            and all(
+                key[0] == '.' and '.' not in key[1:]
+                for table in (self._name_ends, self._top_name_ends)
+                for key in table
+            )
+        ):
+            self.match_index = self._match_extension
+
+        # With many regex rules, the fused regex costs more than a dict lookup, so remember the
+        # decisions (e.g. for the same paths being filtered in several merges)
+        if len(regex_rules) >= _DECISION_CACHE_MIN_REGEX_RULES:
+            self.match_index = functools.lru_cache(maxsize=_DECISION_CACHE_SIZE)(self.match_index)
+
+    def __call__(self, path: str) -> bool:
+        """Return whether the path is included by the rules."""
+        return self._decisions[self.match_index(path)]
+
+    def match_index(self, path: str) -> int:
+        """Return the index of the first rule matching the path, or -1 if no rule matches."""
+        i_rule = self._first_literal_match(path)
+        if self._regex is not None and (i_rule is None or i_rule > self._first_regex_rule):
+            m = self._regex.match(path)
+            if m is not None:
+                i_regex = self._group_rules[m.lastindex]
+                if i_rule is None or i_regex < i_rule:
+                    i_rule = i_regex
+        return self._with_catch_all(path, i_rule)
+
+    def _match_extension(self, path: str) -> int:
+        """match_index for filters whose rules are all file extension rules."""
+        last_slash = path.rfind('/')
+        dot = path.rfind('.')
+        i_rule = None
+        if dot > last_slash:
+            ext = path[dot:]
+            # **/ needs a non-empty directory part before the last slash, if there is one
+            if last_slash != 0:
+                i_rule = self._name_ends.get(ext)
+            if last_slash < 0:
+                i_top = self._top_name_ends.get(ext)
+                if i_top is not None and (i_rule is None or i_top < i_rule):
+                    i_rule = i_top
+        return self._with_catch_all(path, i_rule)
+
+    def _with_catch_all(self, path: str, i_rule: Optional[int]) -> int:
+        """Return the deciding rule index, given the first matching non-catch-all rule."""
+        if self._catch_all_rule is not None and (i_rule is None or i_rule > self._catch_all_rule):
+            # **/* needs a name, and a non-empty directory part before it if there is a slash
+            if not self._catch_all_needs_name or (
+                path and path[-1] != '/' and path.rfind('/') != 0
+            ):
+                return self._catch_all_rule
+        return -1 if i_rule is None else i_rule
+
+    def _literal_key(self, pattern: str) -> Optional[tuple[dict, str]]:
+        """Return the lookup table and key deciding the pattern, or None if it needs a regex."""
+        if not _has_magic(pattern):
+            return self._exact, pattern
+        if pattern.endswith('/**') and not _has_magic(pattern[:-3]):
+            return self._prefixes, pattern[:-2]
+        if pattern.startswith('**/') and pattern[3:] and not _has_magic(pattern[3:]):
+            return self._suffixes, pattern[3:]
+        if pattern.startswith('**/*') and _is_name_end(pattern[4:]):
+            return self._name_ends, pattern[4:]
+        if pattern.startswith('*') and _is_name_end(pattern[1:]):
+            return self._top_name_ends, pattern[1:]
+        return None
+
+    def _is_under_prefix(self, pattern: str) -> bool:
+        """Whether all paths matching the pattern start with a prefix already in the table."""
+        magic = _re_magic_search(pattern)
+        head = pattern[: magic.start()] if magic else pattern
+        slash = head.find('/')
+        while slash >= 0:
+            if head[: slash + 1] in self._prefixes:
+                return True
+            slash = head.find('/', slash + 1)
+        return False
+
+    def _first_literal_match(self, path: str) -> Optional[int]:
+        """Return the index of the first literal-table rule matching the path, or None."""
+        candidates = [self._exact.get(path), self._suffixes.get(path)]
+        if self._prefixes or self._suffixes:
+            last_slash = -1
+            slash = path.find('/')
+            while slash >= 0:
+                candidates.append(self._prefixes.get(path[: slash + 1]))
+                # **/ needs a non-empty directory part before the slash
+                if slash > 0:
+                    candidates.append(self._suffixes.get(path[slash + 1 :]))
+                last_slash = slash
+                slash = path.find('/', slash + 1)
+        else:
+            last_slash = path.rfind('/')
+
+        # Name endings are looked up in the last segment, split off once for all lengths
+        if self._name_end_lengths or self._top_name_end_lengths:
+            name = path[last_slash + 1 :]
+            len_name = len(name)
+            # **/ needs a non-empty directory part before the last slash, if there is one
+            if last_slash != 0:
+                for length in self._name_end_lengths:
+                    if length > len_name:
+                        break
+                    candidates.append(self._name_ends.get(name[-length:]))
+            if last_slash < 0:
+                for length in self._top_name_end_lengths:
+                    if length > len_name:
+                        break
+                    candidates.append(self._top_name_ends.get(name[-length:]))
+        return min((i for i in candidates if i is not None), default=None)
+
+
+@functools.lru_cache(maxsize=64)
+def _compile_filter(rules: tuple[tuple[str, str], ...], default_include: bool) -> RuleFilter:
+    return RuleFilter(rules, default_include)
+
+
+def compile_filter(rules: Iterable[tuple[str, str]], default_include: bool = True) -> RuleFilter:
+    """Return a RuleFilter for the rules, reusing the one built last time for the same rules.
+
+    Args:
+        rules: List of (sign, pattern) tuples. sign is '+' for include, '-' for exclude.
+        default_include: If no rule matches, include (True) or exclude (False).
+
+    Returns:
+        The compiled filter.
+    """
+    return _compile_filter(tuple((sign, pattern) for sign, pattern in rules), default_include)
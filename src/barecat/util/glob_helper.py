@@ -4,6 +4,9 @@ This module provides the GlobHelper class which handles all glob-related operati
 for the Index class, including path and info globbing with Python glob compatibility.
 """
 
+import collections
+import concurrent.futures
+import itertools
 import re
 from typing import Iterator, Optional, TYPE_CHECKING
 
@@ -14,14 +17,19 @@ else:
     from ..core.types import BarecatDirInfo, BarecatFileInfo, BarecatEntryInfo, Order
 
 from ..exceptions import FileNotFoundBarecatError
+from ..util.filter_rules import compile_filter
 from ..util.glob_to_regex import (
     glob_to_regex,
     glob_to_sqlite,
     expand_doublestar,
     pattern_to_sql_exclude,
+    subtree_range,
 )
 from ..core.paths import normalize_path
 
+# Number of rows whose filter decisions are made in one task when filtering with several workers
+_FILTER_BATCH_SIZE = 10000
+
 
 class GlobHelper:
     """Handles glob operations for an Index instance.
@@ -135,12 +143,14 @@ class GlobHelper:
         Returns:
             An iterator over the paths.
         """
-        regex_pattern = glob_to_regex(pattern, recursive=recursive, include_hidden=include_hidden)
+        regex = re.compile(
+            glob_to_regex(pattern, recursive=recursive, include_hidden=include_hidden)
+        )
         try:
             for candidate in self._iterglob_paths_unfiltered(
                 pattern, recursive=recursive, bufsize=bufsize, only_files=only_files
             ):
-                if re.match(regex_pattern, candidate):
+                if regex.match(candidate):
                     yield candidate
         except FileNotFoundBarecatError:
             return
@@ -195,7 +205,7 @@ class GlobHelper:
             return
 
         # Regex for fast short-circuit before exists check (include_hidden=True to not filter here)
-        regex_pattern = glob_to_regex(pattern, recursive=recursive, include_hidden=True)
+        regex = re.compile(glob_to_regex(pattern, recursive=recursive, include_hidden=True))
         if (not recursive or '**' not in pattern) and num_has_wildcard == 1 and has_no_brackets:
             parts = pattern.split('/')
             i_has_wildcard = next(i for i, p in enumerate(parts) if '*' in p or '?' in p)
@@ -218,7 +228,7 @@ class GlobHelper:
                     ) or subdirinfo.num_entries == 0:
                         continue
                     candidate = subdirinfo.path + '/' + suffix
-                    if re.match(regex_pattern, candidate) and (
+                    if regex.match(candidate) and (
                         (self._index.exists(candidate) and not only_files)
                         or self._index.isfile(candidate)
                     ):
@@ -331,12 +341,14 @@ class GlobHelper:
         Returns:
             An iterator over the file and directory info objects.
         """
-        regex_pattern = glob_to_regex(pattern, recursive=recursive, include_hidden=include_hidden)
+        regex = re.compile(
+            glob_to_regex(pattern, recursive=recursive, include_hidden=include_hidden)
+        )
         try:
             for info in self._iterglob_infos_unfiltered(
                 pattern, recursive=recursive, bufsize=bufsize, only_files=only_files
             ):
-                if re.match(regex_pattern, info.path):
+                if regex.match(info.path):
                     yield info
         except FileNotFoundBarecatError:
             return
@@ -391,7 +403,7 @@ class GlobHelper:
             return
 
         # Regex for fast short-circuit before exists check (include_hidden=True to not filter here)
-        regex_pattern = glob_to_regex(pattern, recursive=recursive, include_hidden=True)
+        regex = re.compile(glob_to_regex(pattern, recursive=recursive, include_hidden=True))
         if (not recursive or '**' not in pattern) and num_has_wildcard == 1 and has_no_brackets:
             parts = pattern.split('/')
             i_has_wildcard = next(i for i, p in enumerate(parts) if '*' in p or '?' in p)
@@ -414,7 +426,7 @@ class GlobHelper:
                     ) or subdirinfo.num_entries == 0:
                         continue
                     candidate_path = subdirinfo.path + '/' + suffix
-                    if re.match(regex_pattern, candidate_path):
+                    if regex.match(candidate_path):
                         try:
                             yield (
                                 self._index.lookup_file(candidate_path)
@@ -441,6 +453,7 @@ class GlobHelper:
         default_include: bool = True,
         only_files: bool = False,
         bufsize: Optional[int] = None,
+        workers: int = 1,
     ) -> Iterator['BarecatEntryInfo']:
         """Iterate over infos matching rsync-style include/exclude rules.
 
@@ -453,6 +466,8 @@ class GlobHelper:
             default_include: If no rule matches, include (True) or exclude (False).
             only_files: Whether to return only files, not directories.
             bufsize: Buffer size for fetching rows.
+            workers: Number of threads evaluating the rules, on batches of fetched rows. Results
+                are yielded in the same order as with a single worker.
 
         Returns:
             Iterator over matching file/directory info objects.
@@ -478,20 +493,16 @@ class GlobHelper:
         # GLOB inc1_over OR (NOT exc1_sql AND (GLOB inc2_over OR (... OR 1)))
         sql_expr, params = self._build_filter_sql(rules, default_include)
 
-        # Precompute regex patterns for Python filtering
-        rule_regexes = [
-            (sign, glob_to_regex(p, recursive='**' in p, include_hidden=True)) for sign, p in rules
-        ]
+        # Compile the rules once for precise Python filtering
+        rule_filter = compile_filter(rules, default_include)
 
         fquery = f"""
             SELECT path, shard, offset, size, crc32c, mode, uid, gid, mtime_ns
             FROM files WHERE {sql_expr}
             """
-        for info in self._index.fetch_iter(
-            fquery, params, bufsize=bufsize, rowcls=BarecatFileInfo
-        ):
-            if self._first_match_wins(info.path, rule_regexes, default_include):
-                yield info
+        yield from self._iter_filtered(
+            fquery, params, BarecatFileInfo, rule_filter, bufsize, workers
+        )
 
         if only_files:
             return
@@ -501,9 +512,37 @@ class GlobHelper:
                    mode, uid, gid, mtime_ns
             FROM dirs WHERE {sql_expr}
             """
-        for info in self._index.fetch_iter(dquery, params, bufsize=bufsize, rowcls=BarecatDirInfo):
-            if self._first_match_wins(info.path, rule_regexes, default_include):
-                yield info
+        yield from self._iter_filtered(
+            dquery, params, BarecatDirInfo, rule_filter, bufsize, workers
+        )
+
+    def _iter_filtered(self, query, params, rowcls, rule_filter, bufsize, workers=1):
+        """Run a query whose first column is the path, yielding infos for the included rows.
+
+        Rows are filtered in the same pass as they are fetched, and info objects are only built
+        for the rows that pass the filter. With several workers, batches of rows are filtered in
+        a thread pool while further rows are fetched, keeping at most two batches per worker in
+        flight.
+        """
+        cursor = self._index.conn.cursor()
+        rows = self._index.fetch_iter(query, params, cursor=cursor, bufsize=bufsize)
+        if workers <= 1:
+            for row in rows:
+                if rule_filter(row[0]):
+                    yield rowcls.row_factory(cursor, row)
+            return
+
+        batches = iter(lambda: list(itertools.islice(rows, _FILTER_BATCH_SIZE)), [])
+        with concurrent.futures.ThreadPoolExecutor(workers) as executor:
+            pending = collections.deque()
+            for batch in batches:
+                pending.append(executor.submit(_filter_rows, rule_filter, batch))
+                if len(pending) >= 2 * workers:
+                    for row in pending.popleft().result():
+                        yield rowcls.row_factory(cursor, row)
+            while pending:
+                for row in pending.popleft().result():
+                    yield rowcls.row_factory(cursor, row)
 
     def _build_filter_sql(
         self, rules: list[tuple[str, str]], default_include: bool
@@ -534,26 +573,37 @@ class GlobHelper:
 
         for sign, pattern in reversed(rules):
             if sign == '+':
-                # Include: overmatch with GLOB (SQLite * matches /, that's OK)
-                sqlite_patterns = expand_doublestar(
-                    glob_to_sqlite(pattern), recursive='**' in pattern
-                )
-                if len(sqlite_patterns) == 1:
-                    pname = add_param(sqlite_patterns[0])
-                    inc_expr = f'path GLOB :{pname}'
+                if expr == '1':
+                    continue  # Everything is included anyway
+                bounds = subtree_range(pattern)
+                if bounds is not None:
+                    # Include a whole subtree: an index range scan
+                    lo, hi = add_param(bounds[0]), add_param(bounds[1])
+                    inc_expr = f'(path >= :{lo} AND path < :{hi})'
                 else:
-                    parts = []
-                    for sp in sqlite_patterns:
-                        pname = add_param(sp)
-                        parts.append(f'path GLOB :{pname}')
-                    inc_expr = '(' + ' OR '.join(parts) + ')'
-                expr = f'{inc_expr} OR ({expr})'
+                    # Include: overmatch with GLOB (SQLite * matches /, that's OK)
+                    sqlite_patterns = expand_doublestar(
+                        glob_to_sqlite(pattern), recursive='**' in pattern
+                    )
+                    if len(sqlite_patterns) == 1:
+                        pname = add_param(sqlite_patterns[0])
+                        inc_expr = f'path GLOB :{pname}'
+                    else:
+                        parts = []
+                        for sp in sqlite_patterns:
+                            pname = add_param(sp)
+                            parts.append(f'path GLOB :{pname}')
+                        inc_expr = '(' + ' OR '.join(parts) + ')'
+                # Without the "OR (0)" tail, SQLite can use the index for the include condition
+                expr = inc_expr if expr == '0' else f'{inc_expr} OR ({expr})'
             else:
                 # Special case: -x '**' means "exclude everything else"
                 # Just set expr to 0 (no additional clause needed)
                 if pattern == '**':
                     expr = '0'
                     continue
+                if expr == '0':
+                    continue  # Nothing is included anyway
 
                 # Exclude: try SQL-optimized pattern first
                 sql_excl = pattern_to_sql_exclude(pattern)
@@ -563,7 +613,7 @@ class GlobHelper:
                     for k, v in excl_params.items():
                         new_name = add_param(v)
                         excl_sql = excl_sql.replace(f':{k}', f':{new_name}')
-                    expr = f'NOT ({excl_sql}) AND ({expr})'
+                    expr = f'NOT ({excl_sql})' if expr == '1' else f'NOT ({excl_sql}) AND ({expr})'
                 else:
                     # Fallback: undermatch by replacing ** with * (doesn't cross /)
                     undermatch = pattern.replace('**/', '*/').replace('/**', '/*')
@@ -571,14 +621,11 @@ class GlobHelper:
                         undermatch = pattern.replace('**', '*')
                     sqlite_pat = glob_to_sqlite(undermatch)
                     pname = add_param(sqlite_pat)
-                    expr = f'NOT (path GLOB :{pname}) AND ({expr})'
+                    excl_sql = f'path GLOB :{pname}'
+                    expr = f'NOT ({excl_sql})' if expr == '1' else f'NOT ({excl_sql}) AND ({expr})'
 
         return expr, params
 
-    @staticmethod
-    def _first_match_wins(path: str, rule_regexes: list[tuple[str, str]], default: bool) -> bool:
-        """Apply rsync-style first-match-wins logic."""
-        for sign, regex in rule_regexes:
-            if re.match(regex, path):
-                return sign == '+'
-        return default
+
+def _filter_rows(rule_filter, rows):
+    return [row for row in rows if rule_filter(row[0])]
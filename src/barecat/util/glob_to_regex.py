@@ -7,6 +7,7 @@ _re_setops_sub = re.compile(r'([&~|])').sub
 _re_escape = functools.lru_cache(maxsize=512)(re.escape)
 
 
+@functools.lru_cache(maxsize=1024)
 def glob_to_regex(pat, *, recursive=False, include_hidden=False, seps=None):
     """Translate a pathname with shell wildcards to a regular expression.
 
@@ -19,6 +20,8 @@ def glob_to_regex(pat, *, recursive=False, include_hidden=False, seps=None):
     If a sequence of separator characters is given to `seps`, they will be
     used to split the pattern into segments and match path separators. If not
     given, os.path.sep and os.path.altsep (where available) are used.
+
+    Results are cached, so repeated translations of the same pattern are free.
     """
     if not seps:
         if os.path.altsep:
@@ -253,7 +256,7 @@ def pattern_to_sql_exclude(pattern):
     - '*.ext' (root only) -> parent = '' AND path GLOB '*.ext'
     - 'dir/*.ext' (direct children) -> parent = 'dir' AND path GLOB 'dir/*.ext'
     - '**/*.ext' (any depth) -> path GLOB '*.ext'
-    - 'dir/**' (entire subtree) -> path GLOB 'dir/*'
+    - 'dir/**' (entire subtree) -> path >= 'dir/' AND path < 'dir0' (an index range)
     - '**/dir/**' (dir at any depth) -> path GLOB '*/dir/*' OR path GLOB 'dir/*'
     """
     # Case 1: **/*.ext or **/* - any depth with suffix
@@ -263,6 +266,9 @@ def pattern_to_sql_exclude(pattern):
 
     # Case 2: dir/** - entire subtree
     if pattern.endswith('/**') and '**' not in pattern[:-3] and '*' not in pattern[:-3]:
+        bounds = subtree_range(pattern)
+        if bounds is not None:
+            return 'path >= :lo AND path < :hi', {'lo': bounds[0], 'hi': bounds[1]}
         prefix = pattern[:-3]  # e.g., 'thumbs'
         return 'path GLOB :p', {'p': glob_to_sqlite(prefix + '/*')}
 
@@ -284,6 +290,23 @@ def pattern_to_sql_exclude(pattern):
     return None
 
 
+def subtree_range(pattern):
+    """Return the path range matched by a literal subtree pattern like 'dir/**', if it is one.
+
+    The paths under 'dir/' are exactly those with 'dir/' <= path < 'dir0', since '0' is the
+    character after '/'. Unlike a GLOB, such a range condition can be answered from an index.
+
+    Returns:
+        A (lo, hi) tuple of bounds, or None if the pattern is not a literal path followed by '/**'.
+    """
+    if not pattern.endswith('/**'):
+        return None
+    prefix = pattern[:-2]
+    if '*' in prefix or '?' in prefix or '[' in prefix:
+        return None
+    return prefix, prefix[:-1] + chr(ord('/') + 1)
+
+
 def glob_to_sqlite(pat):
     """Convert Python glob pattern to SQLite GLOB pattern.
 
@@ -0,0 +1,36 @@
+import os
+import shutil
+import tempfile
+
+import crc32c
+import pytest
+
+
+def pytest_addoption(parser):
+    parser.addoption(
+        '--bc-tmpdir',
+        default=os.environ.get('BARECAT_TEST_TMPDIR'),
+        help='Parent directory for all temporary test files, e.g. /dev/shm to keep them in RAM '
+        '(default: $BARECAT_TEST_TMPDIR if set, else the system temp directory)',
+    )
+
+
+def pytest_configure(config):
+    # Setting tempfile.tempdir covers TemporaryDirectory, mkdtemp and pytest's tmp_path alike
+    parent = config.getoption('--bc-tmpdir')
+    if parent is not None:
+        tempfile.tempdir = parent
+
+
+def pytest_report_header(config):
+    # crc32c falls back to a (slower) software implementation without SSE4.2/ARMv8 CRC support.
+    # Report which one is active, since it dominates the cost of CRC-heavy tests
+    backend = 'hardware' if getattr(crc32c, 'hardware_based', False) else 'software'
+    return f'crc32c: {backend}'
+
+
+@pytest.fixture(scope='session')
+def _bc_root():
+    tmpdir = tempfile.mkdtemp()
+    yield tmpdir
+    shutil.rmtree(tmpdir, ignore_errors=True)
@@ -3,12 +3,11 @@ import os
 import barecat
 from barecat import Barecat, BarecatFileInfo, BarecatDirInfo
 import pytest
-import tempfile
 import os.path as osp
 
 
-def test_barecat():
-    tempdir = tempfile.mkdtemp()
+def test_barecat(tmp_path):
+    tempdir = str(tmp_path)
     filepath = osp.join(tempdir, 'test.barecat')
     with barecat.Barecat(filepath, readonly=False) as bc:
         bc['some/path.txt'] = b'hello'
@@ -4,7 +4,6 @@ import gzip
 import json
 import lzma
 import pickle
-import tempfile
 import os.path as osp
 import warnings
 
@@ -16,10 +15,9 @@ from barecat import Barecat, DecodedView
 
 
 @pytest.fixture
-def archive_path():
-    """Create a temporary directory and return archive path."""
-    tempdir = tempfile.mkdtemp()
-    return osp.join(tempdir, 'test.barecat')
+def archive_path(tmp_path):
+    """Return an archive path in a temporary directory."""
+    return osp.join(str(tmp_path), 'test.barecat')
 
 
 class TestDecodedView:
@@ -726,6 +726,22 @@ def test_contains_check(archive):
         assert 'dir' not in bc  # directories shouldn't be "in" bc
 
 
+def test_contains_many(archive):
+    """contains_many agrees with 'in', keyed by the paths as given."""
+    with Barecat(archive, readonly=False) as bc:
+        bc['exists.txt'] = b'here'
+        bc['dir/nested.txt'] = b'nested'
+
+    with Barecat(archive, readonly=True) as bc:
+        assert bc.contains_many([]) == {}
+        assert bc.contains_many(['exists.txt', '/dir/nested.txt', 'nonexistent.txt', 'dir']) == {
+            'exists.txt': True,
+            '/dir/nested.txt': True,
+            'nonexistent.txt': False,
+            'dir': False,
+        }
+
+
 def test_len_count(archive):
     """len() returns file count."""
     with Barecat(archive, readonly=False) as bc:
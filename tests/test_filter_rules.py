@@ -0,0 +1,273 @@
+"""Tests for RuleFilter, the compiled rsync-style include/exclude rule matcher.
+
+The filter is checked against a straightforward reference implementation that translates each
+rule with glob_to_regex and tries the rules one by one.
+"""
+
+import re
+import warnings
+
+import pytest
+
+from barecat.util.filter_rules import RuleFilter, _compile_rules, compile_filter
+from barecat.util.glob_to_regex import glob_to_regex
+
+PATHS = [
+    'a.txt',
+    '.hidden.txt',
+    'b.jpg',
+    'c.log',
+    'error.log',
+    'dir/a.txt',
+    'dir/b.jpg',
+    'dir/.hidden/x.txt',
+    'dir/sub/c.txt',
+    'dir/sub/error.log',
+    'thumbs/small.jpg',
+    'thumbs/important.jpg',
+    'thumbs/sub/deep.jpg',
+    'thumbsup/x.jpg',
+    'keep/x.tmp',
+    'file_a.txt',
+    'file_b.txt',
+    'file_z.txt',
+    'file_-.txt',
+    'file_].txt',
+    'dir/file_b.txt',
+    'x/y/z/w.png',
+    '',
+    'dir/',
+    '*.log',
+    'x/*.log',
+    '*a',
+    '?.txt',
+    'file_?.txt',
+    'dir/[x].txt',
+    '[a',
+    'dir/?',
+    '/a.txt',
+    'a//b.jpg',
+]
+
+RULE_SETS = [
+    [],
+    [('+', '**/*.txt')],
+    [('-', '**/*.log')],
+    [('+', '**/important.jpg'), ('-', 'thumbs/**'), ('-', '**/*.tmp')],
+    [('-', 'thumbs/**'), ('+', '**/important.jpg')],
+    [('+', '*.txt'), ('-', '**')],
+    [('+', '**/*.jpg'), ('+', '**/*.png'), ('-', '**/*')],
+    [('+', 'file_[ab].txt'), ('-', 'file_*.txt')],
+    [('-', 'file_[!ab].txt')],
+    [('+', '?.txt'), ('-', '*')],
+    [('+', 'dir/**/*.txt'), ('-', 'dir/**')],
+    [('-', '**/error.log'), ('+', '**/*.log'), ('-', '**')],
+    [('+', 'keep/**'), ('-', '**')],
+    [('+', 'dir/*'), ('-', '**')],
+    [('+', 'a.txt'), ('+', 'dir/sub/c.txt'), ('-', '**')],
+    [('-', '**/sub/error.log'), ('+', '**/*.log'), ('-', 'dir/**')],
+    [('-', '**/*.jpg'), ('+', 'thumbs/**'), ('+', '**/important.jpg'), ('-', '**')],
+    [('+', '**/file_[a-c].txt'), ('-', '**')],
+    [('-', 'file_[]a].txt'), ('-', 'file_[z-a].txt'), ('+', 'file_[-].txt'), ('-', '**')],
+    [('+', 'file_[a-].txt'), ('-', 'file_[!a].txt')],
+    [('-', '[dt]*/**'), ('+', '[.]hidden.txt')],
+    [('-', '**/*important.jpg'), ('+', '**/*.jpg'), ('-', '*.txt'), ('+', '**/*.txt')],
+    [('+', '*.[tl][xo][tg]'), ('-', '**/*.[tl][xo][tg]')],
+    [('+', '**/*_b.txt'), ('-', '**/*.txt'), ('+', '**/*t')],
+    [('+', '**/**/***.jpg'), ('-', 'dir/**/**'), ('+', '**/**/error.log'), ('-', '**/**')],
+    [('+', 'dir/***'), ('+', '***'), ('-', '**.txt')],
+    [('-', '**/*.log'), ('+', '**/*.log'), ('+', 'thumbs/**'), ('-', 'thumbs/sub/**')],
+    [('-', 'dir/**'), ('+', 'dir/sub/*.txt'), ('+', 'dir/a.txt'), ('-', 'dir/**')],
+    [('-', '**/[*].log')],
+    [('+', '[*]a'), ('-', '**')],
+    [('+', 'file_[?].txt'), ('-', '**/[[]*')],
+    [('-', '[*?[]*'), ('+', '**/[*]*'), ('-', 'dir/[?]')],
+    [('+', '**/*'), ('-', 'dir/')],
+    [('-', '**/*.txt'), ('+', '**/*'), ('-', '**'), ('+', 'a.txt')],
+    [('+', '**/*.jpg'), ('-', '**/*'), ('+', '**/*'), ('+', '**')],
+]
+
+
+def _reference_index(path, rules):
+    for i, (sign, pattern) in enumerate(rules):
+        regex = glob_to_regex(pattern, recursive='**' in pattern, include_hidden=True)
+        if re.match(regex, path):
+            return i
+    return -1
+
+
+def _reference(path, rules, default_include):
+    i = _reference_index(path, rules)
+    return default_include if i < 0 else rules[i][0] == '+'
+
+
+@pytest.mark.parametrize('default_include', [True, False])
+@pytest.mark.parametrize('rules', RULE_SETS, ids=repr)
+def test_matches_reference(rules, default_include):
+    """RuleFilter agrees with rule-by-rule regex matching."""
+    rule_filter = RuleFilter(rules, default_include)
+    for path in PATHS:
+        assert rule_filter(path) == _reference(path, rules, default_include), path
+        assert rule_filter.match_index(path) == _reference_index(path, rules), path
+
+
+def test_first_match_wins():
+    """The earliest matching rule decides, regardless of later rules."""
+    rule_filter = RuleFilter([('-', 'thumbs/**'), ('+', '**/important.jpg')])
+    assert not rule_filter('thumbs/important.jpg')
+    assert rule_filter('dir/important.jpg')
+
+
+def test_no_rules_uses_default():
+    assert RuleFilter([], default_include=True)('anything')
+    assert not RuleFilter([], default_include=False)('anything')
+
+
+def test_compiled_patterns_are_shared():
+    """Filters with the same regex rules share one compiled regex, whatever the signs."""
+    a = RuleFilter([('+', '**/?.txt'), ('-', 'dir/*.log')])
+    b = RuleFilter([('-', '**/?.txt'), ('+', 'dir/*.log')])
+    assert a._regex is b._regex is _compile_rules(((0, '**/?.txt'), (1, 'dir/*.log')))
+
+
+def test_single_match_call_per_path():
+    """All regex rules are decided by a single fused regex; the matched group names the rule."""
+    rule_filter = RuleFilter([('+', '**/?.jpg'), ('+', '**/?.png'), ('-', '**/*')])
+    m = rule_filter._regex.match('x/y.png')
+    assert m.lastgroup == 'r1'
+    assert rule_filter._group_rules[m.lastindex] == 1
+
+
+def test_literal_rules_bypass_regex():
+    """Literal, LITERAL/** and **/LITERAL rules are decided without the regex."""
+    rule_filter = RuleFilter([('+', 'a/b.txt'), ('-', 'thumbs/**'), ('+', '**/error.log')])
+    assert rule_filter._regex is None
+    assert rule_filter('a/b.txt')
+    assert not rule_filter('thumbs/x/y.jpg')
+    assert rule_filter('thumbsup/x.jpg')
+    assert rule_filter('error.log')
+    assert rule_filter('x/y/error.log')
+    assert not rule_filter('thumbs/error.log')  # thumbs/** comes first
+
+
+def test_literal_rule_after_regex_rule():
+    """A regex rule earlier in the list still takes precedence over a later literal rule."""
+    rule_filter = RuleFilter([('-', '**/*.log'), ('+', '**/error.log')], default_include=False)
+    assert not rule_filter('x/error.log')
+    rule_filter = RuleFilter([('+', '**/error.log'), ('-', '**/*.log')], default_include=False)
+    assert rule_filter('x/error.log')
+    assert not rule_filter('x/other.log')
+
+
+@pytest.mark.parametrize('catch_all', ['**', '**/*'])
+def test_terminal_catch_all_replaces_default(catch_all):
+    """A trailing catch-all rule is not matched, it becomes the default decision."""
+    rule_filter = RuleFilter([('+', '**/?.jpg'), ('-', catch_all)])
+    assert rule_filter._regex is _compile_rules(((0, '**/?.jpg'),))
+    assert rule_filter('a/b.jpg')
+    assert not rule_filter('a/b.txt')
+
+
+def test_rules_after_catch_all():
+    """Rules after ** are never reached; after **/* they still decide paths without a name."""
+    with warnings.catch_warnings():
+        warnings.simplefilter('error')
+        rule_filter = RuleFilter([('-', '**'), ('+', '**/*.jpg')])
+    assert rule_filter._group_rules == [None]
+    assert not rule_filter('a.jpg')
+
+    rule_filter = RuleFilter([('-', '**/*'), ('+', '**'), ('-', '**/*.jpg')], False)
+    assert not rule_filter('a.jpg')
+    assert not rule_filter('a/b')
+    assert rule_filter('')
+    assert rule_filter('dir/')
+    assert rule_filter('/a')
+
+
+def test_bracket_classes_expand_to_literals():
+    """Small ASCII bracket classes are decided by literal lookups."""
+    rule_filter = RuleFilter([('+', 'file_[ab].txt'), ('-', 'dir/[x-z]/**'), ('-', '**')])
+    assert rule_filter._regex is None
+    assert rule_filter('file_a.txt')
+    assert not rule_filter('file_c.txt')
+    assert not rule_filter('dir/y/z.txt')
+
+
+def test_negated_bracket_class_uses_regex():
+    rule_filter = RuleFilter([('-', 'file_[!ab].txt')])
+    assert rule_filter._regex is not None
+    assert rule_filter('file_a.txt')
+    assert not rule_filter('file_é.txt')
+
+
+def test_name_endings_use_lookups():
+    """**/*.EXT and *.EXT rules are decided by suffix lookups."""
+    rule_filter = RuleFilter([('-', '*.log'), ('+', '**/*.jpg'), ('+', '**/*.jpeg'), ('-', '**')])
+    assert rule_filter._regex is None
+    assert rule_filter('a/b.jpeg')
+    assert rule_filter('b.jpg')
+    assert not rule_filter('a.log')
+    assert not rule_filter('a/b.png')
+
+
+def test_repeated_wildcards_normalized():
+    """Redundant ** segments and star runs collapse, so the rules take the lookup paths."""
+    rule_filter = RuleFilter([('+', '**/**/***.jpg'), ('-', 'dir/**/**'), ('+', '**/**/x.log')])
+    assert rule_filter._regex is None
+    assert RuleFilter([('-', '**/**/**')])._catch_all_rule == 0
+
+
+def test_pathological_wildcards():
+    """Long runs of wildcards collapse to one (?:.+/)? and one [^/]*, so matching cannot blow up."""
+    pattern = '/'.join(['**'] * 200) + '/' + '*' * 1000 + '.t?t'
+    rule_filter = RuleFilter([('+', pattern)], default_include=False)
+    assert rule_filter._regex.pattern == r'(?P<r0>(?s:(?:.+/)?[^/]*\.t[^/]t)\Z)'
+    path = '/'.join(['d'] * 500) + '/' + 'x' * 20000 + '.tx'
+    assert not rule_filter(path)
+    assert rule_filter(path + 't')
+
+
+def test_duplicate_and_shadowed_rules_dropped():
+    """Repeated patterns and rules under an earlier LITERAL/** rule are never evaluated."""
+    rules = [
+        ('-', 'thumbs/**'),
+        ('+', 'thumbs/sub/*.jp?'),
+        ('+', '**/?.txt'),
+        ('-', '**/?.txt'),
+        ('-', 'a?c'),
+    ]
+    rule_filter = RuleFilter(rules, default_include=False)
+    assert rule_filter._group_rules == [None, 2, 4]
+    assert not rule_filter('thumbs/sub/x.jpg')
+    assert rule_filter('d/x.txt')
+
+
+def test_compile_filter_reuses_filters():
+    rules = [('+', '**/*.txt'), ('-', '**')]
+    assert compile_filter(rules) is compile_filter(list(rules))
+    assert compile_filter(rules) is not compile_filter(rules, default_include=False)
+
+
+def test_decision_cache_only_for_many_regex_rules():
+    """Decisions are memoized when many rules need the regex, but not for lookup-only filters."""
+    many = RuleFilter([('-', f'dir{i}/*/?.txt') for i in range(10)])
+    assert not many('dir3/x/a.txt')
+    assert not many('dir3/x/a.txt')
+    assert many.match_index.cache_info().hits == 1
+    # Bounded, as compile_filter keeps up to 64 filters with their caches
+    assert many.match_index.cache_info().maxsize <= 4096
+    few = RuleFilter([('-', f'dir{i}/**') for i in range(10)])
+    assert not hasattr(few.match_index, 'cache_info')
+
+
+def test_extension_rules_single_lookup():
+    """A filter of only extension rules uses the last-dot lookup and agrees with the reference."""
+    rules = [('+', '**/*.jpg'), ('+', '**/*.jpeg'), ('-', '*.png'), ('+', '**/*.png'), ('-', '**')]
+    rule_filter = RuleFilter(rules)
+    assert rule_filter.match_index == rule_filter._match_extension
+    paths = PATHS + ['a.png', 'x/a.png', 'x/.jpg', 'x.jpg/y', 'x/y.jpg.bak', '/a.jpg', 'noext']
+    for path in paths:
+        assert rule_filter.match_index(path) == _reference_index(path, rules), path
+    # Name endings that are not a single extension take the general path
+    rule_filter = RuleFilter([('+', '**/*.tar.gz')])
+    assert rule_filter.match_index.__func__ is RuleFilter.match_index
@@ -126,21 +126,21 @@ class TestGlobBasicPatterns:
     """Test basic glob patterns (* and ?)."""
 
     @pytest.fixture
-    def both_structures(self):
+    def both_structures(self, tmp_path):
         """Create identical structures in filesystem and barecat."""
-        with tempfile.TemporaryDirectory() as fs_dir:
-            bc_path = osp.join(fs_dir, 'test.barecat')
-            fs_base = osp.join(fs_dir, 'files')
-            os.makedirs(fs_base)
+        fs_dir = str(tmp_path)
+        bc_path = osp.join(fs_dir, 'test.barecat')
+        fs_base = osp.join(fs_dir, 'files')
+        os.makedirs(fs_base)
 
-            # Create in filesystem
-            create_test_structure(fs_base, lambda p: filesystem_create_file(fs_base, p))
+        # Create in filesystem
+        create_test_structure(fs_base, lambda p: filesystem_create_file(fs_base, p))
 
-            # Create in barecat
-            with Barecat(bc_path, readonly=False) as bc:
-                create_test_structure(bc_path, lambda p: bc.__setitem__(p, b'content'))
+        # Create in barecat
+        with Barecat(bc_path, readonly=False) as bc:
+            create_test_structure(bc_path, lambda p: bc.__setitem__(p, b'content'))
 
-                yield fs_base, bc
+            yield fs_base, bc
 
     def test_star_txt_root(self, both_structures):
         """*.txt at root level."""
@@ -219,19 +219,19 @@ class TestGlobBracketPatterns:
     """Test bracket patterns [abc], [a-z], [!abc]."""
 
     @pytest.fixture
-    def both_structures(self):
+    def both_structures(self, tmp_path):
         """Create identical structures in filesystem and barecat."""
-        with tempfile.TemporaryDirectory() as fs_dir:
-            bc_path = osp.join(fs_dir, 'test.barecat')
-            fs_base = osp.join(fs_dir, 'files')
-            os.makedirs(fs_base)
+        fs_dir = str(tmp_path)
+        bc_path = osp.join(fs_dir, 'test.barecat')
+        fs_base = osp.join(fs_dir, 'files')
+        os.makedirs(fs_base)
 
-            create_test_structure(fs_base, lambda p: filesystem_create_file(fs_base, p))
+        create_test_structure(fs_base, lambda p: filesystem_create_file(fs_base, p))
 
-            with Barecat(bc_path, readonly=False) as bc:
-                create_test_structure(bc_path, lambda p: bc.__setitem__(p, b'content'))
+        with Barecat(bc_path, readonly=False) as bc:
+            create_test_structure(bc_path, lambda p: bc.__setitem__(p, b'content'))
 
-                yield fs_base, bc
+            yield fs_base, bc
 
     def test_bracket_set(self, both_structures):
         """[abc].log - character set."""
@@ -289,19 +289,19 @@ class TestGlobRecursive:
     """Test recursive glob patterns with **."""
 
     @pytest.fixture
-    def both_structures(self):
+    def both_structures(self, tmp_path):
         """Create identical structures in filesystem and barecat."""
-        with tempfile.TemporaryDirectory() as fs_dir:
-            bc_path = osp.join(fs_dir, 'test.barecat')
-            fs_base = osp.join(fs_dir, 'files')
-            os.makedirs(fs_base)
+        fs_dir = str(tmp_path)
+        bc_path = osp.join(fs_dir, 'test.barecat')
+        fs_base = osp.join(fs_dir, 'files')
+        os.makedirs(fs_base)
 
-            create_test_structure(fs_base, lambda p: filesystem_create_file(fs_base, p))
+        create_test_structure(fs_base, lambda p: filesystem_create_file(fs_base, p))
 
-            with Barecat(bc_path, readonly=False) as bc:
-                create_test_structure(bc_path, lambda p: bc.__setitem__(p, b'content'))
+        with Barecat(bc_path, readonly=False) as bc:
+            create_test_structure(bc_path, lambda p: bc.__setitem__(p, b'content'))
 
-                yield fs_base, bc
+            yield fs_base, bc
 
     def test_doublestar_txt(self, both_structures):
         """**/*.txt - all txt files recursively (including root)."""
@@ -381,19 +381,19 @@ class TestGlobHiddenFiles:
     """Test glob behavior with hidden files (starting with .)."""
 
     @pytest.fixture
-    def both_structures(self):
+    def both_structures(self, tmp_path):
         """Create identical structures in filesystem and barecat."""
-        with tempfile.TemporaryDirectory() as fs_dir:
-            bc_path = osp.join(fs_dir, 'test.barecat')
-            fs_base = osp.join(fs_dir, 'files')
-            os.makedirs(fs_base)
+        fs_dir = str(tmp_path)
+        bc_path = osp.join(fs_dir, 'test.barecat')
+        fs_base = osp.join(fs_dir, 'files')
+        os.makedirs(fs_base)
 
-            create_test_structure(fs_base, lambda p: filesystem_create_file(fs_base, p))
+        create_test_structure(fs_base, lambda p: filesystem_create_file(fs_base, p))
 
-            with Barecat(bc_path, readonly=False) as bc:
-                create_test_structure(bc_path, lambda p: bc.__setitem__(p, b'content'))
+        with Barecat(bc_path, readonly=False) as bc:
+            create_test_structure(bc_path, lambda p: bc.__setitem__(p, b'content'))
 
-                yield fs_base, bc
+            yield fs_base, bc
 
     def test_star_excludes_hidden(self, both_structures):
         """* should NOT match hidden files by default."""
@@ -454,19 +454,19 @@ class TestGlobEdgeCases:
     """Test edge cases and unusual patterns."""
 
     @pytest.fixture
-    def both_structures(self):
+    def both_structures(self, tmp_path):
         """Create identical structures in filesystem and barecat."""
-        with tempfile.TemporaryDirectory() as fs_dir:
-            bc_path = osp.join(fs_dir, 'test.barecat')
-            fs_base = osp.join(fs_dir, 'files')
-            os.makedirs(fs_base)
+        fs_dir = str(tmp_path)
+        bc_path = osp.join(fs_dir, 'test.barecat')
+        fs_base = osp.join(fs_dir, 'files')
+        os.makedirs(fs_base)
 
-            create_test_structure(fs_base, lambda p: filesystem_create_file(fs_base, p))
+        create_test_structure(fs_base, lambda p: filesystem_create_file(fs_base, p))
 
-            with Barecat(bc_path, readonly=False) as bc:
-                create_test_structure(bc_path, lambda p: bc.__setitem__(p, b'content'))
+        with Barecat(bc_path, readonly=False) as bc:
+            create_test_structure(bc_path, lambda p: bc.__setitem__(p, b'content'))
 
-                yield fs_base, bc
+            yield fs_base, bc
 
     def test_no_matches(self, both_structures):
         """Pattern that matches nothing."""
@@ -554,19 +554,19 @@ class TestGlobOnlyFiles:
     """Test only_files parameter (barecat-specific)."""
 
     @pytest.fixture
-    def both_structures(self):
+    def both_structures(self, tmp_path):
         """Create identical structures in filesystem and barecat."""
-        with tempfile.TemporaryDirectory() as fs_dir:
-            bc_path = osp.join(fs_dir, 'test.barecat')
-            fs_base = osp.join(fs_dir, 'files')
-            os.makedirs(fs_base)
+        fs_dir = str(tmp_path)
+        bc_path = osp.join(fs_dir, 'test.barecat')
+        fs_base = osp.join(fs_dir, 'files')
+        os.makedirs(fs_base)
 
-            create_test_structure(fs_base, lambda p: filesystem_create_file(fs_base, p))
+        create_test_structure(fs_base, lambda p: filesystem_create_file(fs_base, p))
 
-            with Barecat(bc_path, readonly=False) as bc:
-                create_test_structure(bc_path, lambda p: bc.__setitem__(p, b'content'))
+        with Barecat(bc_path, readonly=False) as bc:
+            create_test_structure(bc_path, lambda p: bc.__setitem__(p, b'content'))
 
-                yield fs_base, bc
+            yield fs_base, bc
 
     def test_star_only_files(self, both_structures):
         """* with only_files=True excludes directories."""
@@ -626,19 +626,19 @@ class TestGlobSpecialPatterns:
     """Test special and complex patterns."""
 
     @pytest.fixture
-    def both_structures(self):
+    def both_structures(self, tmp_path):
         """Create identical structures in filesystem and barecat."""
-        with tempfile.TemporaryDirectory() as fs_dir:
-            bc_path = osp.join(fs_dir, 'test.barecat')
-            fs_base = osp.join(fs_dir, 'files')
-            os.makedirs(fs_base)
+        fs_dir = str(tmp_path)
+        bc_path = osp.join(fs_dir, 'test.barecat')
+        fs_base = osp.join(fs_dir, 'files')
+        os.makedirs(fs_base)
 
-            create_test_structure(fs_base, lambda p: filesystem_create_file(fs_base, p))
+        create_test_structure(fs_base, lambda p: filesystem_create_file(fs_base, p))
 
-            with Barecat(bc_path, readonly=False) as bc:
-                create_test_structure(bc_path, lambda p: bc.__setitem__(p, b'content'))
+        with Barecat(bc_path, readonly=False) as bc:
+            create_test_structure(bc_path, lambda p: bc.__setitem__(p, b'content'))
 
-                yield fs_base, bc
+            yield fs_base, bc
 
     def test_doublestar_slash_star(self, both_structures):
         """**/* - all files at all depths."""
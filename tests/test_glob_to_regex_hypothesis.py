@@ -139,6 +139,21 @@ class TestGlobToRegexWildcards:
             assert not re.fullmatch(regex, 'x' * (n - 1))
         assert not re.fullmatch(regex, 'x' * (n + 1))
 
+    def test_single_wildcards_exclude_separator(self):
+        """* and ? translate to separator-excluding classes; only ** may use '.'."""
+        assert glob_to_regex('*', recursive=True, include_hidden=True) == r'(?s:[^/]+)\Z'
+        regex = glob_to_regex('a*b?c', recursive=True, include_hidden=True, seps='/')
+        assert regex == r'(?s:a[^/]*b[^/]c)\Z'
+        assert '.' not in regex.replace(r'\.', '')
+
+    @given(simple_glob, st.text(alphabet=safe_chars + '/', min_size=0, max_size=30))
+    def test_single_wildcards_never_cross_separator(self, pattern, path):
+        """Without **, a matching path has exactly as many '/' as the pattern."""
+        assume('**' not in pattern)
+        regex = glob_to_regex(pattern, recursive=True, include_hidden=True, seps='/')
+        if re.fullmatch(regex, path):
+            assert path.count('/') == pattern.count('/')
+
 
 class TestGlobToRegexPaths:
     """Test path-related behavior."""
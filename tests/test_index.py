@@ -7,6 +7,7 @@ import pytest
 
 from barecat import Barecat
 from barecat import BarecatDirInfo, Order
+from barecat.util import glob_helper
 
 
 class TestIsFileIsDir:
@@ -246,6 +247,57 @@ class TestGlobPaths:
                 assert set(paths) == {'a.txt', 'b.txt'}
 
 
+class TestIterglobInclExcl:
+    """Test iterglob_infos_incl_excl() and its SQL prefilter."""
+
+    def test_subtree_rules(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = osp.join(tmpdir, 'test.barecat')
+            with Barecat(path, readonly=False) as bc:
+                bc['keep/a.txt'] = b'a'
+                bc['keep/sub/b.txt'] = b'b'
+                bc['keep0.txt'] = b'c'
+                bc['keepx/d.txt'] = b'd'
+                bc['thumbs/e.jpg'] = b'e'
+
+                rules = [('+', 'keep/**'), ('-', '**')]
+                infos = bc.index.iterglob_infos_incl_excl(rules, only_files=True)
+                assert {info.path for info in infos} == {'keep/a.txt', 'keep/sub/b.txt'}
+
+                rules = [('-', 'thumbs/**'), ('-', 'keep/**')]
+                infos = bc.index.iterglob_infos_incl_excl(rules, only_files=True)
+                assert {info.path for info in infos} == {'keep0.txt', 'keepx/d.txt'}
+
+    def test_subtree_include_uses_index_range(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = osp.join(tmpdir, 'test.barecat')
+            with Barecat(path, readonly=False) as bc:
+                bc['keep/a.txt'] = b'a'
+
+                sql_expr, params = bc.index._glob_helper._build_filter_sql(
+                    [('+', 'keep/**'), ('-', '**')], default_include=True
+                )
+                assert sorted(params.values()) == ['keep/', 'keep0']
+                plan = bc.index.fetch_all(
+                    f'EXPLAIN QUERY PLAN SELECT path FROM files WHERE {sql_expr}', params
+                )
+                assert any('idx_files_path' in row['detail'] for row in plan)
+
+    def test_workers_preserve_order(self, monkeypatch):
+        monkeypatch.setattr(glob_helper, '_FILTER_BATCH_SIZE', 3)
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = osp.join(tmpdir, 'test.barecat')
+            with Barecat(path, readonly=False) as bc:
+                for i in range(40):
+                    bc[f'dir{i % 4}/file{i:02d}.{"txt" if i % 3 else "jpg"}'] = b'x'
+
+                rules = [('-', 'dir1/**'), ('+', '**/?ile0?.txt'), ('-', '**/*.txt')]
+                expected = [info.path for info in bc.index.iterglob_infos_incl_excl(rules)]
+                infos = bc.index.iterglob_infos_incl_excl(rules, workers=3)
+                assert [info.path for info in infos] == expected
+                assert any(p.endswith('.jpg') for p in expected)
+
+
 class TestIterAllFileinfos:
     """Test iter_all_fileinfos() and iter_all_dirinfos()."""
 
@@ -1,311 +1,323 @@
 import os
 import os.path as osp
-import tempfile
+import shutil
 
 import pytest
 
 import barecat
 from barecat import Barecat
 
+# Full index+shard consistency scans; set BARECAT_TEST_VERIFY=0 to skip them locally.
+_VERIFY = os.environ.get('BARECAT_TEST_VERIFY', '1') == '1'
 
-def test_merge_no_prefix():
+
+def test_merge_no_prefix(tmp_path):
     """Test basic merge without prefix."""
-    with tempfile.TemporaryDirectory() as tempdir:
-        source_path = osp.join(tempdir, 'source.barecat')
-        target_path = osp.join(tempdir, 'target.barecat')
+    source_path = osp.join(tmp_path, 'source.barecat')
+    target_path = osp.join(tmp_path, 'target.barecat')
 
-        # Create source archive
-        with Barecat(source_path, readonly=False) as bc:
-            bc['file1.txt'] = b'content1'
-            bc['dir/file2.txt'] = b'content2'
-            bc['dir/subdir/file3.txt'] = b'content3'
+    # Create source archive
+    with Barecat(source_path, readonly=False) as bc:
+        bc['file1.txt'] = b'content1'
+        bc['dir/file2.txt'] = b'content2'
+        bc['dir/subdir/file3.txt'] = b'content3'
 
-        # Create target archive
-        with Barecat(target_path, readonly=False) as bc:
-            bc['existing.txt'] = b'existing'
+    # Create target archive
+    with Barecat(target_path, readonly=False) as bc:
+        bc['existing.txt'] = b'existing'
 
-        # Merge source into target
-        with Barecat(target_path, readonly=False) as bc:
-            bc.merge_from_other_barecat(source_path)
+    # Merge source into target
+    with Barecat(target_path, readonly=False) as bc:
+        bc.merge_from_other_barecat(source_path)
+        if _VERIFY:
             assert bc.verify_integrity()
 
-        # Verify contents
-        with Barecat(target_path, readonly=True) as bc:
-            assert bc['existing.txt'] == b'existing'
-            assert bc['file1.txt'] == b'content1'
-            assert bc['dir/file2.txt'] == b'content2'
-            assert bc['dir/subdir/file3.txt'] == b'content3'
+    # Verify contents
+    with Barecat(target_path, readonly=True) as bc:
+        assert bc['existing.txt'] == b'existing'
+        assert bc['file1.txt'] == b'content1'
+        assert bc['dir/file2.txt'] == b'content2'
+        assert bc['dir/subdir/file3.txt'] == b'content3'
+        if _VERIFY:
             assert bc.verify_integrity()
 
 
-def test_merge_with_prefix():
+def test_merge_with_prefix(tmp_path):
     """Test merge with a prefix path."""
-    with tempfile.TemporaryDirectory() as tempdir:
-        source_path = osp.join(tempdir, 'source.barecat')
-        target_path = osp.join(tempdir, 'target.barecat')
+    source_path = osp.join(tmp_path, 'source.barecat')
+    target_path = osp.join(tmp_path, 'target.barecat')
 
-        # Create source archive
-        with Barecat(source_path, readonly=False) as bc:
-            bc['file1.txt'] = b'content1'
-            bc['dir/file2.txt'] = b'content2'
+    # Create source archive
+    with Barecat(source_path, readonly=False) as bc:
+        bc['file1.txt'] = b'content1'
+        bc['dir/file2.txt'] = b'content2'
 
-        # Create target archive
-        with Barecat(target_path, readonly=False) as bc:
-            bc['existing.txt'] = b'existing'
+    # Create target archive
+    with Barecat(target_path, readonly=False) as bc:
+        bc['existing.txt'] = b'existing'
 
-        # Merge source into target with prefix
-        with Barecat(target_path, readonly=False) as bc:
-            bc.merge_from_other_barecat(source_path, prefix='data/train')
+    # Merge source into target with prefix
+    with Barecat(target_path, readonly=False) as bc:
+        bc.merge_from_other_barecat(source_path, prefix='data/train')
+        if _VERIFY:
             assert bc.verify_integrity()
 
-        # Verify contents
-        with Barecat(target_path, readonly=True) as bc:
-            assert bc['existing.txt'] == b'existing'
-            assert bc['data/train/file1.txt'] == b'content1'
-            assert bc['data/train/dir/file2.txt'] == b'content2'
+    # Verify contents
+    with Barecat(target_path, readonly=True) as bc:
+        assert bc['existing.txt'] == b'existing'
+        assert bc['data/train/file1.txt'] == b'content1'
+        assert bc['data/train/dir/file2.txt'] == b'content2'
+        if _VERIFY:
             assert bc.verify_integrity()
 
 
-def test_merge_with_nested_prefix():
+def test_merge_with_nested_prefix(tmp_path):
     """Test merge with a deeply nested prefix."""
-    with tempfile.TemporaryDirectory() as tempdir:
-        source_path = osp.join(tempdir, 'source.barecat')
-        target_path = osp.join(tempdir, 'target.barecat')
+    source_path = osp.join(tmp_path, 'source.barecat')
+    target_path = osp.join(tmp_path, 'target.barecat')
 
-        # Create source archive
-        with Barecat(source_path, readonly=False) as bc:
-            bc['a.txt'] = b'a'
-            bc['b/c.txt'] = b'c'
+    # Create source archive
+    with Barecat(source_path, readonly=False) as bc:
+        bc['a.txt'] = b'a'
+        bc['b/c.txt'] = b'c'
 
-        # Create empty target archive
-        with Barecat(target_path, readonly=False) as bc:
-            pass
+    # Create empty target archive
+    with Barecat(target_path, readonly=False) as bc:
+        pass
 
-        # Merge with deep prefix
-        with Barecat(target_path, readonly=False) as bc:
-            bc.merge_from_other_barecat(source_path, prefix='x/y/z')
+    # Merge with deep prefix
+    with Barecat(target_path, readonly=False) as bc:
+        bc.merge_from_other_barecat(source_path, prefix='x/y/z')
+        if _VERIFY:
             assert bc.verify_integrity()
 
-        # Verify
-        with Barecat(target_path, readonly=True) as bc:
-            assert bc['x/y/z/a.txt'] == b'a'
-            assert bc['x/y/z/b/c.txt'] == b'c'
-            # Verify directory structure
-            assert 'x' in bc.listdir('')
-            assert 'y' in bc.listdir('x')
-            assert 'z' in bc.listdir('x/y')
+    # Verify
+    with Barecat(target_path, readonly=True) as bc:
+        assert bc['x/y/z/a.txt'] == b'a'
+        assert bc['x/y/z/b/c.txt'] == b'c'
+        # Verify directory structure
+        assert 'x' in bc.listdir('')
+        assert 'y' in bc.listdir('x')
+        assert 'z' in bc.listdir('x/y')
+        if _VERIFY:
             assert bc.verify_integrity()
 
 
-def test_merge_multiple_archives_same_prefix():
+def test_merge_multiple_archives_same_prefix(tmp_path):
     """Test merging multiple archives into the same prefix."""
-    with tempfile.TemporaryDirectory() as tempdir:
-        source1_path = osp.join(tempdir, 'source1.barecat')
-        source2_path = osp.join(tempdir, 'source2.barecat')
-        target_path = osp.join(tempdir, 'target.barecat')
+    source1_path = osp.join(tmp_path, 'source1.barecat')
+    source2_path = osp.join(tmp_path, 'source2.barecat')
+    target_path = osp.join(tmp_path, 'target.barecat')
 
-        # Create source archives
-        with Barecat(source1_path, readonly=False) as bc:
-            bc['file1.txt'] = b'from_source1'
+    # Create source archives
+    with Barecat(source1_path, readonly=False) as bc:
+        bc['file1.txt'] = b'from_source1'
 
-        with Barecat(source2_path, readonly=False) as bc:
-            bc['file2.txt'] = b'from_source2'
+    with Barecat(source2_path, readonly=False) as bc:
+        bc['file2.txt'] = b'from_source2'
 
-        # Create target and merge both
-        with Barecat(target_path, readonly=False) as bc:
-            bc.merge_from_other_barecat(source1_path, prefix='data')
-            bc.merge_from_other_barecat(source2_path, prefix='data')
+    # Create target and merge both
+    with Barecat(target_path, readonly=False) as bc:
+        bc.merge_from_other_barecat(source1_path, prefix='data')
+        bc.merge_from_other_barecat(source2_path, prefix='data')
+        if _VERIFY:
             assert bc.verify_integrity()
 
-        # Verify
-        with Barecat(target_path, readonly=True) as bc:
-            assert bc['data/file1.txt'] == b'from_source1'
-            assert bc['data/file2.txt'] == b'from_source2'
+    # Verify
+    with Barecat(target_path, readonly=True) as bc:
+        assert bc['data/file1.txt'] == b'from_source1'
+        assert bc['data/file2.txt'] == b'from_source2'
+        if _VERIFY:
             assert bc.verify_integrity()
 
 
-def test_merge_multiple_archives_different_prefixes():
+def test_merge_multiple_archives_different_prefixes(tmp_path):
     """Test merging multiple archives into different prefixes."""
-    with tempfile.TemporaryDirectory() as tempdir:
-        source1_path = osp.join(tempdir, 'source1.barecat')
-        source2_path = osp.join(tempdir, 'source2.barecat')
-        target_path = osp.join(tempdir, 'target.barecat')
+    source1_path = osp.join(tmp_path, 'source1.barecat')
+    source2_path = osp.join(tmp_path, 'source2.barecat')
+    target_path = osp.join(tmp_path, 'target.barecat')
 
-        # Create source archives with same filenames
-        with Barecat(source1_path, readonly=False) as bc:
-            bc['file.txt'] = b'from_source1'
-            bc['dir/nested.txt'] = b'nested1'
+    # Create source archives with same filenames
+    with Barecat(source1_path, readonly=False) as bc:
+        bc['file.txt'] = b'from_source1'
+        bc['dir/nested.txt'] = b'nested1'
 
-        with Barecat(source2_path, readonly=False) as bc:
-            bc['file.txt'] = b'from_source2'
-            bc['dir/nested.txt'] = b'nested2'
+    with Barecat(source2_path, readonly=False) as bc:
+        bc['file.txt'] = b'from_source2'
+        bc['dir/nested.txt'] = b'nested2'
 
-        # Create target and merge with different prefixes
-        with Barecat(target_path, readonly=False) as bc:
-            bc.merge_from_other_barecat(source1_path, prefix='archive1')
-            bc.merge_from_other_barecat(source2_path, prefix='archive2')
+    # Create target and merge with different prefixes
+    with Barecat(target_path, readonly=False) as bc:
+        bc.merge_from_other_barecat(source1_path, prefix='archive1')
+        bc.merge_from_other_barecat(source2_path, prefix='archive2')
+        if _VERIFY:
             assert bc.verify_integrity()
 
-        # Verify no collision
-        with Barecat(target_path, readonly=True) as bc:
-            assert bc['archive1/file.txt'] == b'from_source1'
-            assert bc['archive2/file.txt'] == b'from_source2'
-            assert bc['archive1/dir/nested.txt'] == b'nested1'
-            assert bc['archive2/dir/nested.txt'] == b'nested2'
+    # Verify no collision
+    with Barecat(target_path, readonly=True) as bc:
+        assert bc['archive1/file.txt'] == b'from_source1'
+        assert bc['archive2/file.txt'] == b'from_source2'
+        assert bc['archive1/dir/nested.txt'] == b'nested1'
+        assert bc['archive2/dir/nested.txt'] == b'nested2'
+        if _VERIFY:
             assert bc.verify_integrity()
 
 
-def test_merge_ignore_duplicates():
+def test_merge_ignore_duplicates(tmp_path):
     """Test merge with ignore_duplicates when files overlap."""
-    with tempfile.TemporaryDirectory() as tempdir:
-        source_path = osp.join(tempdir, 'source.barecat')
-        target_path = osp.join(tempdir, 'target.barecat')
+    source_path = osp.join(tmp_path, 'source.barecat')
+    target_path = osp.join(tmp_path, 'target.barecat')
 
-        # Create source archive
-        with Barecat(source_path, readonly=False) as bc:
-            bc['file.txt'] = b'from_source'
-            bc['new.txt'] = b'new_content'
+    # Create source archive
+    with Barecat(source_path, readonly=False) as bc:
+        bc['file.txt'] = b'from_source'
+        bc['new.txt'] = b'new_content'
 
-        # Create target with overlapping file
-        with Barecat(target_path, readonly=False) as bc:
-            bc['file.txt'] = b'from_target'
+    # Create target with overlapping file
+    with Barecat(target_path, readonly=False) as bc:
+        bc['file.txt'] = b'from_target'
 
-        # Merge with ignore_duplicates
-        with Barecat(target_path, readonly=False) as bc:
-            bc.merge_from_other_barecat(source_path, ignore_duplicates=True)
+    # Merge with ignore_duplicates
+    with Barecat(target_path, readonly=False) as bc:
+        bc.merge_from_other_barecat(source_path, ignore_duplicates=True)
+        if _VERIFY:
             assert bc.verify_integrity()
 
-        # Verify: original file kept, new file added
-        with Barecat(target_path, readonly=True) as bc:
-            assert bc['file.txt'] == b'from_target'  # original kept
-            assert bc['new.txt'] == b'new_content'  # new file added
+    # Verify: original file kept, new file added
+    with Barecat(target_path, readonly=True) as bc:
+        assert bc['file.txt'] == b'from_target'  # original kept
+        assert bc['new.txt'] == b'new_content'  # new file added
+        if _VERIFY:
             assert bc.verify_integrity()
 
 
-def test_merge_ignore_duplicates_with_prefix():
+def test_merge_ignore_duplicates_with_prefix(tmp_path):
     """Test merge with ignore_duplicates and prefix."""
-    with tempfile.TemporaryDirectory() as tempdir:
-        source_path = osp.join(tempdir, 'source.barecat')
-        target_path = osp.join(tempdir, 'target.barecat')
+    source_path = osp.join(tmp_path, 'source.barecat')
+    target_path = osp.join(tmp_path, 'target.barecat')
 
-        # Create source archive
-        with Barecat(source_path, readonly=False) as bc:
-            bc['file.txt'] = b'from_source'
-            bc['new.txt'] = b'new_content'
+    # Create source archive
+    with Barecat(source_path, readonly=False) as bc:
+        bc['file.txt'] = b'from_source'
+        bc['new.txt'] = b'new_content'
 
-        # Create target with overlapping file at prefix location
-        with Barecat(target_path, readonly=False) as bc:
-            bc['data/file.txt'] = b'from_target'
+    # Create target with overlapping file at prefix location
+    with Barecat(target_path, readonly=False) as bc:
+        bc['data/file.txt'] = b'from_target'
 
-        # Merge with prefix and ignore_duplicates
-        with Barecat(target_path, readonly=False) as bc:
-            bc.merge_from_other_barecat(source_path, prefix='data', ignore_duplicates=True)
+    # Merge with prefix and ignore_duplicates
+    with Barecat(target_path, readonly=False) as bc:
+        bc.merge_from_other_barecat(source_path, prefix='data', ignore_duplicates=True)
+        if _VERIFY:
             assert bc.verify_integrity()
 
-        # Verify
-        with Barecat(target_path, readonly=True) as bc:
-            assert bc['data/file.txt'] == b'from_target'  # original kept
-            assert bc['data/new.txt'] == b'new_content'  # new file added
+    # Verify
+    with Barecat(target_path, readonly=True) as bc:
+        assert bc['data/file.txt'] == b'from_target'  # original kept
+        assert bc['data/new.txt'] == b'new_content'  # new file added
+        if _VERIFY:
             assert bc.verify_integrity()
 
 
-def test_merge_stats_correctness():
+def test_merge_stats_correctness(tmp_path):
     """Test that directory stats are correct after merge."""
-    with tempfile.TemporaryDirectory() as tempdir:
-        source_path = osp.join(tempdir, 'source.barecat')
-        target_path = osp.join(tempdir, 'target.barecat')
+    source_path = osp.join(tmp_path, 'source.barecat')
+    target_path = osp.join(tmp_path, 'target.barecat')
 
-        # Create source archive with known structure
-        with Barecat(source_path, readonly=False) as bc:
-            bc['a.txt'] = b'12345'  # 5 bytes
-            bc['b.txt'] = b'67890'  # 5 bytes
-            bc['dir/c.txt'] = b'abc'  # 3 bytes
+    # Create source archive with known structure
+    with Barecat(source_path, readonly=False) as bc:
+        bc['a.txt'] = b'12345'  # 5 bytes
+        bc['b.txt'] = b'67890'  # 5 bytes
+        bc['dir/c.txt'] = b'abc'  # 3 bytes
 
-        # Create target
-        with Barecat(target_path, readonly=False) as bc:
-            bc['existing.txt'] = b'xx'  # 2 bytes
+    # Create target
+    with Barecat(target_path, readonly=False) as bc:
+        bc['existing.txt'] = b'xx'  # 2 bytes
 
-        # Merge with prefix
-        with Barecat(target_path, readonly=False) as bc:
-            bc.merge_from_other_barecat(source_path, prefix='prefix')
+    # Merge with prefix
+    with Barecat(target_path, readonly=False) as bc:
+        bc.merge_from_other_barecat(source_path, prefix='prefix')
 
-        # Verify stats
-        with Barecat(target_path, readonly=True) as bc:
-            # Root should have: existing.txt (2 bytes) + prefix subtree (13 bytes)
-            root_info = bc.index.lookup_dir('')
-            assert root_info.size_tree == 15
-            assert root_info.num_files_tree == 4
-            assert root_info.num_files == 1  # existing.txt
-            assert root_info.num_subdirs == 1  # prefix
+    # Verify stats
+    with Barecat(target_path, readonly=True) as bc:
+        # Root should have: existing.txt (2 bytes) + prefix subtree (13 bytes)
+        root_info = bc.index.lookup_dir('')
+        assert root_info.size_tree == 15
+        assert root_info.num_files_tree == 4
+        assert root_info.num_files == 1  # existing.txt
+        assert root_info.num_subdirs == 1  # prefix
 
-            # prefix dir should have source's stats
-            prefix_info = bc.index.lookup_dir('prefix')
-            assert prefix_info.size_tree == 13
-            assert prefix_info.num_files_tree == 3
-            assert prefix_info.num_files == 2  # a.txt, b.txt
-            assert prefix_info.num_subdirs == 1  # dir
+        # prefix dir should have source's stats
+        prefix_info = bc.index.lookup_dir('prefix')
+        assert prefix_info.size_tree == 13
+        assert prefix_info.num_files_tree == 3
+        assert prefix_info.num_files == 2  # a.txt, b.txt
+        assert prefix_info.num_subdirs == 1  # dir
 
+        if _VERIFY:
             assert bc.verify_integrity()
 
 
-def test_merge_empty_source():
+def test_merge_empty_source(tmp_path):
     """Test merging an empty source archive."""
-    with tempfile.TemporaryDirectory() as tempdir:
-        source_path = osp.join(tempdir, 'source.barecat')
-        target_path = osp.join(tempdir, 'target.barecat')
+    source_path = osp.join(tmp_path, 'source.barecat')
+    target_path = osp.join(tmp_path, 'target.barecat')
 
-        # Create empty source archive
-        with Barecat(source_path, readonly=False) as bc:
-            pass
+    # Create empty source archive
+    with Barecat(source_path, readonly=False) as bc:
+        pass
 
-        # Create target with content
-        with Barecat(target_path, readonly=False) as bc:
-            bc['file.txt'] = b'content'
+    # Create target with content
+    with Barecat(target_path, readonly=False) as bc:
+        bc['file.txt'] = b'content'
 
-        # Merge empty source
-        with Barecat(target_path, readonly=False) as bc:
-            bc.merge_from_other_barecat(source_path, prefix='empty')
+    # Merge empty source
+    with Barecat(target_path, readonly=False) as bc:
+        bc.merge_from_other_barecat(source_path, prefix='empty')
+        if _VERIFY:
             assert bc.verify_integrity()
 
-        # Verify target unchanged (except for empty prefix dir)
-        with Barecat(target_path, readonly=True) as bc:
-            assert bc['file.txt'] == b'content'
-            assert bc.listdir('empty') == []
+    # Verify target unchanged (except for empty prefix dir)
+    with Barecat(target_path, readonly=True) as bc:
+        assert bc['file.txt'] == b'content'
+        assert bc.listdir('empty') == []
+        if _VERIFY:
             assert bc.verify_integrity()
 
 
-def test_merge_into_existing_prefix():
+def test_merge_into_existing_prefix(tmp_path):
     """Test merging into a prefix that already has content."""
-    with tempfile.TemporaryDirectory() as tempdir:
-        source_path = osp.join(tempdir, 'source.barecat')
-        target_path = osp.join(tempdir, 'target.barecat')
+    source_path = osp.join(tmp_path, 'source.barecat')
+    target_path = osp.join(tmp_path, 'target.barecat')
 
-        # Create source
-        with Barecat(source_path, readonly=False) as bc:
-            bc['new.txt'] = b'new'
-            bc['subdir/file.txt'] = b'subfile'
+    # Create source
+    with Barecat(source_path, readonly=False) as bc:
+        bc['new.txt'] = b'new'
+        bc['subdir/file.txt'] = b'subfile'
 
-        # Create target with existing content at prefix location
-        with Barecat(target_path, readonly=False) as bc:
-            bc['data/existing.txt'] = b'existing'
-            bc['data/subdir/other.txt'] = b'other'
+    # Create target with existing content at prefix location
+    with Barecat(target_path, readonly=False) as bc:
+        bc['data/existing.txt'] = b'existing'
+        bc['data/subdir/other.txt'] = b'other'
 
-        # Merge into existing prefix
-        with Barecat(target_path, readonly=False) as bc:
-            bc.merge_from_other_barecat(source_path, prefix='data')
+    # Merge into existing prefix
+    with Barecat(target_path, readonly=False) as bc:
+        bc.merge_from_other_barecat(source_path, prefix='data')
+        if _VERIFY:
             assert bc.verify_integrity()
 
-        # Verify both old and new content exists
-        with Barecat(target_path, readonly=True) as bc:
-            assert bc['data/existing.txt'] == b'existing'
-            assert bc['data/new.txt'] == b'new'
-            assert bc['data/subdir/other.txt'] == b'other'
-            assert bc['data/subdir/file.txt'] == b'subfile'
+    # Verify both old and new content exists
+    with Barecat(target_path, readonly=True) as bc:
+        assert bc['data/existing.txt'] == b'existing'
+        assert bc['data/new.txt'] == b'new'
+        assert bc['data/subdir/other.txt'] == b'other'
+        assert bc['data/subdir/file.txt'] == b'subfile'
 
-            # Check subdir has correct count
-            subdir_info = bc.index.lookup_dir('data/subdir')
-            assert subdir_info.num_files == 2
+        # Check subdir has correct count
+        subdir_info = bc.index.lookup_dir('data/subdir')
+        assert subdir_info.num_files == 2
 
+        if _VERIFY:
             assert bc.verify_integrity()
 
 
@@ -314,676 +326,687 @@ def test_merge_into_existing_prefix():
 # =============================================================================
 
 
-def test_merge_duplicate_error_without_ignore():
+def test_merge_duplicate_error_without_ignore(tmp_path):
     """Test that duplicate files raise error without ignore_duplicates."""
-    with tempfile.TemporaryDirectory() as tempdir:
-        source_path = osp.join(tempdir, 'source.barecat')
-        target_path = osp.join(tempdir, 'target.barecat')
+    source_path = osp.join(tmp_path, 'source.barecat')
+    target_path = osp.join(tmp_path, 'target.barecat')
 
-        with Barecat(source_path, readonly=False) as bc:
-            bc['file.txt'] = b'from_source'
+    with Barecat(source_path, readonly=False) as bc:
+        bc['file.txt'] = b'from_source'
 
-        with Barecat(target_path, readonly=False) as bc:
-            bc['file.txt'] = b'from_target'
+    with Barecat(target_path, readonly=False) as bc:
+        bc['file.txt'] = b'from_target'
 
-        with Barecat(target_path, readonly=False) as bc:
-            with pytest.raises(Exception):  # IntegrityError or similar
-                bc.merge_from_other_barecat(source_path, ignore_duplicates=False)
+    with Barecat(target_path, readonly=False) as bc:
+        with pytest.raises(Exception):  # IntegrityError or similar
+            bc.merge_from_other_barecat(source_path, ignore_duplicates=False)
 
 
-def test_merge_duplicate_error_with_prefix():
+def test_merge_duplicate_error_with_prefix(tmp_path):
     """Test duplicate error when prefix causes collision."""
-    with tempfile.TemporaryDirectory() as tempdir:
-        source_path = osp.join(tempdir, 'source.barecat')
-        target_path = osp.join(tempdir, 'target.barecat')
+    source_path = osp.join(tmp_path, 'source.barecat')
+    target_path = osp.join(tmp_path, 'target.barecat')
 
-        with Barecat(source_path, readonly=False) as bc:
-            bc['file.txt'] = b'from_source'
+    with Barecat(source_path, readonly=False) as bc:
+        bc['file.txt'] = b'from_source'
 
-        with Barecat(target_path, readonly=False) as bc:
-            bc['data/file.txt'] = b'from_target'
+    with Barecat(target_path, readonly=False) as bc:
+        bc['data/file.txt'] = b'from_target'
 
-        with Barecat(target_path, readonly=False) as bc:
-            with pytest.raises(Exception):
-                bc.merge_from_other_barecat(source_path, prefix='data', ignore_duplicates=False)
+    with Barecat(target_path, readonly=False) as bc:
+        with pytest.raises(Exception):
+            bc.merge_from_other_barecat(source_path, prefix='data', ignore_duplicates=False)
 
 
-def test_merge_single_file_at_root():
+def test_merge_single_file_at_root(tmp_path):
     """Test merging source with only one file at root (no directories)."""
-    with tempfile.TemporaryDirectory() as tempdir:
-        source_path = osp.join(tempdir, 'source.barecat')
-        target_path = osp.join(tempdir, 'target.barecat')
+    source_path = osp.join(tmp_path, 'source.barecat')
+    target_path = osp.join(tmp_path, 'target.barecat')
 
-        with Barecat(source_path, readonly=False) as bc:
-            bc['only_file.txt'] = b'only'
+    with Barecat(source_path, readonly=False) as bc:
+        bc['only_file.txt'] = b'only'
 
-        with Barecat(target_path, readonly=False) as bc:
-            bc['existing.txt'] = b'existing'
+    with Barecat(target_path, readonly=False) as bc:
+        bc['existing.txt'] = b'existing'
 
-        with Barecat(target_path, readonly=False) as bc:
-            bc.merge_from_other_barecat(source_path, prefix='imported')
+    with Barecat(target_path, readonly=False) as bc:
+        bc.merge_from_other_barecat(source_path, prefix='imported')
+        if _VERIFY:
             assert bc.verify_integrity()
 
-        with Barecat(target_path, readonly=True) as bc:
-            assert bc['imported/only_file.txt'] == b'only'
-            assert bc['existing.txt'] == b'existing'
+    with Barecat(target_path, readonly=True) as bc:
+        assert bc['imported/only_file.txt'] == b'only'
+        assert bc['existing.txt'] == b'existing'
+        if _VERIFY:
             assert bc.verify_integrity()
 
 
-def test_merge_into_empty_target():
+def test_merge_into_empty_target(tmp_path):
     """Test merging into a completely empty target archive."""
-    with tempfile.TemporaryDirectory() as tempdir:
-        source_path = osp.join(tempdir, 'source.barecat')
-        target_path = osp.join(tempdir, 'target.barecat')
+    source_path = osp.join(tmp_path, 'source.barecat')
+    target_path = osp.join(tmp_path, 'target.barecat')
 
-        with Barecat(source_path, readonly=False) as bc:
-            bc['a.txt'] = b'a'
-            bc['b/c.txt'] = b'c'
+    with Barecat(source_path, readonly=False) as bc:
+        bc['a.txt'] = b'a'
+        bc['b/c.txt'] = b'c'
 
-        with Barecat(target_path, readonly=False) as bc:
-            pass  # empty target
+    with Barecat(target_path, readonly=False) as bc:
+        pass  # empty target
 
-        with Barecat(target_path, readonly=False) as bc:
-            bc.merge_from_other_barecat(source_path)
+    with Barecat(target_path, readonly=False) as bc:
+        bc.merge_from_other_barecat(source_path)
+        if _VERIFY:
             assert bc.verify_integrity()
 
-        with Barecat(target_path, readonly=True) as bc:
-            assert bc['a.txt'] == b'a'
-            assert bc['b/c.txt'] == b'c'
+    with Barecat(target_path, readonly=True) as bc:
+        assert bc['a.txt'] == b'a'
+        assert bc['b/c.txt'] == b'c'
+        if _VERIFY:
             assert bc.verify_integrity()
 
 
-def test_merge_empty_source_no_prefix():
+def test_merge_empty_source_no_prefix(tmp_path):
     """Test merging empty source without prefix."""
-    with tempfile.TemporaryDirectory() as tempdir:
-        source_path = osp.join(tempdir, 'source.barecat')
-        target_path = osp.join(tempdir, 'target.barecat')
+    source_path = osp.join(tmp_path, 'source.barecat')
+    target_path = osp.join(tmp_path, 'target.barecat')
 
-        with Barecat(source_path, readonly=False) as bc:
-            pass
+    with Barecat(source_path, readonly=False) as bc:
+        pass
 
-        with Barecat(target_path, readonly=False) as bc:
-            bc['file.txt'] = b'content'
+    with Barecat(target_path, readonly=False) as bc:
+        bc['file.txt'] = b'content'
 
-        with Barecat(target_path, readonly=False) as bc:
-            bc.merge_from_other_barecat(source_path)  # no prefix
+    with Barecat(target_path, readonly=False) as bc:
+        bc.merge_from_other_barecat(source_path)  # no prefix
+        if _VERIFY:
             assert bc.verify_integrity()
 
-        with Barecat(target_path, readonly=True) as bc:
-            assert bc['file.txt'] == b'content'
-            assert bc.num_files == 1
+    with Barecat(target_path, readonly=True) as bc:
+        assert bc['file.txt'] == b'content'
+        assert bc.num_files == 1
+        if _VERIFY:
             assert bc.verify_integrity()
 
 
-def test_merge_empty_into_empty():
+def test_merge_empty_into_empty(tmp_path):
     """Test merging empty source into empty target."""
-    with tempfile.TemporaryDirectory() as tempdir:
-        source_path = osp.join(tempdir, 'source.barecat')
-        target_path = osp.join(tempdir, 'target.barecat')
+    source_path = osp.join(tmp_path, 'source.barecat')
+    target_path = osp.join(tmp_path, 'target.barecat')
 
-        with Barecat(source_path, readonly=False) as bc:
-            pass
+    with Barecat(source_path, readonly=False) as bc:
+        pass
 
-        with Barecat(target_path, readonly=False) as bc:
-            pass
+    with Barecat(target_path, readonly=False) as bc:
+        pass
 
-        with Barecat(target_path, readonly=False) as bc:
-            bc.merge_from_other_barecat(source_path, prefix='empty')
+    with Barecat(target_path, readonly=False) as bc:
+        bc.merge_from_other_barecat(source_path, prefix='empty')
+        if _VERIFY:
             assert bc.verify_integrity()
 
-        with Barecat(target_path, readonly=True) as bc:
-            assert bc.num_files == 0
+    with Barecat(target_path, readonly=True) as bc:
+        assert bc.num_files == 0
+        if _VERIFY:
             assert bc.verify_integrity()
 
 
-def test_merge_multi_shard_source():
+def test_merge_multi_shard_source(tmp_path):
     """Test merging source that spans multiple shards."""
-    with tempfile.TemporaryDirectory() as tempdir:
-        source_path = osp.join(tempdir, 'source.barecat')
-        target_path = osp.join(tempdir, 'target.barecat')
+    source_path = osp.join(tmp_path, 'source.barecat')
+    target_path = osp.join(tmp_path, 'target.barecat')
 
-        # Create source with small shard limit to force multiple shards
-        with Barecat(source_path, readonly=False, shard_size_limit=100) as bc:
-            bc['file1.txt'] = b'x' * 50
-            bc['file2.txt'] = b'y' * 50
-            bc['file3.txt'] = b'z' * 50  # should go to shard 1
-            bc['dir/file4.txt'] = b'w' * 50
+    # Create source with small shard limit to force multiple shards
+    with Barecat(source_path, readonly=False, shard_size_limit=100) as bc:
+        bc['file1.txt'] = b'x' * 50
+        bc['file2.txt'] = b'y' * 50
+        bc['file3.txt'] = b'z' * 50  # should go to shard 1
+        bc['dir/file4.txt'] = b'w' * 50
 
-        # Verify source has multiple shards
-        assert osp.exists(f'{source_path}-shard-00001')
+    # Verify source has multiple shards
+    assert osp.exists(f'{source_path}-shard-00001')
 
-        with Barecat(target_path, readonly=False) as bc:
-            bc['existing.txt'] = b'existing'
+    with Barecat(target_path, readonly=False) as bc:
+        bc['existing.txt'] = b'existing'
 
-        with Barecat(target_path, readonly=False) as bc:
-            bc.merge_from_other_barecat(source_path, prefix='data')
+    with Barecat(target_path, readonly=False) as bc:
+        bc.merge_from_other_barecat(source_path, prefix='data')
+        if _VERIFY:
             assert bc.verify_integrity()
 
-        with Barecat(target_path, readonly=True) as bc:
-            assert bc['existing.txt'] == b'existing'
-            assert bc['data/file1.txt'] == b'x' * 50
-            assert bc['data/file2.txt'] == b'y' * 50
-            assert bc['data/file3.txt'] == b'z' * 50
-            assert bc['data/dir/file4.txt'] == b'w' * 50
+    with Barecat(target_path, readonly=True) as bc:
+        assert bc['existing.txt'] == b'existing'
+        assert bc['data/file1.txt'] == b'x' * 50
+        assert bc['data/file2.txt'] == b'y' * 50
+        assert bc['data/file3.txt'] == b'z' * 50
+        assert bc['data/dir/file4.txt'] == b'w' * 50
+        if _VERIFY:
             assert bc.verify_integrity()
 
 
-def test_merge_causes_shard_rotation_in_target():
+def test_merge_causes_shard_rotation_in_target(tmp_path):
     """Test that target rotates shards correctly during merge."""
-    with tempfile.TemporaryDirectory() as tempdir:
-        source_path = osp.join(tempdir, 'source.barecat')
-        target_path = osp.join(tempdir, 'target.barecat')
+    source_path = osp.join(tmp_path, 'source.barecat')
+    target_path = osp.join(tmp_path, 'target.barecat')
 
-        with Barecat(source_path, readonly=False) as bc:
-            bc['big1.txt'] = b'a' * 100
-            bc['big2.txt'] = b'b' * 100
+    with Barecat(source_path, readonly=False) as bc:
+        bc['big1.txt'] = b'a' * 100
+        bc['big2.txt'] = b'b' * 100
 
-        # Target with small shard limit
-        with Barecat(target_path, readonly=False, shard_size_limit=150) as bc:
-            bc['existing.txt'] = b'x' * 50
+    # Target with small shard limit
+    with Barecat(target_path, readonly=False, shard_size_limit=150) as bc:
+        bc['existing.txt'] = b'x' * 50
 
-        with Barecat(target_path, readonly=False, shard_size_limit=150) as bc:
-            bc.merge_from_other_barecat(source_path)
+    with Barecat(target_path, readonly=False, shard_size_limit=150) as bc:
+        bc.merge_from_other_barecat(source_path)
+        if _VERIFY:
             assert bc.verify_integrity()
 
-        # Verify target has multiple shards after merge
-        assert osp.exists(f'{target_path}-shard-00001')
+    # Verify target has multiple shards after merge
+    assert osp.exists(f'{target_path}-shard-00001')
 
-        with Barecat(target_path, readonly=True) as bc:
-            assert bc['existing.txt'] == b'x' * 50
-            assert bc['big1.txt'] == b'a' * 100
-            assert bc['big2.txt'] == b'b' * 100
+    with Barecat(target_path, readonly=True) as bc:
+        assert bc['existing.txt'] == b'x' * 50
+        assert bc['big1.txt'] == b'a' * 100
+        assert bc['big2.txt'] == b'b' * 100
+        if _VERIFY:
             assert bc.verify_integrity()
 
 
-def test_merge_all_duplicates_ignored():
+def test_merge_all_duplicates_ignored(tmp_path):
     """Test merge where ALL source files are duplicates (with ignore)."""
-    with tempfile.TemporaryDirectory() as tempdir:
-        source_path = osp.join(tempdir, 'source.barecat')
-        target_path = osp.join(tempdir, 'target.barecat')
+    source_path = osp.join(tmp_path, 'source.barecat')
+    target_path = osp.join(tmp_path, 'target.barecat')
 
-        with Barecat(source_path, readonly=False) as bc:
-            bc['a.txt'] = b'source_a'
-            bc['b.txt'] = b'source_b'
-            bc['dir/c.txt'] = b'source_c'
+    with Barecat(source_path, readonly=False) as bc:
+        bc['a.txt'] = b'source_a'
+        bc['b.txt'] = b'source_b'
+        bc['dir/c.txt'] = b'source_c'
 
-        # Target has all the same paths
-        with Barecat(target_path, readonly=False) as bc:
-            bc['a.txt'] = b'target_a'
-            bc['b.txt'] = b'target_b'
-            bc['dir/c.txt'] = b'target_c'
+    # Target has all the same paths
+    with Barecat(target_path, readonly=False) as bc:
+        bc['a.txt'] = b'target_a'
+        bc['b.txt'] = b'target_b'
+        bc['dir/c.txt'] = b'target_c'
 
-        with Barecat(target_path, readonly=False) as bc:
-            bc.merge_from_other_barecat(source_path, ignore_duplicates=True)
+    with Barecat(target_path, readonly=False) as bc:
+        bc.merge_from_other_barecat(source_path, ignore_duplicates=True)
+        if _VERIFY:
             assert bc.verify_integrity()
 
-        with Barecat(target_path, readonly=True) as bc:
-            # All original values kept
-            assert bc['a.txt'] == b'target_a'
-            assert bc['b.txt'] == b'target_b'
-            assert bc['dir/c.txt'] == b'target_c'
-            assert bc.num_files == 3
+    with Barecat(target_path, readonly=True) as bc:
+        # All original values kept
+        assert bc['a.txt'] == b'target_a'
+        assert bc['b.txt'] == b'target_b'
+        assert bc['dir/c.txt'] == b'target_c'
+        assert bc.num_files == 3
+        if _VERIFY:
             assert bc.verify_integrity()
 
 
-def test_merge_deeply_nested_source():
+def test_merge_deeply_nested_source(tmp_path):
     """Test merging source with very deep directory nesting."""
-    with tempfile.TemporaryDirectory() as tempdir:
-        source_path = osp.join(tempdir, 'source.barecat')
-        target_path = osp.join(tempdir, 'target.barecat')
+    source_path = osp.join(tmp_path, 'source.barecat')
+    target_path = osp.join(tmp_path, 'target.barecat')
 
-        deep_path = '/'.join(['d'] * 20) + '/file.txt'
+    deep_path = '/'.join(['d'] * 20) + '/file.txt'
 
-        with Barecat(source_path, readonly=False) as bc:
-            bc[deep_path] = b'deep'
+    with Barecat(source_path, readonly=False) as bc:
+        bc[deep_path] = b'deep'
 
-        with Barecat(target_path, readonly=False) as bc:
-            bc['shallow.txt'] = b'shallow'
+    with Barecat(target_path, readonly=False) as bc:
+        bc['shallow.txt'] = b'shallow'
 
-        with Barecat(target_path, readonly=False) as bc:
-            bc.merge_from_other_barecat(source_path, prefix='imported')
+    with Barecat(target_path, readonly=False) as bc:
+        bc.merge_from_other_barecat(source_path, prefix='imported')
+        if _VERIFY:
             assert bc.verify_integrity()
 
-        with Barecat(target_path, readonly=True) as bc:
-            assert bc['shallow.txt'] == b'shallow'
-            assert bc['imported/' + deep_path] == b'deep'
+    with Barecat(target_path, readonly=True) as bc:
+        assert bc['shallow.txt'] == b'shallow'
+        assert bc['imported/' + deep_path] == b'deep'
+        if _VERIFY:
             assert bc.verify_integrity()
 
 
-def test_merge_unicode_paths():
+def test_merge_unicode_paths(tmp_path):
     """Test merging with unicode characters in paths."""
-    with tempfile.TemporaryDirectory() as tempdir:
-        source_path = osp.join(tempdir, 'source.barecat')
-        target_path = osp.join(tempdir, 'target.barecat')
+    source_path = osp.join(tmp_path, 'source.barecat')
+    target_path = osp.join(tmp_path, 'target.barecat')
 
-        with Barecat(source_path, readonly=False) as bc:
-            bc['日本語/ファイル.txt'] = b'japanese'
-            bc['émojis/\U0001f389\U0001f38a.txt'] = b'party'
-            bc['Ü∈ñîçödé.txt'] = b'unicode'
+    with Barecat(source_path, readonly=False) as bc:
+        bc['日本語/ファイル.txt'] = b'japanese'
+        bc['émojis/\U0001f389\U0001f38a.txt'] = b'party'
+        bc['Ü∈ñîçödé.txt'] = b'unicode'
 
-        with Barecat(target_path, readonly=False) as bc:
-            bc['existing.txt'] = b'existing'
+    with Barecat(target_path, readonly=False) as bc:
+        bc['existing.txt'] = b'existing'
 
-        with Barecat(target_path, readonly=False) as bc:
-            bc.merge_from_other_barecat(source_path, prefix='data')
+    with Barecat(target_path, readonly=False) as bc:
+        bc.merge_from_other_barecat(source_path, prefix='data')
+        if _VERIFY:
             assert bc.verify_integrity()
 
-        with Barecat(target_path, readonly=True) as bc:
-            assert bc['data/日本語/ファイル.txt'] == b'japanese'
-            assert bc['data/émojis/\U0001f389\U0001f38a.txt'] == b'party'
-            assert bc['data/Ü∈ñîçödé.txt'] == b'unicode'
+    with Barecat(target_path, readonly=True) as bc:
+        assert bc['data/日本語/ファイル.txt'] == b'japanese'
+        assert bc['data/émojis/\U0001f389\U0001f38a.txt'] == b'party'
+        assert bc['data/Ü∈ñîçödé.txt'] == b'unicode'
+        if _VERIFY:
             assert bc.verify_integrity()
 
 
-def test_merge_many_small_files():
+def test_merge_many_small_files(tmp_path):
     """Test merging source with many small files."""
-    with tempfile.TemporaryDirectory() as tempdir:
-        source_path = osp.join(tempdir, 'source.barecat')
-        target_path = osp.join(tempdir, 'target.barecat')
+    source_path = osp.join(tmp_path, 'source.barecat')
+    target_path = osp.join(tmp_path, 'target.barecat')
 
-        with Barecat(source_path, readonly=False) as bc:
-            for i in range(500):
-                bc[f'files/file_{i:04d}.txt'] = f'content_{i}'.encode()
+    with Barecat(source_path, readonly=False) as bc:
+        for i in range(500):
+            bc[f'files/file_{i:04d}.txt'] = f'content_{i}'.encode()
 
-        with Barecat(target_path, readonly=False) as bc:
-            bc['existing.txt'] = b'existing'
+    with Barecat(target_path, readonly=False) as bc:
+        bc['existing.txt'] = b'existing'
 
-        with Barecat(target_path, readonly=False) as bc:
-            bc.merge_from_other_barecat(source_path, prefix='imported')
+    with Barecat(target_path, readonly=False) as bc:
+        bc.merge_from_other_barecat(source_path, prefix='imported')
+        if _VERIFY:
             assert bc.verify_integrity()
 
-        with Barecat(target_path, readonly=True) as bc:
-            assert bc.num_files == 501
-            assert bc['imported/files/file_0000.txt'] == b'content_0'
-            assert bc['imported/files/file_0499.txt'] == b'content_499'
+    with Barecat(target_path, readonly=True) as bc:
+        assert bc.num_files == 501
+        assert bc['imported/files/file_0000.txt'] == b'content_0'
+        assert bc['imported/files/file_0499.txt'] == b'content_499'
+        if _VERIFY:
             assert bc.verify_integrity()
 
 
-def test_merge_preserves_file_metadata():
+def test_merge_preserves_file_metadata(tmp_path):
     """Test that file metadata (mode, mtime, etc.) is preserved during merge."""
-    with tempfile.TemporaryDirectory() as tempdir:
-        source_path = osp.join(tempdir, 'source.barecat')
-        target_path = osp.join(tempdir, 'target.barecat')
-        from io import BytesIO
+    source_path = osp.join(tmp_path, 'source.barecat')
+    target_path = osp.join(tmp_path, 'target.barecat')
+    from io import BytesIO
 
-        with Barecat(source_path, readonly=False) as bc:
-            bc.add(
-                barecat.BarecatFileInfo(
-                    'file.txt', size=5, mode=0o755, mtime_ns=1234567890000000000
-                ),
-                fileobj=BytesIO(b'hello'),
-            )
+    with Barecat(source_path, readonly=False) as bc:
+        bc.add(
+            barecat.BarecatFileInfo('file.txt', size=5, mode=0o755, mtime_ns=1234567890000000000),
+            fileobj=BytesIO(b'hello'),
+        )
 
-        with Barecat(target_path, readonly=False) as bc:
-            pass
+    with Barecat(target_path, readonly=False) as bc:
+        pass
 
-        with Barecat(target_path, readonly=False) as bc:
-            bc.merge_from_other_barecat(source_path, prefix='data')
+    with Barecat(target_path, readonly=False) as bc:
+        bc.merge_from_other_barecat(source_path, prefix='data')
+        if _VERIFY:
             assert bc.verify_integrity()
 
-        with Barecat(target_path, readonly=True) as bc:
-            info = bc.index.lookup_file('data/file.txt')
-            assert info.mode == 0o755
-            assert info.mtime_ns == 1234567890000000000
+    with Barecat(target_path, readonly=True) as bc:
+        info = bc.index.lookup_file('data/file.txt')
+        assert info.mode == 0o755
+        assert info.mtime_ns == 1234567890000000000
+        if _VERIFY:
             assert bc.verify_integrity()
 
 
-def test_merge_sequential_same_prefix():
+def test_merge_sequential_same_prefix(tmp_path):
     """Test multiple sequential merges into the same prefix."""
-    with tempfile.TemporaryDirectory() as tempdir:
-        target_path = osp.join(tempdir, 'target.barecat')
+    target_path = osp.join(tmp_path, 'target.barecat')
 
-        with Barecat(target_path, readonly=False) as bc:
-            pass
+    with Barecat(target_path, readonly=False) as bc:
+        pass
 
-        for i in range(5):
-            source_path = osp.join(tempdir, f'source{i}.barecat')
-            with Barecat(source_path, readonly=False) as bc:
-                bc[f'file{i}.txt'] = f'content{i}'.encode()
-                bc[f'subdir/nested{i}.txt'] = f'nested{i}'.encode()
+    for i in range(5):
+        source_path = osp.join(tmp_path, f'source{i}.barecat')
+        with Barecat(source_path, readonly=False) as bc:
+            bc[f'file{i}.txt'] = f'content{i}'.encode()
+            bc[f'subdir/nested{i}.txt'] = f'nested{i}'.encode()
 
-            with Barecat(target_path, readonly=False) as bc:
-                bc.merge_from_other_barecat(source_path, prefix='data')
+        with Barecat(target_path, readonly=False) as bc:
+            bc.merge_from_other_barecat(source_path, prefix='data')
+            if _VERIFY:
                 assert bc.verify_integrity()
 
-        with Barecat(target_path, readonly=True) as bc:
-            assert bc.num_files == 10
-            for i in range(5):
-                assert bc[f'data/file{i}.txt'] == f'content{i}'.encode()
-                assert bc[f'data/subdir/nested{i}.txt'] == f'nested{i}'.encode()
+    with Barecat(target_path, readonly=True) as bc:
+        assert bc.num_files == 10
+        for i in range(5):
+            assert bc[f'data/file{i}.txt'] == f'content{i}'.encode()
+            assert bc[f'data/subdir/nested{i}.txt'] == f'nested{i}'.encode()
+        if _VERIFY:
             assert bc.verify_integrity()
 
 
-def test_merge_partial_overlap_dirs():
+def test_merge_partial_overlap_dirs(tmp_path):
     """Test merge where source and target have overlapping directory structure."""
-    with tempfile.TemporaryDirectory() as tempdir:
-        source_path = osp.join(tempdir, 'source.barecat')
-        target_path = osp.join(tempdir, 'target.barecat')
+    source_path = osp.join(tmp_path, 'source.barecat')
+    target_path = osp.join(tmp_path, 'target.barecat')
 
-        with Barecat(source_path, readonly=False) as bc:
-            bc['shared/new.txt'] = b'new'
-            bc['shared/sub/new_nested.txt'] = b'new_nested'
-            bc['only_source/file.txt'] = b'only_source'
+    with Barecat(source_path, readonly=False) as bc:
+        bc['shared/new.txt'] = b'new'
+        bc['shared/sub/new_nested.txt'] = b'new_nested'
+        bc['only_source/file.txt'] = b'only_source'
 
-        with Barecat(target_path, readonly=False) as bc:
-            bc['shared/existing.txt'] = b'existing'
-            bc['shared/sub/existing_nested.txt'] = b'existing_nested'
-            bc['only_target/file.txt'] = b'only_target'
+    with Barecat(target_path, readonly=False) as bc:
+        bc['shared/existing.txt'] = b'existing'
+        bc['shared/sub/existing_nested.txt'] = b'existing_nested'
+        bc['only_target/file.txt'] = b'only_target'
 
-        with Barecat(target_path, readonly=False) as bc:
-            bc.merge_from_other_barecat(source_path)
+    with Barecat(target_path, readonly=False) as bc:
+        bc.merge_from_other_barecat(source_path)
+        if _VERIFY:
             assert bc.verify_integrity()
 
-        with Barecat(target_path, readonly=True) as bc:
-            assert bc['shared/new.txt'] == b'new'
-            assert bc['shared/existing.txt'] == b'existing'
-            assert bc['shared/sub/new_nested.txt'] == b'new_nested'
-            assert bc['shared/sub/existing_nested.txt'] == b'existing_nested'
-            assert bc['only_source/file.txt'] == b'only_source'
-            assert bc['only_target/file.txt'] == b'only_target'
+    with Barecat(target_path, readonly=True) as bc:
+        assert bc['shared/new.txt'] == b'new'
+        assert bc['shared/existing.txt'] == b'existing'
+        assert bc['shared/sub/new_nested.txt'] == b'new_nested'
+        assert bc['shared/sub/existing_nested.txt'] == b'existing_nested'
+        assert bc['only_source/file.txt'] == b'only_source'
+        assert bc['only_target/file.txt'] == b'only_target'
 
-            # Check stats
-            shared_info = bc.index.lookup_dir('shared')
-            assert shared_info.num_files == 2
-            assert shared_info.num_subdirs == 1
-            assert shared_info.num_files_tree == 4
+        # Check stats
+        shared_info = bc.index.lookup_dir('shared')
+        assert shared_info.num_files == 2
+        assert shared_info.num_subdirs == 1
+        assert shared_info.num_files_tree == 4
 
+        if _VERIFY:
             assert bc.verify_integrity()
 
 
-def test_merge_source_only_directories():
+def test_merge_source_only_directories(tmp_path):
     """Test merging source that has explicit directory entries but no files."""
-    with tempfile.TemporaryDirectory() as tempdir:
-        source_path = osp.join(tempdir, 'source.barecat')
-        target_path = osp.join(tempdir, 'target.barecat')
+    source_path = osp.join(tmp_path, 'source.barecat')
+    target_path = osp.join(tmp_path, 'target.barecat')
 
-        # Create source with a file, then delete it to leave empty dirs
-        with Barecat(source_path, readonly=False) as bc:
-            bc['dir/subdir/file.txt'] = b'temp'
-            del bc['dir/subdir/file.txt']
+    # Create source with a file, then delete it to leave empty dirs
+    with Barecat(source_path, readonly=False) as bc:
+        bc['dir/subdir/file.txt'] = b'temp'
+        del bc['dir/subdir/file.txt']
 
-        with Barecat(target_path, readonly=False) as bc:
-            bc['existing.txt'] = b'existing'
+    with Barecat(target_path, readonly=False) as bc:
+        bc['existing.txt'] = b'existing'
 
-        with Barecat(target_path, readonly=False) as bc:
-            bc.merge_from_other_barecat(source_path, prefix='imported')
+    with Barecat(target_path, readonly=False) as bc:
+        bc.merge_from_other_barecat(source_path, prefix='imported')
+        if _VERIFY:
             assert bc.verify_integrity()
 
-        with Barecat(target_path, readonly=True) as bc:
-            assert bc['existing.txt'] == b'existing'
-            # Empty directory structure should exist
-            assert 'imported' in bc.listdir('')
+    with Barecat(target_path, readonly=True) as bc:
+        assert bc['existing.txt'] == b'existing'
+        # Empty directory structure should exist
+        assert 'imported' in bc.listdir('')
+        if _VERIFY:
             assert bc.verify_integrity()
 
 
-def test_merge_binary_content():
+def test_merge_binary_content(tmp_path):
     """Test merging files with various binary content including null bytes."""
-    with tempfile.TemporaryDirectory() as tempdir:
-        source_path = osp.join(tempdir, 'source.barecat')
-        target_path = osp.join(tempdir, 'target.barecat')
+    source_path = osp.join(tmp_path, 'source.barecat')
+    target_path = osp.join(tmp_path, 'target.barecat')
 
-        binary_data = bytes(range(256)) * 10  # All possible byte values
+    binary_data = bytes(range(256)) * 10  # All possible byte values
 
-        with Barecat(source_path, readonly=False) as bc:
-            bc['binary.bin'] = binary_data
-            bc['nulls.bin'] = b'\x00' * 1000
-            bc['mixed.bin'] = b'\x00\xff\x00\xff' * 250
+    with Barecat(source_path, readonly=False) as bc:
+        bc['binary.bin'] = binary_data
+        bc['nulls.bin'] = b'\x00' * 1000
+        bc['mixed.bin'] = b'\x00\xff\x00\xff' * 250
 
-        with Barecat(target_path, readonly=False) as bc:
-            pass
+    with Barecat(target_path, readonly=False) as bc:
+        pass
 
-        with Barecat(target_path, readonly=False) as bc:
-            bc.merge_from_other_barecat(source_path, prefix='data')
+    with Barecat(target_path, readonly=False) as bc:
+        bc.merge_from_other_barecat(source_path, prefix='data')
+        if _VERIFY:
             assert bc.verify_integrity()
 
-        with Barecat(target_path, readonly=True) as bc:
-            assert bc['data/binary.bin'] == binary_data
-            assert bc['data/nulls.bin'] == b'\x00' * 1000
-            assert bc['data/mixed.bin'] == b'\x00\xff\x00\xff' * 250
+    with Barecat(target_path, readonly=True) as bc:
+        assert bc['data/binary.bin'] == binary_data
+        assert bc['data/nulls.bin'] == b'\x00' * 1000
+        assert bc['data/mixed.bin'] == b'\x00\xff\x00\xff' * 250
+        if _VERIFY:
             assert bc.verify_integrity()
 
 
-def test_merge_with_shard_size_larger_than_source():
+def test_merge_with_shard_size_larger_than_source(tmp_path):
     """Test merge where target shard limit is larger than entire source."""
-    with tempfile.TemporaryDirectory() as tempdir:
-        source_path = osp.join(tempdir, 'source.barecat')
-        target_path = osp.join(tempdir, 'target.barecat')
+    source_path = osp.join(tmp_path, 'source.barecat')
+    target_path = osp.join(tmp_path, 'target.barecat')
 
-        with Barecat(source_path, readonly=False) as bc:
-            bc['small.txt'] = b'tiny'
+    with Barecat(source_path, readonly=False) as bc:
+        bc['small.txt'] = b'tiny'
 
-        with Barecat(target_path, readonly=False, shard_size_limit=1000000) as bc:
-            bc['existing.txt'] = b'existing'
+    with Barecat(target_path, readonly=False, shard_size_limit=1000000) as bc:
+        bc['existing.txt'] = b'existing'
 
-        with Barecat(target_path, readonly=False, shard_size_limit=1000000) as bc:
-            bc.merge_from_other_barecat(source_path)
+    with Barecat(target_path, readonly=False, shard_size_limit=1000000) as bc:
+        bc.merge_from_other_barecat(source_path)
+        if _VERIFY:
             assert bc.verify_integrity()
 
-        with Barecat(target_path, readonly=True) as bc:
-            assert bc['small.txt'] == b'tiny'
-            assert bc['existing.txt'] == b'existing'
+    with Barecat(target_path, readonly=True) as bc:
+        assert bc['small.txt'] == b'tiny'
+        assert bc['existing.txt'] == b'existing'
+        if _VERIFY:
             assert bc.verify_integrity()
 
 
-def test_merge_large_file():
+def test_merge_large_file(tmp_path):
     """Test merging a large file (bigger than typical buffer sizes)."""
-    with tempfile.TemporaryDirectory() as tempdir:
-        source_path = osp.join(tempdir, 'source.barecat')
-        target_path = osp.join(tempdir, 'target.barecat')
+    source_path = osp.join(tmp_path, 'source.barecat')
+    target_path = osp.join(tmp_path, 'target.barecat')
 
-        large_data = os.urandom(1024 * 1024)  # 1 MB
+    large_data = os.urandom(1024 * 1024)  # 1 MB
 
-        with Barecat(source_path, readonly=False) as bc:
-            bc['large.bin'] = large_data
+    with Barecat(source_path, readonly=False) as bc:
+        bc['large.bin'] = large_data
 
-        with Barecat(target_path, readonly=False) as bc:
-            pass
+    with Barecat(target_path, readonly=False) as bc:
+        pass
 
-        with Barecat(target_path, readonly=False) as bc:
-            bc.merge_from_other_barecat(source_path, prefix='data')
+    with Barecat(target_path, readonly=False) as bc:
+        bc.merge_from_other_barecat(source_path, prefix='data')
+        if _VERIFY:
             assert bc.verify_integrity()
 
-        with Barecat(target_path, readonly=True) as bc:
-            assert bc['data/large.bin'] == large_data
+    with Barecat(target_path, readonly=True) as bc:
+        assert bc['data/large.bin'] == large_data
+        if _VERIFY:
             assert bc.verify_integrity()
 
 
-def test_merge_stats_with_ignore_duplicates_complex():
+def test_merge_stats_with_ignore_duplicates_complex(tmp_path):
     """Test that stats are correct after ignore_duplicates with complex overlap."""
-    with tempfile.TemporaryDirectory() as tempdir:
-        source_path = osp.join(tempdir, 'source.barecat')
-        target_path = osp.join(tempdir, 'target.barecat')
+    source_path = osp.join(tmp_path, 'source.barecat')
+    target_path = osp.join(tmp_path, 'target.barecat')
 
-        # Source has mix of new and duplicate files
-        with Barecat(source_path, readonly=False) as bc:
-            bc['dup1.txt'] = b'12345'  # 5 bytes, will be skipped
-            bc['new1.txt'] = b'abc'  # 3 bytes, will be added
-            bc['dir/dup2.txt'] = b'xyz'  # 3 bytes, will be skipped
-            bc['dir/new2.txt'] = b'qwerty'  # 6 bytes, will be added
+    # Source has mix of new and duplicate files
+    with Barecat(source_path, readonly=False) as bc:
+        bc['dup1.txt'] = b'12345'  # 5 bytes, will be skipped
+        bc['new1.txt'] = b'abc'  # 3 bytes, will be added
+        bc['dir/dup2.txt'] = b'xyz'  # 3 bytes, will be skipped
+        bc['dir/new2.txt'] = b'qwerty'  # 6 bytes, will be added
 
-        with Barecat(target_path, readonly=False) as bc:
-            bc['dup1.txt'] = b'AAAAA'  # 5 bytes
-            bc['dir/dup2.txt'] = b'BBB'  # 3 bytes
-            bc['other.txt'] = b'CC'  # 2 bytes
+    with Barecat(target_path, readonly=False) as bc:
+        bc['dup1.txt'] = b'AAAAA'  # 5 bytes
+        bc['dir/dup2.txt'] = b'BBB'  # 3 bytes
+        bc['other.txt'] = b'CC'  # 2 bytes
 
-        with Barecat(target_path, readonly=False) as bc:
-            bc.merge_from_other_barecat(source_path, ignore_duplicates=True)
+    with Barecat(target_path, readonly=False) as bc:
+        bc.merge_from_other_barecat(source_path, ignore_duplicates=True)
+        if _VERIFY:
             assert bc.verify_integrity()
 
-        with Barecat(target_path, readonly=True) as bc:
-            # Original files kept
-            assert bc['dup1.txt'] == b'AAAAA'
-            assert bc['dir/dup2.txt'] == b'BBB'
-            assert bc['other.txt'] == b'CC'
-            # New files added
-            assert bc['new1.txt'] == b'abc'
-            assert bc['dir/new2.txt'] == b'qwerty'
+    with Barecat(target_path, readonly=True) as bc:
+        # Original files kept
+        assert bc['dup1.txt'] == b'AAAAA'
+        assert bc['dir/dup2.txt'] == b'BBB'
+        assert bc['other.txt'] == b'CC'
+        # New files added
+        assert bc['new1.txt'] == b'abc'
+        assert bc['dir/new2.txt'] == b'qwerty'
 
-            # Check stats
-            root_info = bc.index.lookup_dir('')
-            assert root_info.num_files == 3  # dup1, new1, other
-            assert root_info.num_files_tree == 5  # all files
-            # 5 (AAAAA) + 3 (abc) + 2 (CC) + 3 (BBB) + 6 (qwerty) = 19
-            assert root_info.size_tree == 19
+        # Check stats
+        root_info = bc.index.lookup_dir('')
+        assert root_info.num_files == 3  # dup1, new1, other
+        assert root_info.num_files_tree == 5  # all files
+        # 5 (AAAAA) + 3 (abc) + 2 (CC) + 3 (BBB) + 6 (qwerty) = 19
+        assert root_info.size_tree == 19
 
-            dir_info = bc.index.lookup_dir('dir')
-            assert dir_info.num_files == 2  # dup2, new2
-            assert dir_info.size_tree == 9  # 3 + 6
+        dir_info = bc.index.lookup_dir('dir')
+        assert dir_info.num_files == 2  # dup2, new2
+        assert dir_info.size_tree == 9  # 3 + 6
 
+        if _VERIFY:
             assert bc.verify_integrity()
 
 
-def test_merge_crc32c_integrity():
+def test_merge_crc32c_integrity(tmp_path):
     """Test that CRC32C checksums are correct after merge."""
-    with tempfile.TemporaryDirectory() as tempdir:
-        source_path = osp.join(tempdir, 'source.barecat')
-        target_path = osp.join(tempdir, 'target.barecat')
+    source_path = osp.join(tmp_path, 'source.barecat')
+    target_path = osp.join(tmp_path, 'target.barecat')
 
-        test_data = b'test data for crc verification'
+    test_data = b'test data for crc verification'
 
-        with Barecat(source_path, readonly=False) as bc:
-            bc['file.txt'] = test_data
+    with Barecat(source_path, readonly=False) as bc:
+        bc['file.txt'] = test_data
 
-        with Barecat(target_path, readonly=False) as bc:
-            pass
+    with Barecat(target_path, readonly=False) as bc:
+        pass
 
-        with Barecat(target_path, readonly=False) as bc:
-            bc.merge_from_other_barecat(source_path, prefix='data')
+    with Barecat(target_path, readonly=False) as bc:
+        bc.merge_from_other_barecat(source_path, prefix='data')
 
-        with Barecat(target_path, readonly=True) as bc:
-            # verify_integrity checks CRC32C
-            assert bc.verify_integrity()
-            # Also verify content matches
-            assert bc['data/file.txt'] == test_data
+    with Barecat(target_path, readonly=True) as bc:
+        # verify_integrity checks CRC32C
+        assert bc.verify_integrity()
+        # Also verify content matches
+        assert bc['data/file.txt'] == test_data
 
 
-def test_merge_special_filenames():
+def test_merge_special_filenames(tmp_path):
     """Test merging files with special characters in names."""
-    with tempfile.TemporaryDirectory() as tempdir:
-        source_path = osp.join(tempdir, 'source.barecat')
-        target_path = osp.join(tempdir, 'target.barecat')
+    source_path = osp.join(tmp_path, 'source.barecat')
+    target_path = osp.join(tmp_path, 'target.barecat')
 
-        with Barecat(source_path, readonly=False) as bc:
-            bc['file with spaces.txt'] = b'spaces'
-            bc['file-with-dashes.txt'] = b'dashes'
-            bc['file_with_underscores.txt'] = b'underscores'
-            bc['file.multiple.dots.txt'] = b'dots'
-            bc["file'with'quotes.txt"] = b'quotes'
-            bc['file(with)parens.txt'] = b'parens'
-            bc['file[with]brackets.txt'] = b'brackets'
+    with Barecat(source_path, readonly=False) as bc:
+        bc['file with spaces.txt'] = b'spaces'
+        bc['file-with-dashes.txt'] = b'dashes'
+        bc['file_with_underscores.txt'] = b'underscores'
+        bc['file.multiple.dots.txt'] = b'dots'
+        bc["file'with'quotes.txt"] = b'quotes'
+        bc['file(with)parens.txt'] = b'parens'
+        bc['file[with]brackets.txt'] = b'brackets'
 
-        with Barecat(target_path, readonly=False) as bc:
-            pass
+    with Barecat(target_path, readonly=False) as bc:
+        pass
 
-        with Barecat(target_path, readonly=False) as bc:
-            bc.merge_from_other_barecat(source_path)
+    with Barecat(target_path, readonly=False) as bc:
+        bc.merge_from_other_barecat(source_path)
+        if _VERIFY:
             assert bc.verify_integrity()
 
-        with Barecat(target_path, readonly=True) as bc:
-            assert bc['file with spaces.txt'] == b'spaces'
-            assert bc['file.multiple.dots.txt'] == b'dots'
+    with Barecat(target_path, readonly=True) as bc:
+        assert bc['file with spaces.txt'] == b'spaces'
+        assert bc['file.multiple.dots.txt'] == b'dots'
+        if _VERIFY:
             assert bc.verify_integrity()
 
 
-def test_merge_prefix_conflicts_with_file():
+def test_merge_prefix_conflicts_with_file(tmp_path):
     """Test that merge fails if prefix conflicts with an existing file."""
-    with tempfile.TemporaryDirectory() as tempdir:
-        source_path = osp.join(tempdir, 'source.barecat')
-        target_path = osp.join(tempdir, 'target.barecat')
+    source_path = osp.join(tmp_path, 'source.barecat')
+    target_path = osp.join(tmp_path, 'target.barecat')
 
-        with Barecat(source_path, readonly=False) as bc:
-            bc['file.txt'] = b'source'
+    with Barecat(source_path, readonly=False) as bc:
+        bc['file.txt'] = b'source'
 
-        # Target has 'data' as a FILE
-        with Barecat(target_path, readonly=False) as bc:
-            bc['data'] = b'im a file not a dir'
+    # Target has 'data' as a FILE
+    with Barecat(target_path, readonly=False) as bc:
+        bc['data'] = b'im a file not a dir'
 
-        # Merge with prefix='data' should fail
-        with Barecat(target_path, readonly=False) as bc:
-            with pytest.raises(Exception):
-                bc.merge_from_other_barecat(source_path, prefix='data')
+    # Merge with prefix='data' should fail
+    with Barecat(target_path, readonly=False) as bc:
+        with pytest.raises(Exception):
+            bc.merge_from_other_barecat(source_path, prefix='data')
 
 
-def test_merge_prefix_conflicts_with_file_nested():
+def test_merge_prefix_conflicts_with_file_nested(tmp_path):
     """Test that merge fails if any prefix component conflicts with a file."""
-    with tempfile.TemporaryDirectory() as tempdir:
-        source_path = osp.join(tempdir, 'source.barecat')
-        target_path = osp.join(tempdir, 'target.barecat')
+    source_path = osp.join(tmp_path, 'source.barecat')
+    target_path = osp.join(tmp_path, 'target.barecat')
 
-        with Barecat(source_path, readonly=False) as bc:
-            bc['file.txt'] = b'source'
+    with Barecat(source_path, readonly=False) as bc:
+        bc['file.txt'] = b'source'
 
-        # Target has 'a/b' as a FILE
-        with Barecat(target_path, readonly=False) as bc:
-            bc['a/b'] = b'im a file'
+    # Target has 'a/b' as a FILE
+    with Barecat(target_path, readonly=False) as bc:
+        bc['a/b'] = b'im a file'
 
-        # Merge with prefix='a/b/c' should fail (b is a file, not a dir)
-        with Barecat(target_path, readonly=False) as bc:
-            with pytest.raises(Exception):
-                bc.merge_from_other_barecat(source_path, prefix='a/b/c')
+    # Merge with prefix='a/b/c' should fail (b is a file, not a dir)
+    with Barecat(target_path, readonly=False) as bc:
+        with pytest.raises(Exception):
+            bc.merge_from_other_barecat(source_path, prefix='a/b/c')
 
 
-def test_merge_source_file_conflicts_with_target_dir():
+def test_merge_source_file_conflicts_with_target_dir(tmp_path):
     """Test that merge fails if source file path matches target directory."""
-    with tempfile.TemporaryDirectory() as tempdir:
-        source_path = osp.join(tempdir, 'source.barecat')
-        target_path = osp.join(tempdir, 'target.barecat')
+    source_path = osp.join(tmp_path, 'source.barecat')
+    target_path = osp.join(tmp_path, 'target.barecat')
 
-        # Source has 'data' as a FILE
-        with Barecat(source_path, readonly=False) as bc:
-            bc['data'] = b'im a file'
+    # Source has 'data' as a FILE
+    with Barecat(source_path, readonly=False) as bc:
+        bc['data'] = b'im a file'
 
-        # Target has 'data' as a DIRECTORY (with a file inside)
-        with Barecat(target_path, readonly=False) as bc:
-            bc['data/file.txt'] = b'nested'
+    # Target has 'data' as a DIRECTORY (with a file inside)
+    with Barecat(target_path, readonly=False) as bc:
+        bc['data/file.txt'] = b'nested'
 
-        with Barecat(target_path, readonly=False) as bc:
-            with pytest.raises(ValueError, match='conflicts with target directory'):
-                bc.merge_from_other_barecat(source_path)
+    with Barecat(target_path, readonly=False) as bc:
+        with pytest.raises(ValueError, match='conflicts with target directory'):
+            bc.merge_from_other_barecat(source_path)
 
 
-def test_merge_source_dir_conflicts_with_target_file():
+def test_merge_source_dir_conflicts_with_target_file(tmp_path):
     """Test that merge fails if source directory path matches target file."""
-    with tempfile.TemporaryDirectory() as tempdir:
-        source_path = osp.join(tempdir, 'source.barecat')
-        target_path = osp.join(tempdir, 'target.barecat')
+    source_path = osp.join(tmp_path, 'source.barecat')
+    target_path = osp.join(tmp_path, 'target.barecat')
 
-        # Source has 'data' as a DIRECTORY
-        with Barecat(source_path, readonly=False) as bc:
-            bc['data/file.txt'] = b'nested'
+    # Source has 'data' as a DIRECTORY
+    with Barecat(source_path, readonly=False) as bc:
+        bc['data/file.txt'] = b'nested'
 
-        # Target has 'data' as a FILE
-        with Barecat(target_path, readonly=False) as bc:
-            bc['data'] = b'im a file'
+    # Target has 'data' as a FILE
+    with Barecat(target_path, readonly=False) as bc:
+        bc['data'] = b'im a file'
 
-        with Barecat(target_path, readonly=False) as bc:
-            with pytest.raises(ValueError, match='conflicts with target file'):
-                bc.merge_from_other_barecat(source_path)
+    with Barecat(target_path, readonly=False) as bc:
+        with pytest.raises(ValueError, match='conflicts with target file'):
+            bc.merge_from_other_barecat(source_path)
 
 
-def test_merge_preserves_empty_files():
+def test_merge_preserves_empty_files(tmp_path):
     """Test that empty files are preserved during merge."""
-    with tempfile.TemporaryDirectory() as tempdir:
-        source_path = osp.join(tempdir, 'source.barecat')
-        target_path = osp.join(tempdir, 'target.barecat')
+    source_path = osp.join(tmp_path, 'source.barecat')
+    target_path = osp.join(tmp_path, 'target.barecat')
 
-        with Barecat(source_path, readonly=False) as bc:
-            bc['empty.txt'] = b''
-            bc['nonempty.txt'] = b'content'
-            bc['dir/empty_nested.txt'] = b''
+    with Barecat(source_path, readonly=False) as bc:
+        bc['empty.txt'] = b''
+        bc['nonempty.txt'] = b'content'
+        bc['dir/empty_nested.txt'] = b''
 
-        with Barecat(target_path, readonly=False) as bc:
-            pass
+    with Barecat(target_path, readonly=False) as bc:
+        pass
 
-        with Barecat(target_path, readonly=False) as bc:
-            bc.merge_from_other_barecat(source_path, prefix='data')
+    with Barecat(target_path, readonly=False) as bc:
+        bc.merge_from_other_barecat(source_path, prefix='data')
+        if _VERIFY:
             assert bc.verify_integrity()
 
-        with Barecat(target_path, readonly=True) as bc:
-            assert bc['data/empty.txt'] == b''
-            assert bc['data/nonempty.txt'] == b'content'
-            assert bc['data/dir/empty_nested.txt'] == b''
-            assert bc.num_files == 3
+    with Barecat(target_path, readonly=True) as bc:
+        assert bc['data/empty.txt'] == b''
+        assert bc['data/nonempty.txt'] == b'content'
+        assert bc['data/dir/empty_nested.txt'] == b''
+        assert bc.num_files == 3
+        if _VERIFY:
             assert bc.verify_integrity()
 
 
@@ -1005,411 +1028,450 @@ def symlink_shards(source_path, target_path, target_num_shards):
     return shard_num
 
 
-def test_symlink_merge_no_prefix():
+def test_symlink_merge_no_prefix(tmp_path):
     """Test symlink-based merge without prefix."""
     from barecat.core.index import Index
 
-    with tempfile.TemporaryDirectory() as tempdir:
-        source_path = osp.join(tempdir, 'source.barecat')
-        target_path = osp.join(tempdir, 'target.barecat')
+    source_path = osp.join(tmp_path, 'source.barecat')
+    target_path = osp.join(tmp_path, 'target.barecat')
 
-        with Barecat(source_path, readonly=False) as bc:
-            bc['file1.txt'] = b'source1'
-            bc['dir/file2.txt'] = b'source2'
+    with Barecat(source_path, readonly=False) as bc:
+        bc['file1.txt'] = b'source1'
+        bc['dir/file2.txt'] = b'source2'
 
-        with Barecat(target_path, readonly=False) as bc:
-            bc['existing.txt'] = b'existing'
-            target_num_shards = bc.sharder.num_shards
+    with Barecat(target_path, readonly=False) as bc:
+        bc['existing.txt'] = b'existing'
+        target_num_shards = bc.sharder.num_shards
 
-        # Symlink source shards to target
-        symlink_shards(source_path, target_path, target_num_shards)
+    # Symlink source shards to target
+    symlink_shards(source_path, target_path, target_num_shards)
 
-        # Merge indexes only (using Index directly, no shard access needed)
-        with Index(target_path, readonly=False) as idx:
-            idx.merge_from_other_barecat(source_path)
+    # Merge indexes only (using Index directly, no shard access needed)
+    with Index(target_path, readonly=False) as idx:
+        idx.merge_from_other_barecat(source_path)
 
-        with Barecat(target_path, readonly=True) as bc:
-            assert bc['existing.txt'] == b'existing'
-            assert bc['file1.txt'] == b'source1'
-            assert bc['dir/file2.txt'] == b'source2'
-            assert bc.num_files == 3
+    with Barecat(target_path, readonly=True) as bc:
+        assert bc['existing.txt'] == b'existing'
+        assert bc['file1.txt'] == b'source1'
+        assert bc['dir/file2.txt'] == b'source2'
+        assert bc.num_files == 3
+        if _VERIFY:
             assert bc.verify_integrity()
 
 
-def test_symlink_merge_with_prefix():
+def test_symlink_merge_with_prefix(tmp_path):
     """Test symlink-based merge with prefix."""
     from barecat.core.index import Index
 
-    with tempfile.TemporaryDirectory() as tempdir:
-        source_path = osp.join(tempdir, 'source.barecat')
-        target_path = osp.join(tempdir, 'target.barecat')
+    source_path = osp.join(tmp_path, 'source.barecat')
+    target_path = osp.join(tmp_path, 'target.barecat')
 
-        with Barecat(source_path, readonly=False) as bc:
-            bc['file1.txt'] = b'source1'
-            bc['dir/file2.txt'] = b'source2'
+    with Barecat(source_path, readonly=False) as bc:
+        bc['file1.txt'] = b'source1'
+        bc['dir/file2.txt'] = b'source2'
 
-        with Barecat(target_path, readonly=False) as bc:
-            bc['existing.txt'] = b'existing'
-            target_num_shards = bc.sharder.num_shards
+    with Barecat(target_path, readonly=False) as bc:
+        bc['existing.txt'] = b'existing'
+        target_num_shards = bc.sharder.num_shards
 
-        symlink_shards(source_path, target_path, target_num_shards)
+    symlink_shards(source_path, target_path, target_num_shards)
 
-        with Index(target_path, readonly=False) as idx:
-            idx.merge_from_other_barecat(source_path, prefix='imported')
+    with Index(target_path, readonly=False) as idx:
+        idx.merge_from_other_barecat(source_path, prefix='imported')
 
-        with Barecat(target_path, readonly=True) as bc:
-            assert bc['existing.txt'] == b'existing'
-            assert bc['imported/file1.txt'] == b'source1'
-            assert bc['imported/dir/file2.txt'] == b'source2'
-            assert bc.num_files == 3
+    with Barecat(target_path, readonly=True) as bc:
+        assert bc['existing.txt'] == b'existing'
+        assert bc['imported/file1.txt'] == b'source1'
+        assert bc['imported/dir/file2.txt'] == b'source2'
+        assert bc.num_files == 3
+        if _VERIFY:
             assert bc.verify_integrity()
 
 
-def test_symlink_merge_ignore_duplicates():
+def test_symlink_merge_ignore_duplicates(tmp_path):
     """Test symlink-based merge with ignore_duplicates."""
     from barecat.core.index import Index
 
-    with tempfile.TemporaryDirectory() as tempdir:
-        source_path = osp.join(tempdir, 'source.barecat')
-        target_path = osp.join(tempdir, 'target.barecat')
+    source_path = osp.join(tmp_path, 'source.barecat')
+    target_path = osp.join(tmp_path, 'target.barecat')
 
-        with Barecat(source_path, readonly=False) as bc:
-            bc['file1.txt'] = b'source_version'
-            bc['unique.txt'] = b'unique'
+    with Barecat(source_path, readonly=False) as bc:
+        bc['file1.txt'] = b'source_version'
+        bc['unique.txt'] = b'unique'
 
-        with Barecat(target_path, readonly=False) as bc:
-            bc['file1.txt'] = b'target_version'
-            target_num_shards = bc.sharder.num_shards
+    with Barecat(target_path, readonly=False) as bc:
+        bc['file1.txt'] = b'target_version'
+        target_num_shards = bc.sharder.num_shards
 
-        symlink_shards(source_path, target_path, target_num_shards)
+    symlink_shards(source_path, target_path, target_num_shards)
 
-        with Index(target_path, readonly=False) as idx:
-            idx.merge_from_other_barecat(source_path, ignore_duplicates=True)
+    with Index(target_path, readonly=False) as idx:
+        idx.merge_from_other_barecat(source_path, ignore_duplicates=True)
 
-        with Barecat(target_path, readonly=True) as bc:
-            # Target version should be preserved
-            assert bc['file1.txt'] == b'target_version'
-            assert bc['unique.txt'] == b'unique'
-            assert bc.num_files == 2
+    with Barecat(target_path, readonly=True) as bc:
+        # Target version should be preserved
+        assert bc['file1.txt'] == b'target_version'
+        assert bc['unique.txt'] == b'unique'
+        assert bc.num_files == 2
+        if _VERIFY:
             assert bc.verify_integrity()
 
 
-def test_symlink_merge_conflict_file_vs_dir():
+def test_symlink_merge_conflict_file_vs_dir(tmp_path):
     """Test symlink merge fails when source file conflicts with target dir."""
     from barecat.core.index import Index
 
-    with tempfile.TemporaryDirectory() as tempdir:
-        source_path = osp.join(tempdir, 'source.barecat')
-        target_path = osp.join(tempdir, 'target.barecat')
+    source_path = osp.join(tmp_path, 'source.barecat')
+    target_path = osp.join(tmp_path, 'target.barecat')
 
-        with Barecat(source_path, readonly=False) as bc:
-            bc['data'] = b'im a file'
+    with Barecat(source_path, readonly=False) as bc:
+        bc['data'] = b'im a file'
 
-        with Barecat(target_path, readonly=False) as bc:
-            bc['data/nested.txt'] = b'nested'
-            target_num_shards = bc.sharder.num_shards
+    with Barecat(target_path, readonly=False) as bc:
+        bc['data/nested.txt'] = b'nested'
+        target_num_shards = bc.sharder.num_shards
 
-        symlink_shards(source_path, target_path, target_num_shards)
+    symlink_shards(source_path, target_path, target_num_shards)
 
-        with Index(target_path, readonly=False) as idx:
-            with pytest.raises(ValueError, match='conflicts with target directory'):
-                idx.merge_from_other_barecat(source_path)
+    with Index(target_path, readonly=False) as idx:
+        with pytest.raises(ValueError, match='conflicts with target directory'):
+            idx.merge_from_other_barecat(source_path)
 
 
-def test_symlink_merge_conflict_dir_vs_file():
+def test_symlink_merge_conflict_dir_vs_file(tmp_path):
     """Test symlink merge fails when source dir conflicts with target file."""
     from barecat.core.index import Index
 
-    with tempfile.TemporaryDirectory() as tempdir:
-        source_path = osp.join(tempdir, 'source.barecat')
-        target_path = osp.join(tempdir, 'target.barecat')
+    source_path = osp.join(tmp_path, 'source.barecat')
+    target_path = osp.join(tmp_path, 'target.barecat')
 
-        with Barecat(source_path, readonly=False) as bc:
-            bc['data/nested.txt'] = b'nested'
+    with Barecat(source_path, readonly=False) as bc:
+        bc['data/nested.txt'] = b'nested'
 
-        with Barecat(target_path, readonly=False) as bc:
-            bc['data'] = b'im a file'
-            target_num_shards = bc.sharder.num_shards
+    with Barecat(target_path, readonly=False) as bc:
+        bc['data'] = b'im a file'
+        target_num_shards = bc.sharder.num_shards
 
-        symlink_shards(source_path, target_path, target_num_shards)
+    symlink_shards(source_path, target_path, target_num_shards)
 
-        with Index(target_path, readonly=False) as idx:
-            with pytest.raises(ValueError, match='conflicts with target file'):
-                idx.merge_from_other_barecat(source_path)
+    with Index(target_path, readonly=False) as idx:
+        with pytest.raises(ValueError, match='conflicts with target file'):
+            idx.merge_from_other_barecat(source_path)
 
 
-def test_symlink_merge_prefix_conflicts_with_file():
+def test_symlink_merge_prefix_conflicts_with_file(tmp_path):
     """Test symlink merge fails when prefix conflicts with existing file."""
     from barecat.core.index import Index
 
-    with tempfile.TemporaryDirectory() as tempdir:
-        source_path = osp.join(tempdir, 'source.barecat')
-        target_path = osp.join(tempdir, 'target.barecat')
+    source_path = osp.join(tmp_path, 'source.barecat')
+    target_path = osp.join(tmp_path, 'target.barecat')
 
-        with Barecat(source_path, readonly=False) as bc:
-            bc['file.txt'] = b'content'
+    with Barecat(source_path, readonly=False) as bc:
+        bc['file.txt'] = b'content'
 
-        with Barecat(target_path, readonly=False) as bc:
-            bc['imported'] = b'im a file, not a dir'
-            target_num_shards = bc.sharder.num_shards
+    with Barecat(target_path, readonly=False) as bc:
+        bc['imported'] = b'im a file, not a dir'
+        target_num_shards = bc.sharder.num_shards
 
-        symlink_shards(source_path, target_path, target_num_shards)
+    symlink_shards(source_path, target_path, target_num_shards)
 
-        with Index(target_path, readonly=False) as idx:
-            with pytest.raises(ValueError, match='exists as a file'):
-                idx.merge_from_other_barecat(source_path, prefix='imported')
+    with Index(target_path, readonly=False) as idx:
+        with pytest.raises(ValueError, match='exists as a file'):
+            idx.merge_from_other_barecat(source_path, prefix='imported')
 
 
-def test_symlink_merge_multi_shard():
+def test_symlink_merge_multi_shard(tmp_path):
     """Test symlink-based merge with multi-shard source."""
     from barecat.core.index import Index
 
-    with tempfile.TemporaryDirectory() as tempdir:
-        source_path = osp.join(tempdir, 'source.barecat')
-        target_path = osp.join(tempdir, 'target.barecat')
-
-        # Create multi-shard source
-        with Barecat(source_path, readonly=False, shard_size_limit=100) as bc:
-            for i in range(20):
-                bc[f'file{i}.txt'] = f'content{i}'.encode() * 10
-
-        with Barecat(source_path, readonly=True) as bc:
-            source_num_shards = bc.sharder.num_shards
-            assert source_num_shards > 1, 'Source should have multiple shards'
-
-        with Barecat(target_path, readonly=False) as bc:
-            bc['existing.txt'] = b'existing'
-            target_num_shards = bc.sharder.num_shards
-
-        num_linked = symlink_shards(source_path, target_path, target_num_shards)
-        assert num_linked == source_num_shards
-
-        with Index(target_path, readonly=False) as idx:
-            idx.merge_from_other_barecat(source_path, prefix='data')
-
-        with Barecat(target_path, readonly=True) as bc:
-            assert bc['existing.txt'] == b'existing'
-            for i in range(20):
-                assert bc[f'data/file{i}.txt'] == f'content{i}'.encode() * 10
-            assert bc.num_files == 21
-            assert bc.verify_integrity()
-
-
-def test_merge_with_pattern():
+    payloads = [f'content{i}'.encode() * 10 for i in range(20)]
+
+    source_path = osp.join(tmp_path, 'source.barecat')
+    target_path = osp.join(tmp_path, 'target.barecat')
+
+    # Create multi-shard source
+    with Barecat(source_path, readonly=False, shard_size_limit=100) as bc:
+        for i in range(20):
+            bc[f'file{i}.txt'] = payloads[i]
+
+    with Barecat(source_path, readonly=True) as bc:
+        source_num_shards = bc.sharder.num_shards
+        assert source_num_shards > 1, 'Source should have multiple shards'
+
+    with Barecat(target_path, readonly=False) as bc:
+        bc['existing.txt'] = b'existing'
+        target_num_shards = bc.sharder.num_shards
+
+    num_linked = symlink_shards(source_path, target_path, target_num_shards)
+    assert num_linked == source_num_shards
+
+    with Index(target_path, readonly=False) as idx:
+        idx.merge_from_other_barecat(source_path, prefix='data')
+
+    with Barecat(target_path, readonly=True) as bc:
+        assert bc['existing.txt'] == b'existing'
+        for i in range(20):
+            assert bc[f'data/file{i}.txt'] == payloads[i]
+        assert bc.num_files == 21
+        if _VERIFY:
+            assert bc.verify_integrity()
+
+
+# Union of the files used by the pattern/filter-rule merge tests below.
+_MIXED_SOURCE_FILES = {
+    'file1.txt': b'text1',
+    'file2.txt': b'text2',
+    'image1.jpg': b'jpg1',
+    'image2.jpg': b'jpg2',
+    'dir/file3.txt': b'text3',
+    'dir/image3.jpg': b'jpg3',
+    'dir/sub/file4.txt': b'text4',
+    'a.txt': b'a',
+    'b.jpg': b'b',
+    'sub/c.txt': b'c',
+    'sub/d.jpg': b'd',
+    'keep.txt': b'keep',
+    'skip.log': b'skip',
+    'data/important.txt': b'important',
+    'data/cache.tmp': b'cache',
+    'data/sub/file.txt': b'file',
+    'thumbs/small.jpg': b'small',
+    'thumbs/important.jpg': b'important_thumb',
+}
+_MIXED_SOURCE_JPGS = [p for p in _MIXED_SOURCE_FILES if p.endswith('.jpg')]
+
+
+@pytest.fixture(scope='session')
+def mixed_source(tmp_path_factory):
+    """Build the mixed .txt/.jpg/.log source archive once per session."""
+    source_path = osp.join(tmp_path_factory.mktemp('mixed_source'), 'source.barecat')
+    with Barecat(source_path, readonly=False) as bc:
+        for path, data in _MIXED_SOURCE_FILES.items():
+            bc[path] = data
+    return source_path
+
+
+def clone_source(source_path, dest_dir):
+    """Make a private copy of a source archive: copy the index, symlink the shards."""
+    dst_path = osp.join(dest_dir, osp.basename(source_path))
+    shutil.copy(source_path, dst_path)
+    symlink_shards(source_path, dst_path, 0)
+    return dst_path
+
+
+def test_merge_with_pattern(tmp_path, mixed_source):
     """Test merge with a glob pattern filter."""
-    with tempfile.TemporaryDirectory() as tempdir:
-        source_path = osp.join(tempdir, 'source.barecat')
-        target_path = osp.join(tempdir, 'target.barecat')
-
-        # Create source archive with mixed file types
-        with Barecat(source_path, readonly=False) as bc:
-            bc['file1.txt'] = b'text1'
-            bc['file2.txt'] = b'text2'
-            bc['image1.jpg'] = b'jpg1'
-            bc['image2.jpg'] = b'jpg2'
-            bc['dir/file3.txt'] = b'text3'
-            bc['dir/image3.jpg'] = b'jpg3'
-            bc['dir/sub/file4.txt'] = b'text4'
-
-        # Create target archive
-        with Barecat(target_path, readonly=False) as bc:
-            bc['existing.txt'] = b'existing'
-
-        # Merge only .jpg files
-        with Barecat(target_path, readonly=False) as bc:
-            bc.merge_from_other_barecat(source_path, pattern='**/*.jpg')
-            assert bc.verify_integrity()
-
-        # Verify only jpg files were merged
-        with Barecat(target_path, readonly=True) as bc:
-            assert bc['existing.txt'] == b'existing'
-            assert bc['image1.jpg'] == b'jpg1'
-            assert bc['image2.jpg'] == b'jpg2'
-            assert bc['dir/image3.jpg'] == b'jpg3'
-            assert bc.num_files == 4
-            assert 'file1.txt' not in bc
-            assert 'dir/file3.txt' not in bc
-            assert bc.verify_integrity()
-
-
-def test_merge_with_pattern_and_prefix():
+    source_path = clone_source(mixed_source, tmp_path)
+    target_path = osp.join(tmp_path, 'target.barecat')
+
+    # Create target archive
+    with Barecat(target_path, readonly=False) as bc:
+        bc['existing.txt'] = b'existing'
+
+    # Merge only .jpg files
+    with Barecat(target_path, readonly=False) as bc:
+        bc.merge_from_other_barecat(source_path, pattern='**/*.jpg')
+        if _VERIFY:
+            assert bc.verify_integrity()
+
+    # Verify only jpg files were merged
+    with Barecat(target_path, readonly=True) as bc:
+        assert bc['existing.txt'] == b'existing'
+        assert bc['image1.jpg'] == b'jpg1'
+        assert bc['image2.jpg'] == b'jpg2'
+        assert bc['dir/image3.jpg'] == b'jpg3'
+        assert bc['thumbs/small.jpg'] == b'small'
+        assert bc.num_files == len(_MIXED_SOURCE_JPGS) + 1
+        assert bc.contains_many(['file1.txt', 'dir/file3.txt', 'skip.log', 'dir/image3.jpg']) == {
+            'file1.txt': False,
+            'dir/file3.txt': False,
+            'skip.log': False,
+            'dir/image3.jpg': True,
+        }
+        if _VERIFY:
+            assert bc.verify_integrity()
+
+
+def test_merge_with_pattern_and_prefix(tmp_path, mixed_source):
     """Test merge with pattern and prefix."""
-    with tempfile.TemporaryDirectory() as tempdir:
-        source_path = osp.join(tempdir, 'source.barecat')
-        target_path = osp.join(tempdir, 'target.barecat')
-
-        with Barecat(source_path, readonly=False) as bc:
-            bc['a.txt'] = b'a'
-            bc['b.jpg'] = b'b'
-            bc['sub/c.txt'] = b'c'
-            bc['sub/d.jpg'] = b'd'
+    source_path = clone_source(mixed_source, tmp_path)
+    target_path = osp.join(tmp_path, 'target.barecat')
 
-        with Barecat(target_path, readonly=False) as bc:
-            bc['existing.txt'] = b'existing'
+    with Barecat(target_path, readonly=False) as bc:
+        bc['existing.txt'] = b'existing'
 
-        with Barecat(target_path, readonly=False) as bc:
-            bc.merge_from_other_barecat(source_path, pattern='**/*.jpg', prefix='images')
+    with Barecat(target_path, readonly=False) as bc:
+        bc.merge_from_other_barecat(source_path, pattern='**/*.jpg', prefix='images')
+        if _VERIFY:
             assert bc.verify_integrity()
 
-        with Barecat(target_path, readonly=True) as bc:
-            assert bc['existing.txt'] == b'existing'
-            assert bc['images/b.jpg'] == b'b'
-            assert bc['images/sub/d.jpg'] == b'd'
-            assert bc.num_files == 3
-            assert 'images/a.txt' not in bc
+    with Barecat(target_path, readonly=True) as bc:
+        assert bc['existing.txt'] == b'existing'
+        assert bc['images/b.jpg'] == b'b'
+        assert bc['images/sub/d.jpg'] == b'd'
+        assert bc.num_files == len(_MIXED_SOURCE_JPGS) + 1
+        assert bc.contains_many(['images/a.txt', 'b.jpg']) == {
+            'images/a.txt': False,
+            'b.jpg': False,
+        }
+        if _VERIFY:
             assert bc.verify_integrity()
 
 
-def test_merge_with_filter_rules():
+@pytest.mark.parametrize('workers', [1, 3])
+def test_merge_with_filter_rules(tmp_path, mixed_source, workers):
     """Test merge with rsync-style include/exclude rules."""
-    with tempfile.TemporaryDirectory() as tempdir:
-        source_path = osp.join(tempdir, 'source.barecat')
-        target_path = osp.join(tempdir, 'target.barecat')
-
-        with Barecat(source_path, readonly=False) as bc:
-            bc['keep.txt'] = b'keep'
-            bc['skip.log'] = b'skip'
-            bc['data/important.txt'] = b'important'
-            bc['data/cache.tmp'] = b'cache'
-            bc['data/sub/file.txt'] = b'file'
-            bc['thumbs/small.jpg'] = b'small'
-            bc['thumbs/important.jpg'] = b'important_thumb'
-
-        with Barecat(target_path, readonly=False) as bc:
-            bc['existing.txt'] = b'existing'
-
-        # Include all txt, exclude thumbs except important.jpg
-        filter_rules = [
-            ('+', '**/important.jpg'),  # include this specific file
-            ('-', 'thumbs/**'),  # exclude thumbs dir
-            ('-', '**/*.tmp'),  # exclude temp files
-            ('-', '**/*.log'),  # exclude log files
-        ]
-
-        with Barecat(target_path, readonly=False) as bc:
-            bc.merge_from_other_barecat(source_path, filter_rules=filter_rules)
-            assert bc.verify_integrity()
-
-        with Barecat(target_path, readonly=True) as bc:
-            assert bc['existing.txt'] == b'existing'
-            assert bc['keep.txt'] == b'keep'
-            assert bc['data/important.txt'] == b'important'
-            assert bc['data/sub/file.txt'] == b'file'
-            assert bc['thumbs/important.jpg'] == b'important_thumb'
-            assert 'skip.log' not in bc
-            assert 'data/cache.tmp' not in bc
-            assert 'thumbs/small.jpg' not in bc
-            assert bc.verify_integrity()
-
-
-def test_merge_filtered_contiguous_blocks():
+    source_path = clone_source(mixed_source, tmp_path)
+    target_path = osp.join(tmp_path, 'target.barecat')
+
+    with Barecat(target_path, readonly=False) as bc:
+        bc['existing.txt'] = b'existing'
+
+    # Include all txt, exclude thumbs except important.jpg
+    filter_rules = [
+        ('+', '**/important.jpg'),  # include this specific file
+        ('-', 'thumbs/**'),  # exclude thumbs dir
+        ('-', '**/*.tmp'),  # exclude temp files
+        ('-', '**/*.log'),  # exclude log files
+    ]
+
+    with Barecat(target_path, readonly=False) as bc:
+        bc.merge_from_other_barecat(source_path, filter_rules=filter_rules, workers=workers)
+        if _VERIFY:
+            assert bc.verify_integrity()
+
+    with Barecat(target_path, readonly=True) as bc:
+        assert bc['existing.txt'] == b'existing'
+        assert bc['keep.txt'] == b'keep'
+        assert bc['data/important.txt'] == b'important'
+        assert bc['data/sub/file.txt'] == b'file'
+        assert bc['thumbs/important.jpg'] == b'important_thumb'
+        assert bc['image1.jpg'] == b'jpg1'
+        assert bc.contains_many(['skip.log', 'data/cache.tmp', 'thumbs/small.jpg']) == {
+            'skip.log': False,
+            'data/cache.tmp': False,
+            'thumbs/small.jpg': False,
+        }
+        assert bc.num_files == len(_MIXED_SOURCE_FILES) - 3 + 1
+        if _VERIFY:
+            assert bc.verify_integrity()
+
+
+def test_merge_filtered_contiguous_blocks(tmp_path):
     """Test that filtered merge efficiently copies contiguous blocks."""
-    with tempfile.TemporaryDirectory() as tempdir:
-        source_path = osp.join(tempdir, 'source.barecat')
-        target_path = osp.join(tempdir, 'target.barecat')
+    source_path = osp.join(tmp_path, 'source.barecat')
+    target_path = osp.join(tmp_path, 'target.barecat')
 
-        # Create source with files that will be contiguous
-        with Barecat(source_path, readonly=False) as bc:
-            # These will be written contiguously
-            bc['a.txt'] = b'a' * 100
-            bc['b.txt'] = b'b' * 100
-            bc['c.txt'] = b'c' * 100
-            bc['d.jpg'] = b'd' * 100  # not matched
-            bc['e.txt'] = b'e' * 100
-            bc['f.txt'] = b'f' * 100
+    # Create source with files that will be contiguous
+    with Barecat(source_path, readonly=False) as bc:
+        # These will be written contiguously
+        bc['a.txt'] = b'a' * 100
+        bc['b.txt'] = b'b' * 100
+        bc['c.txt'] = b'c' * 100
+        bc['d.jpg'] = b'd' * 100  # not matched
+        bc['e.txt'] = b'e' * 100
+        bc['f.txt'] = b'f' * 100
 
-        with Barecat(target_path, readonly=False) as bc:
-            pass  # empty target
+    with Barecat(target_path, readonly=False) as bc:
+        pass  # empty target
 
-        with Barecat(target_path, readonly=False) as bc:
-            bc.merge_from_other_barecat(source_path, pattern='**/*.txt')
+    with Barecat(target_path, readonly=False) as bc:
+        bc.merge_from_other_barecat(source_path, pattern='**/*.txt')
+        if _VERIFY:
             assert bc.verify_integrity()
 
-        with Barecat(target_path, readonly=True) as bc:
-            assert bc['a.txt'] == b'a' * 100
-            assert bc['b.txt'] == b'b' * 100
-            assert bc['c.txt'] == b'c' * 100
-            assert bc['e.txt'] == b'e' * 100
-            assert bc['f.txt'] == b'f' * 100
-            assert 'd.jpg' not in bc
-            assert bc.num_files == 5
+    with Barecat(target_path, readonly=True) as bc:
+        assert bc['a.txt'] == b'a' * 100
+        assert bc['b.txt'] == b'b' * 100
+        assert bc['c.txt'] == b'c' * 100
+        assert bc['e.txt'] == b'e' * 100
+        assert bc['f.txt'] == b'f' * 100
+        assert 'd.jpg' not in bc
+        assert bc.num_files == 5
+        if _VERIFY:
             assert bc.verify_integrity()
 
 
-def test_merge_filtered_with_shard_rotation():
+def test_merge_filtered_with_shard_rotation(tmp_path):
     """Test filtered merge with shard size limit causing rotation."""
-    with tempfile.TemporaryDirectory() as tempdir:
-        source_path = osp.join(tempdir, 'source.barecat')
-        target_path = osp.join(tempdir, 'target.barecat')
+    PAYLOAD = b'x' * 100
 
-        # Create source with enough data to span shards
-        with Barecat(source_path, readonly=False) as bc:
-            for i in range(10):
-                bc[f'file{i}.txt'] = b'x' * 100
-                bc[f'file{i}.log'] = b'y' * 100  # won't be merged
+    source_path = osp.join(tmp_path, 'source.barecat')
+    target_path = osp.join(tmp_path, 'target.barecat')
 
-        # Target with small shard size
-        with Barecat(target_path, readonly=False, shard_size_limit=250) as bc:
-            bc['existing.txt'] = b'existing'
+    # Create source with enough data to span shards
+    with Barecat(source_path, readonly=False) as bc:
+        for i in range(10):
+            bc[f'file{i}.txt'] = PAYLOAD
+            bc[f'file{i}.log'] = b'y' * 100  # won't be merged
 
-        with Barecat(target_path, readonly=False) as bc:
-            bc.merge_from_other_barecat(source_path, pattern='**/*.txt')
+    # Target with small shard size
+    with Barecat(target_path, readonly=False, shard_size_limit=250) as bc:
+        bc['existing.txt'] = b'existing'
+
+    with Barecat(target_path, readonly=False) as bc:
+        bc.merge_from_other_barecat(source_path, pattern='**/*.txt')
+        if _VERIFY:
             assert bc.verify_integrity()
 
-        with Barecat(target_path, readonly=True) as bc:
-            for i in range(10):
-                assert bc[f'file{i}.txt'] == b'x' * 100
-                assert f'file{i}.log' not in bc
-            assert bc.num_files == 11  # 10 + existing
+    with Barecat(target_path, readonly=True) as bc:
+        for i in range(10):
+            assert bc[f'file{i}.txt'] == PAYLOAD
+        log_paths = [f'file{i}.log' for i in range(10)]
+        assert not any(bc.contains_many(log_paths).values())
+        assert bc.num_files == 11  # 10 + existing
+        if _VERIFY:
             assert bc.verify_integrity()
 
 
-def test_merge_filtered_empty_result():
+def test_merge_filtered_empty_result(tmp_path):
     """Test filtered merge when no files match."""
-    with tempfile.TemporaryDirectory() as tempdir:
-        source_path = osp.join(tempdir, 'source.barecat')
-        target_path = osp.join(tempdir, 'target.barecat')
+    source_path = osp.join(tmp_path, 'source.barecat')
+    target_path = osp.join(tmp_path, 'target.barecat')
 
-        with Barecat(source_path, readonly=False) as bc:
-            bc['file1.txt'] = b'text'
-            bc['file2.txt'] = b'text'
+    with Barecat(source_path, readonly=False) as bc:
+        bc['file1.txt'] = b'text'
+        bc['file2.txt'] = b'text'
 
-        with Barecat(target_path, readonly=False) as bc:
-            bc['existing.txt'] = b'existing'
+    with Barecat(target_path, readonly=False) as bc:
+        bc['existing.txt'] = b'existing'
 
-        with Barecat(target_path, readonly=False) as bc:
-            bc.merge_from_other_barecat(source_path, pattern='**/*.jpg')
+    with Barecat(target_path, readonly=False) as bc:
+        bc.merge_from_other_barecat(source_path, pattern='**/*.jpg')
+        if _VERIFY:
             assert bc.verify_integrity()
 
-        with Barecat(target_path, readonly=True) as bc:
-            assert bc.num_files == 1
-            assert bc['existing.txt'] == b'existing'
+    with Barecat(target_path, readonly=True) as bc:
+        assert bc.num_files == 1
+        assert bc['existing.txt'] == b'existing'
+        if _VERIFY:
             assert bc.verify_integrity()
 
 
-def test_merge_filtered_ignore_duplicates():
+def test_merge_filtered_ignore_duplicates(tmp_path):
     """Test filtered merge with ignore_duplicates."""
-    with tempfile.TemporaryDirectory() as tempdir:
-        source_path = osp.join(tempdir, 'source.barecat')
-        target_path = osp.join(tempdir, 'target.barecat')
+    source_path = osp.join(tmp_path, 'source.barecat')
+    target_path = osp.join(tmp_path, 'target.barecat')
 
-        with Barecat(source_path, readonly=False) as bc:
-            bc['dup.txt'] = b'source_version'
-            bc['new.txt'] = b'new_file'
-            bc['other.log'] = b'log'
+    with Barecat(source_path, readonly=False) as bc:
+        bc['dup.txt'] = b'source_version'
+        bc['new.txt'] = b'new_file'
+        bc['other.log'] = b'log'
 
-        with Barecat(target_path, readonly=False) as bc:
-            bc['dup.txt'] = b'target_version'
+    with Barecat(target_path, readonly=False) as bc:
+        bc['dup.txt'] = b'target_version'
 
-        with Barecat(target_path, readonly=False) as bc:
-            bc.merge_from_other_barecat(source_path, pattern='**/*.txt', ignore_duplicates=True)
+    with Barecat(target_path, readonly=False) as bc:
+        bc.merge_from_other_barecat(source_path, pattern='**/*.txt', ignore_duplicates=True)
+        if _VERIFY:
             assert bc.verify_integrity()
 
-        with Barecat(target_path, readonly=True) as bc:
-            assert bc['dup.txt'] == b'target_version'  # not overwritten
-            assert bc['new.txt'] == b'new_file'
-            assert 'other.log' not in bc
-            assert bc.num_files == 2
+    with Barecat(target_path, readonly=True) as bc:
+        assert bc['dup.txt'] == b'target_version'  # not overwritten
+        assert bc['new.txt'] == b'new_file'
+        assert 'other.log' not in bc
+        assert bc.num_files == 2
+        if _VERIFY:
             assert bc.verify_integrity()
 
 
@@ -1418,514 +1480,512 @@ def test_merge_filtered_ignore_duplicates():
 # ============================================================================
 
 
-def test_filter_bracket_expressions():
+def test_filter_bracket_expressions(tmp_path):
     """Test glob bracket expressions [abc], [!abc], [a-z]."""
-    with tempfile.TemporaryDirectory() as tempdir:
-        source_path = osp.join(tempdir, 'source.barecat')
-        target_path = osp.join(tempdir, 'target.barecat')
+    source_path = osp.join(tmp_path, 'source.barecat')
+    target_path = osp.join(tmp_path, 'target.barecat')
 
-        with Barecat(source_path, readonly=False) as bc:
-            bc['file_a.txt'] = b'a'
-            bc['file_b.txt'] = b'b'
-            bc['file_c.txt'] = b'c'
-            bc['file_x.txt'] = b'x'
-            bc['file_1.txt'] = b'1'
+    with Barecat(source_path, readonly=False) as bc:
+        bc['file_a.txt'] = b'a'
+        bc['file_b.txt'] = b'b'
+        bc['file_c.txt'] = b'c'
+        bc['file_x.txt'] = b'x'
+        bc['file_1.txt'] = b'1'
 
-        with Barecat(target_path, readonly=False) as bc:
-            # Include only files matching [abc]
-            bc.merge_from_other_barecat(source_path, pattern='**/file_[abc].txt')
+    with Barecat(target_path, readonly=False) as bc:
+        # Include only files matching [abc]
+        bc.merge_from_other_barecat(source_path, pattern='**/file_[abc].txt')
 
-        with Barecat(target_path, readonly=True) as bc:
-            assert bc['file_a.txt'] == b'a'
-            assert bc['file_b.txt'] == b'b'
-            assert bc['file_c.txt'] == b'c'
-            assert 'file_x.txt' not in bc
-            assert 'file_1.txt' not in bc
+    with Barecat(target_path, readonly=True) as bc:
+        assert bc['file_a.txt'] == b'a'
+        assert bc['file_b.txt'] == b'b'
+        assert bc['file_c.txt'] == b'c'
+        assert 'file_x.txt' not in bc
+        assert 'file_1.txt' not in bc
+        if _VERIFY:
             assert bc.verify_integrity()
 
 
-def test_filter_negated_bracket():
+def test_filter_negated_bracket(tmp_path):
     """Test negated bracket [!abc]."""
-    with tempfile.TemporaryDirectory() as tempdir:
-        source_path = osp.join(tempdir, 'source.barecat')
-        target_path = osp.join(tempdir, 'target.barecat')
+    source_path = osp.join(tmp_path, 'source.barecat')
+    target_path = osp.join(tmp_path, 'target.barecat')
 
-        with Barecat(source_path, readonly=False) as bc:
-            bc['file_a.txt'] = b'a'
-            bc['file_b.txt'] = b'b'
-            bc['file_x.txt'] = b'x'
-            bc['file_y.txt'] = b'y'
+    with Barecat(source_path, readonly=False) as bc:
+        bc['file_a.txt'] = b'a'
+        bc['file_b.txt'] = b'b'
+        bc['file_x.txt'] = b'x'
+        bc['file_y.txt'] = b'y'
 
-        with Barecat(target_path, readonly=False) as bc:
-            # Include files NOT matching [ab]
-            bc.merge_from_other_barecat(source_path, pattern='**/file_[!ab].txt')
+    with Barecat(target_path, readonly=False) as bc:
+        # Include files NOT matching [ab]
+        bc.merge_from_other_barecat(source_path, pattern='**/file_[!ab].txt')
 
-        with Barecat(target_path, readonly=True) as bc:
-            assert 'file_a.txt' not in bc
-            assert 'file_b.txt' not in bc
-            assert bc['file_x.txt'] == b'x'
-            assert bc['file_y.txt'] == b'y'
+    with Barecat(target_path, readonly=True) as bc:
+        assert 'file_a.txt' not in bc
+        assert 'file_b.txt' not in bc
+        assert bc['file_x.txt'] == b'x'
+        assert bc['file_y.txt'] == b'y'
+        if _VERIFY:
             assert bc.verify_integrity()
 
 
-def test_filter_question_mark():
+def test_filter_question_mark(tmp_path):
     """Test ? wildcard matching single character."""
-    with tempfile.TemporaryDirectory() as tempdir:
-        source_path = osp.join(tempdir, 'source.barecat')
-        target_path = osp.join(tempdir, 'target.barecat')
+    source_path = osp.join(tmp_path, 'source.barecat')
+    target_path = osp.join(tmp_path, 'target.barecat')
 
-        with Barecat(source_path, readonly=False) as bc:
-            bc['a.txt'] = b'a'
-            bc['ab.txt'] = b'ab'
-            bc['abc.txt'] = b'abc'
+    with Barecat(source_path, readonly=False) as bc:
+        bc['a.txt'] = b'a'
+        bc['ab.txt'] = b'ab'
+        bc['abc.txt'] = b'abc'
 
-        with Barecat(target_path, readonly=False) as bc:
-            bc.merge_from_other_barecat(source_path, pattern='**/?.txt')
+    with Barecat(target_path, readonly=False) as bc:
+        bc.merge_from_other_barecat(source_path, pattern='**/?.txt')
 
-        with Barecat(target_path, readonly=True) as bc:
-            assert bc['a.txt'] == b'a'
-            assert 'ab.txt' not in bc
-            assert 'abc.txt' not in bc
+    with Barecat(target_path, readonly=True) as bc:
+        assert bc['a.txt'] == b'a'
+        assert 'ab.txt' not in bc
+        assert 'abc.txt' not in bc
+        if _VERIFY:
             assert bc.verify_integrity()
 
 
-def test_filter_first_match_wins_order_matters():
+def test_filter_first_match_wins_order_matters(tmp_path):
     """Test that rule order matters (first match wins)."""
-    with tempfile.TemporaryDirectory() as tempdir:
-        source_path = osp.join(tempdir, 'source.barecat')
-        target1_path = osp.join(tempdir, 'target1.barecat')
-        target2_path = osp.join(tempdir, 'target2.barecat')
-
-        with Barecat(source_path, readonly=False) as bc:
-            bc['data/file.txt'] = b'file'
-
-        # Order 1: include first, then exclude
-        with Barecat(target1_path, readonly=False) as bc:
-            bc.merge_from_other_barecat(
-                source_path,
-                filter_rules=[
-                    ('+', '**/*.txt'),  # matches first -> included
-                    ('-', 'data/**'),  # never reached
-                ],
-            )
-
-        # Order 2: exclude first, then include
-        with Barecat(target2_path, readonly=False) as bc:
-            bc.merge_from_other_barecat(
-                source_path,
-                filter_rules=[
-                    ('-', 'data/**'),  # matches first -> excluded
-                    ('+', '**/*.txt'),  # never reached
-                ],
-            )
-
-        with Barecat(target1_path, readonly=True) as bc:
-            assert 'data/file.txt' in bc  # included (order 1)
-
-        with Barecat(target2_path, readonly=True) as bc:
-            assert 'data/file.txt' not in bc  # excluded (order 2)
-
-
-def test_filter_all_excludes_default_include():
+    source_path = osp.join(tmp_path, 'source.barecat')
+    target1_path = osp.join(tmp_path, 'target1.barecat')
+    target2_path = osp.join(tmp_path, 'target2.barecat')
+
+    with Barecat(source_path, readonly=False) as bc:
+        bc['data/file.txt'] = b'file'
+
+    # Order 1: include first, then exclude
+    with Barecat(target1_path, readonly=False) as bc:
+        bc.merge_from_other_barecat(
+            source_path,
+            filter_rules=[
+                ('+', '**/*.txt'),  # matches first -> included
+                ('-', 'data/**'),  # never reached
+            ],
+        )
+
+    # Order 2: exclude first, then include
+    with Barecat(target2_path, readonly=False) as bc:
+        bc.merge_from_other_barecat(
+            source_path,
+            filter_rules=[
+                ('-', 'data/**'),  # matches first -> excluded
+                ('+', '**/*.txt'),  # never reached
+            ],
+        )
+
+    with Barecat(target1_path, readonly=True) as bc:
+        assert 'data/file.txt' in bc  # included (order 1)
+
+    with Barecat(target2_path, readonly=True) as bc:
+        assert 'data/file.txt' not in bc  # excluded (order 2)
+
+
+def test_filter_all_excludes_default_include(tmp_path):
     """Test all exclude rules with default_include=True."""
-    with tempfile.TemporaryDirectory() as tempdir:
-        source_path = osp.join(tempdir, 'source.barecat')
-        target_path = osp.join(tempdir, 'target.barecat')
+    source_path = osp.join(tmp_path, 'source.barecat')
+    target_path = osp.join(tmp_path, 'target.barecat')
 
-        with Barecat(source_path, readonly=False) as bc:
-            bc['keep.txt'] = b'keep'
-            bc['skip.log'] = b'skip'
-            bc['skip.tmp'] = b'tmp'
+    with Barecat(source_path, readonly=False) as bc:
+        bc['keep.txt'] = b'keep'
+        bc['skip.log'] = b'skip'
+        bc['skip.tmp'] = b'tmp'
 
-        with Barecat(target_path, readonly=False) as bc:
-            bc.merge_from_other_barecat(
-                source_path,
-                filter_rules=[
-                    ('-', '**/*.log'),
-                    ('-', '**/*.tmp'),
-                ],
-            )
+    with Barecat(target_path, readonly=False) as bc:
+        bc.merge_from_other_barecat(
+            source_path,
+            filter_rules=[
+                ('-', '**/*.log'),
+                ('-', '**/*.tmp'),
+            ],
+        )
 
-        with Barecat(target_path, readonly=True) as bc:
-            assert bc['keep.txt'] == b'keep'  # default include
-            assert 'skip.log' not in bc
-            assert 'skip.tmp' not in bc
+    with Barecat(target_path, readonly=True) as bc:
+        assert bc['keep.txt'] == b'keep'  # default include
+        assert 'skip.log' not in bc
+        assert 'skip.tmp' not in bc
+        if _VERIFY:
             assert bc.verify_integrity()
 
 
-def test_filter_hidden_files():
+def test_filter_hidden_files(tmp_path):
     """Test patterns with hidden files (dotfiles)."""
-    with tempfile.TemporaryDirectory() as tempdir:
-        source_path = osp.join(tempdir, 'source.barecat')
-        target_path = osp.join(tempdir, 'target.barecat')
+    source_path = osp.join(tmp_path, 'source.barecat')
+    target_path = osp.join(tmp_path, 'target.barecat')
 
-        with Barecat(source_path, readonly=False) as bc:
-            bc['.hidden'] = b'hidden'
-            bc['.config/settings'] = b'settings'
-            bc['visible.txt'] = b'visible'
-            bc['dir/.gitignore'] = b'gitignore'
+    with Barecat(source_path, readonly=False) as bc:
+        bc['.hidden'] = b'hidden'
+        bc['.config/settings'] = b'settings'
+        bc['visible.txt'] = b'visible'
+        bc['dir/.gitignore'] = b'gitignore'
 
-        with Barecat(target_path, readonly=False) as bc:
-            bc.merge_from_other_barecat(
-                source_path,
-                filter_rules=[
-                    ('-', '**/.*'),  # exclude hidden files
-                ],
-            )
+    with Barecat(target_path, readonly=False) as bc:
+        bc.merge_from_other_barecat(
+            source_path,
+            filter_rules=[
+                ('-', '**/.*'),  # exclude hidden files
+            ],
+        )
 
-        with Barecat(target_path, readonly=True) as bc:
-            assert bc['visible.txt'] == b'visible'
-            # Hidden files should be excluded
-            assert '.hidden' not in bc
-            assert 'dir/.gitignore' not in bc
+    with Barecat(target_path, readonly=True) as bc:
+        assert bc['visible.txt'] == b'visible'
+        # Hidden files should be excluded
+        assert '.hidden' not in bc
+        assert 'dir/.gitignore' not in bc
+        if _VERIFY:
             assert bc.verify_integrity()
 
 
-def test_filter_deeply_nested():
+def test_filter_deeply_nested(tmp_path):
     """Test patterns with deeply nested paths."""
-    with tempfile.TemporaryDirectory() as tempdir:
-        source_path = osp.join(tempdir, 'source.barecat')
-        target_path = osp.join(tempdir, 'target.barecat')
+    source_path = osp.join(tmp_path, 'source.barecat')
+    target_path = osp.join(tmp_path, 'target.barecat')
 
-        with Barecat(source_path, readonly=False) as bc:
-            bc['a/b/c/d/e/f/deep.txt'] = b'deep'
-            bc['a/b/c/d/e/f/deep.log'] = b'log'
-            bc['shallow.txt'] = b'shallow'
+    with Barecat(source_path, readonly=False) as bc:
+        bc['a/b/c/d/e/f/deep.txt'] = b'deep'
+        bc['a/b/c/d/e/f/deep.log'] = b'log'
+        bc['shallow.txt'] = b'shallow'
 
-        with Barecat(target_path, readonly=False) as bc:
-            bc.merge_from_other_barecat(source_path, pattern='**/*.txt')
+    with Barecat(target_path, readonly=False) as bc:
+        bc.merge_from_other_barecat(source_path, pattern='**/*.txt')
 
-        with Barecat(target_path, readonly=True) as bc:
-            assert bc['a/b/c/d/e/f/deep.txt'] == b'deep'
-            assert bc['shallow.txt'] == b'shallow'
-            assert 'a/b/c/d/e/f/deep.log' not in bc
+    with Barecat(target_path, readonly=True) as bc:
+        assert bc['a/b/c/d/e/f/deep.txt'] == b'deep'
+        assert bc['shallow.txt'] == b'shallow'
+        assert 'a/b/c/d/e/f/deep.log' not in bc
+        if _VERIFY:
             assert bc.verify_integrity()
 
 
-def test_filter_unicode_paths():
+def test_filter_unicode_paths(tmp_path):
     """Test patterns with unicode in paths."""
-    with tempfile.TemporaryDirectory() as tempdir:
-        source_path = osp.join(tempdir, 'source.barecat')
-        target_path = osp.join(tempdir, 'target.barecat')
+    source_path = osp.join(tmp_path, 'source.barecat')
+    target_path = osp.join(tmp_path, 'target.barecat')
 
-        with Barecat(source_path, readonly=False) as bc:
-            bc['données/файл.txt'] = b'unicode'
-            bc['données/skip.log'] = b'skip'
-            bc['日本語/文書.txt'] = b'japanese'
+    with Barecat(source_path, readonly=False) as bc:
+        bc['données/файл.txt'] = b'unicode'
+        bc['données/skip.log'] = b'skip'
+        bc['日本語/文書.txt'] = b'japanese'
 
-        with Barecat(target_path, readonly=False) as bc:
-            bc.merge_from_other_barecat(source_path, pattern='**/*.txt')
+    with Barecat(target_path, readonly=False) as bc:
+        bc.merge_from_other_barecat(source_path, pattern='**/*.txt')
 
-        with Barecat(target_path, readonly=True) as bc:
-            assert bc['données/файл.txt'] == b'unicode'
-            assert bc['日本語/文書.txt'] == b'japanese'
-            assert 'données/skip.log' not in bc
+    with Barecat(target_path, readonly=True) as bc:
+        assert bc['données/файл.txt'] == b'unicode'
+        assert bc['日本語/文書.txt'] == b'japanese'
+        assert 'données/skip.log' not in bc
+        if _VERIFY:
             assert bc.verify_integrity()
 
 
-def test_filter_empty_rules():
+def test_filter_empty_rules(tmp_path):
     """Test empty filter rules (should include all with default_include=True)."""
-    with tempfile.TemporaryDirectory() as tempdir:
-        source_path = osp.join(tempdir, 'source.barecat')
-        target_path = osp.join(tempdir, 'target.barecat')
+    source_path = osp.join(tmp_path, 'source.barecat')
+    target_path = osp.join(tmp_path, 'target.barecat')
 
-        with Barecat(source_path, readonly=False) as bc:
-            bc['a.txt'] = b'a'
-            bc['b.txt'] = b'b'
+    with Barecat(source_path, readonly=False) as bc:
+        bc['a.txt'] = b'a'
+        bc['b.txt'] = b'b'
 
-        with Barecat(target_path, readonly=False) as bc:
-            bc.merge_from_other_barecat(source_path, filter_rules=[])
+    with Barecat(target_path, readonly=False) as bc:
+        bc.merge_from_other_barecat(source_path, filter_rules=[])
 
-        with Barecat(target_path, readonly=True) as bc:
-            assert bc['a.txt'] == b'a'
-            assert bc['b.txt'] == b'b'
+    with Barecat(target_path, readonly=True) as bc:
+        assert bc['a.txt'] == b'a'
+        assert bc['b.txt'] == b'b'
+        if _VERIFY:
             assert bc.verify_integrity()
 
 
-def test_filter_pattern_matches_nothing():
+def test_filter_pattern_matches_nothing(tmp_path):
     """Test pattern that matches no files."""
-    with tempfile.TemporaryDirectory() as tempdir:
-        source_path = osp.join(tempdir, 'source.barecat')
-        target_path = osp.join(tempdir, 'target.barecat')
+    source_path = osp.join(tmp_path, 'source.barecat')
+    target_path = osp.join(tmp_path, 'target.barecat')
 
-        with Barecat(source_path, readonly=False) as bc:
-            bc['a.txt'] = b'a'
-            bc['b.txt'] = b'b'
+    with Barecat(source_path, readonly=False) as bc:
+        bc['a.txt'] = b'a'
+        bc['b.txt'] = b'b'
 
-        with Barecat(target_path, readonly=False) as bc:
-            bc['existing.txt'] = b'existing'
-            bc.merge_from_other_barecat(source_path, pattern='**/*.nonexistent')
+    with Barecat(target_path, readonly=False) as bc:
+        bc['existing.txt'] = b'existing'
+        bc.merge_from_other_barecat(source_path, pattern='**/*.nonexistent')
 
-        with Barecat(target_path, readonly=True) as bc:
-            assert bc['existing.txt'] == b'existing'
-            assert 'a.txt' not in bc
-            assert 'b.txt' not in bc
-            assert bc.num_files == 1
+    with Barecat(target_path, readonly=True) as bc:
+        assert bc['existing.txt'] == b'existing'
+        assert 'a.txt' not in bc
+        assert 'b.txt' not in bc
+        assert bc.num_files == 1
+        if _VERIFY:
             assert bc.verify_integrity()
 
 
-def test_filter_overlapping_patterns():
+def test_filter_overlapping_patterns(tmp_path):
     """Test overlapping include/exclude patterns."""
-    with tempfile.TemporaryDirectory() as tempdir:
-        source_path = osp.join(tempdir, 'source.barecat')
-        target_path = osp.join(tempdir, 'target.barecat')
+    source_path = osp.join(tmp_path, 'source.barecat')
+    target_path = osp.join(tmp_path, 'target.barecat')
 
-        with Barecat(source_path, readonly=False) as bc:
-            bc['data/important/file.txt'] = b'important'
-            bc['data/cache/file.txt'] = b'cache'
-            bc['data/other/file.txt'] = b'other'
+    with Barecat(source_path, readonly=False) as bc:
+        bc['data/important/file.txt'] = b'important'
+        bc['data/cache/file.txt'] = b'cache'
+        bc['data/other/file.txt'] = b'other'
 
-        with Barecat(target_path, readonly=False) as bc:
-            bc.merge_from_other_barecat(
-                source_path,
-                filter_rules=[
-                    ('+', '**/important/**'),  # include important subdir
-                    ('-', 'data/**'),  # exclude all of data
-                    ('+', '**/*.txt'),  # this won't matter for data/*
-                ],
-            )
+    with Barecat(target_path, readonly=False) as bc:
+        bc.merge_from_other_barecat(
+            source_path,
+            filter_rules=[
+                ('+', '**/important/**'),  # include important subdir
+                ('-', 'data/**'),  # exclude all of data
+                ('+', '**/*.txt'),  # this won't matter for data/*
+            ],
+        )
 
-        with Barecat(target_path, readonly=True) as bc:
-            assert bc['data/important/file.txt'] == b'important'  # matched first rule
-            assert 'data/cache/file.txt' not in bc  # matched second rule
-            assert 'data/other/file.txt' not in bc  # matched second rule
+    with Barecat(target_path, readonly=True) as bc:
+        assert bc['data/important/file.txt'] == b'important'  # matched first rule
+        assert 'data/cache/file.txt' not in bc  # matched second rule
+        assert 'data/other/file.txt' not in bc  # matched second rule
+        if _VERIFY:
             assert bc.verify_integrity()
 
 
-def test_filter_literal_special_chars():
+def test_filter_literal_special_chars(tmp_path):
     """Test patterns with literal special characters in filenames."""
-    with tempfile.TemporaryDirectory() as tempdir:
-        source_path = osp.join(tempdir, 'source.barecat')
-        target_path = osp.join(tempdir, 'target.barecat')
+    source_path = osp.join(tmp_path, 'source.barecat')
+    target_path = osp.join(tmp_path, 'target.barecat')
 
-        with Barecat(source_path, readonly=False) as bc:
-            bc['file[1].txt'] = b'bracket'
-            bc['file(2).txt'] = b'paren'
-            bc['file{3}.txt'] = b'brace'
-            bc['file+4.txt'] = b'plus'
+    with Barecat(source_path, readonly=False) as bc:
+        bc['file[1].txt'] = b'bracket'
+        bc['file(2).txt'] = b'paren'
+        bc['file{3}.txt'] = b'brace'
+        bc['file+4.txt'] = b'plus'
 
-        with Barecat(target_path, readonly=False) as bc:
-            bc.merge_from_other_barecat(source_path, pattern='**/*.txt')
+    with Barecat(target_path, readonly=False) as bc:
+        bc.merge_from_other_barecat(source_path, pattern='**/*.txt')
 
-        with Barecat(target_path, readonly=True) as bc:
-            assert bc['file[1].txt'] == b'bracket'
-            assert bc['file(2).txt'] == b'paren'
-            assert bc['file{3}.txt'] == b'brace'
-            assert bc['file+4.txt'] == b'plus'
+    with Barecat(target_path, readonly=True) as bc:
+        assert bc['file[1].txt'] == b'bracket'
+        assert bc['file(2).txt'] == b'paren'
+        assert bc['file{3}.txt'] == b'brace'
+        assert bc['file+4.txt'] == b'plus'
+        if _VERIFY:
             assert bc.verify_integrity()
 
 
-def test_filter_doublestar_edge_cases():
+def test_filter_doublestar_edge_cases(tmp_path):
     """Test ** edge cases: at start, middle, end, alone."""
-    with tempfile.TemporaryDirectory() as tempdir:
-        source_path = osp.join(tempdir, 'source.barecat')
-
-        with Barecat(source_path, readonly=False) as bc:
-            bc['root.txt'] = b'root'
-            bc['a/mid.txt'] = b'mid'
-            bc['a/b/deep.txt'] = b'deep'
-            bc['a/b/c/deeper.txt'] = b'deeper'
-
-        # Test **/file (at start)
-        target1 = osp.join(tempdir, 't1.barecat')
-        with Barecat(target1, readonly=False) as bc:
-            bc.merge_from_other_barecat(source_path, pattern='**/deep.txt')
-        with Barecat(target1, readonly=True) as bc:
-            assert bc['a/b/deep.txt'] == b'deep'
-            assert bc.num_files == 1
-
-        # Test dir/** (at end)
-        target2 = osp.join(tempdir, 't2.barecat')
-        with Barecat(target2, readonly=False) as bc:
-            bc.merge_from_other_barecat(source_path, pattern='a/b/**')
-        with Barecat(target2, readonly=True) as bc:
-            assert bc['a/b/deep.txt'] == b'deep'
-            assert bc['a/b/c/deeper.txt'] == b'deeper'
-            assert 'a/mid.txt' not in bc
-
-        # Test a/**/c (in middle)
-        target3 = osp.join(tempdir, 't3.barecat')
-        with Barecat(target3, readonly=False) as bc:
-            bc.merge_from_other_barecat(source_path, pattern='a/**/c/*')
-        with Barecat(target3, readonly=True) as bc:
-            assert bc['a/b/c/deeper.txt'] == b'deeper'
-            assert bc.num_files == 1
-
-        # Test ** alone (everything)
-        target4 = osp.join(tempdir, 't4.barecat')
-        with Barecat(target4, readonly=False) as bc:
-            bc.merge_from_other_barecat(source_path, pattern='**')
-        with Barecat(target4, readonly=True) as bc:
-            assert bc.num_files == 4
-
-
-def test_filter_consecutive_wildcards():
+    source_path = osp.join(tmp_path, 'source.barecat')
+
+    with Barecat(source_path, readonly=False) as bc:
+        bc['root.txt'] = b'root'
+        bc['a/mid.txt'] = b'mid'
+        bc['a/b/deep.txt'] = b'deep'
+        bc['a/b/c/deeper.txt'] = b'deeper'
+
+    # Test **/file (at start)
+    target1 = osp.join(tmp_path, 't1.barecat')
+    with Barecat(target1, readonly=False) as bc:
+        bc.merge_from_other_barecat(source_path, pattern='**/deep.txt')
+    with Barecat(target1, readonly=True) as bc:
+        assert bc['a/b/deep.txt'] == b'deep'
+        assert bc.num_files == 1
+
+    # Test dir/** (at end)
+    target2 = osp.join(tmp_path, 't2.barecat')
+    with Barecat(target2, readonly=False) as bc:
+        bc.merge_from_other_barecat(source_path, pattern='a/b/**')
+    with Barecat(target2, readonly=True) as bc:
+        assert bc['a/b/deep.txt'] == b'deep'
+        assert bc['a/b/c/deeper.txt'] == b'deeper'
+        assert 'a/mid.txt' not in bc
+
+    # Test a/**/c (in middle)
+    target3 = osp.join(tmp_path, 't3.barecat')
+    with Barecat(target3, readonly=False) as bc:
+        bc.merge_from_other_barecat(source_path, pattern='a/**/c/*')
+    with Barecat(target3, readonly=True) as bc:
+        assert bc['a/b/c/deeper.txt'] == b'deeper'
+        assert bc.num_files == 1
+
+    # Test ** alone (everything)
+    target4 = osp.join(tmp_path, 't4.barecat')
+    with Barecat(target4, readonly=False) as bc:
+        bc.merge_from_other_barecat(source_path, pattern='**')
+    with Barecat(target4, readonly=True) as bc:
+        assert bc.num_files == 4
+
+
+def test_filter_consecutive_wildcards(tmp_path):
     """Test patterns with consecutive wildcards like ***."""
-    with tempfile.TemporaryDirectory() as tempdir:
-        source_path = osp.join(tempdir, 'source.barecat')
-        target_path = osp.join(tempdir, 'target.barecat')
+    source_path = osp.join(tmp_path, 'source.barecat')
+    target_path = osp.join(tmp_path, 'target.barecat')
 
-        with Barecat(source_path, readonly=False) as bc:
-            bc['a.txt'] = b'a'
-            bc['aa.txt'] = b'aa'
-            bc['aaa.txt'] = b'aaa'
+    with Barecat(source_path, readonly=False) as bc:
+        bc['a.txt'] = b'a'
+        bc['aa.txt'] = b'aa'
+        bc['aaa.txt'] = b'aaa'
 
-        # *** should behave like * (consecutive stars collapse)
-        with Barecat(target_path, readonly=False) as bc:
-            bc.merge_from_other_barecat(source_path, pattern='***.txt')
+    # *** should behave like * (consecutive stars collapse)
+    with Barecat(target_path, readonly=False) as bc:
+        bc.merge_from_other_barecat(source_path, pattern='***.txt')
 
-        with Barecat(target_path, readonly=True) as bc:
-            assert bc['a.txt'] == b'a'
-            assert bc['aa.txt'] == b'aa'
-            assert bc['aaa.txt'] == b'aaa'
+    with Barecat(target_path, readonly=True) as bc:
+        assert bc['a.txt'] == b'a'
+        assert bc['aa.txt'] == b'aa'
+        assert bc['aaa.txt'] == b'aaa'
+        if _VERIFY:
             assert bc.verify_integrity()
 
 
-def test_filter_root_level_only():
+def test_filter_root_level_only(tmp_path):
     """Test patterns that should only match root level."""
-    with tempfile.TemporaryDirectory() as tempdir:
-        source_path = osp.join(tempdir, 'source.barecat')
-        target_path = osp.join(tempdir, 'target.barecat')
+    source_path = osp.join(tmp_path, 'source.barecat')
+    target_path = osp.join(tmp_path, 'target.barecat')
 
-        with Barecat(source_path, readonly=False) as bc:
-            bc['root.txt'] = b'root'
-            bc['sub/nested.txt'] = b'nested'
+    with Barecat(source_path, readonly=False) as bc:
+        bc['root.txt'] = b'root'
+        bc['sub/nested.txt'] = b'nested'
 
-        with Barecat(target_path, readonly=False) as bc:
-            # *.txt without ** should only match root
-            bc.merge_from_other_barecat(source_path, pattern='*.txt')
+    with Barecat(target_path, readonly=False) as bc:
+        # *.txt without ** should only match root
+        bc.merge_from_other_barecat(source_path, pattern='*.txt')
 
-        with Barecat(target_path, readonly=True) as bc:
-            assert bc['root.txt'] == b'root'
-            assert 'sub/nested.txt' not in bc
+    with Barecat(target_path, readonly=True) as bc:
+        assert bc['root.txt'] == b'root'
+        assert 'sub/nested.txt' not in bc
+        if _VERIFY:
             assert bc.verify_integrity()
 
 
-def test_filter_include_then_exclude_same_pattern():
+def test_filter_include_then_exclude_same_pattern(tmp_path):
     """Test include then exclude with overlapping pattern specificity."""
-    with tempfile.TemporaryDirectory() as tempdir:
-        source_path = osp.join(tempdir, 'source.barecat')
-        target_path = osp.join(tempdir, 'target.barecat')
+    source_path = osp.join(tmp_path, 'source.barecat')
+    target_path = osp.join(tmp_path, 'target.barecat')
 
-        with Barecat(source_path, readonly=False) as bc:
-            bc['logs/app.log'] = b'app'
-            bc['logs/error.log'] = b'error'
-            bc['logs/debug.log'] = b'debug'
+    with Barecat(source_path, readonly=False) as bc:
+        bc['logs/app.log'] = b'app'
+        bc['logs/error.log'] = b'error'
+        bc['logs/debug.log'] = b'debug'
 
-        with Barecat(target_path, readonly=False) as bc:
-            bc.merge_from_other_barecat(
-                source_path,
-                filter_rules=[
-                    ('+', '**/error.log'),  # specifically include error.log
-                    ('-', '**/*.log'),  # exclude all other logs
-                ],
-            )
+    with Barecat(target_path, readonly=False) as bc:
+        bc.merge_from_other_barecat(
+            source_path,
+            filter_rules=[
+                ('+', '**/error.log'),  # specifically include error.log
+                ('-', '**/*.log'),  # exclude all other logs
+            ],
+        )
 
-        with Barecat(target_path, readonly=True) as bc:
-            assert bc['logs/error.log'] == b'error'
-            assert 'logs/app.log' not in bc
-            assert 'logs/debug.log' not in bc
+    with Barecat(target_path, readonly=True) as bc:
+        assert bc['logs/error.log'] == b'error'
+        assert 'logs/app.log' not in bc
+        assert 'logs/debug.log' not in bc
+        if _VERIFY:
             assert bc.verify_integrity()
 
 
-def test_filter_multiple_extensions():
+def test_filter_multiple_extensions(tmp_path):
     """Test pattern matching multiple extensions."""
-    with tempfile.TemporaryDirectory() as tempdir:
-        source_path = osp.join(tempdir, 'source.barecat')
-        target_path = osp.join(tempdir, 'target.barecat')
-
-        with Barecat(source_path, readonly=False) as bc:
-            bc['image.jpg'] = b'jpg'
-            bc['image.jpeg'] = b'jpeg'
-            bc['image.png'] = b'png'
-            bc['image.gif'] = b'gif'
-            bc['doc.txt'] = b'txt'
-
-        # Use bracket to match multiple extensions
-        with Barecat(target_path, readonly=False) as bc:
-            bc.merge_from_other_barecat(
-                source_path,
-                filter_rules=[
-                    ('+', '**/*.jpg'),
-                    ('+', '**/*.jpeg'),
-                    ('+', '**/*.png'),
-                    ('-', '**/*'),  # exclude everything else
-                ],
-            )
-
-        with Barecat(target_path, readonly=True) as bc:
-            assert bc['image.jpg'] == b'jpg'
-            assert bc['image.jpeg'] == b'jpeg'
-            assert bc['image.png'] == b'png'
-            assert 'image.gif' not in bc
-            assert 'doc.txt' not in bc
-            assert bc.verify_integrity()
-
-
-def test_filter_trailing_slash_pattern():
+    source_path = osp.join(tmp_path, 'source.barecat')
+    target_path = osp.join(tmp_path, 'target.barecat')
+
+    with Barecat(source_path, readonly=False) as bc:
+        bc['image.jpg'] = b'jpg'
+        bc['image.jpeg'] = b'jpeg'
+        bc['image.png'] = b'png'
+        bc['image.gif'] = b'gif'
+        bc['doc.txt'] = b'txt'
+
+    # Use bracket to match multiple extensions
+    with Barecat(target_path, readonly=False) as bc:
+        bc.merge_from_other_barecat(
+            source_path,
+            filter_rules=[
+                ('+', '**/*.jpg'),
+                ('+', '**/*.jpeg'),
+                ('+', '**/*.png'),
+                ('-', '**/*'),  # exclude everything else
+            ],
+        )
+
+    with Barecat(target_path, readonly=True) as bc:
+        assert bc['image.jpg'] == b'jpg'
+        assert bc['image.jpeg'] == b'jpeg'
+        assert bc['image.png'] == b'png'
+        assert 'image.gif' not in bc
+        assert 'doc.txt' not in bc
+        if _VERIFY:
+            assert bc.verify_integrity()
+
+
+def test_filter_trailing_slash_pattern(tmp_path):
     """Test that trailing slash patterns match directory and contents (rsync convention).
 
     In rsync, 'dir/' means the directory and everything inside it.
     The CLI normalizes 'dir/' to 'dir/**' before passing to the filter.
     """
-    with tempfile.TemporaryDirectory() as tempdir:
-        source_path = osp.join(tempdir, 'source.barecat')
-        target_path = osp.join(tempdir, 'target.barecat')
-
-        with Barecat(source_path, readonly=False) as bc:
-            bc['thumbs/a.jpg'] = b'thumb_a'
-            bc['thumbs/b.jpg'] = b'thumb_b'
-            bc['thumbs/sub/c.jpg'] = b'thumb_c'
-            bc['images/photo.jpg'] = b'photo'
-            bc['docs/readme.txt'] = b'readme'
-            bc['root.txt'] = b'root'
-
-        # Exclude thumbs/ (normalized to thumbs/**)
-        with Barecat(target_path, readonly=False) as bc:
-            bc.merge_from_other_barecat(
-                source_path,
-                filter_rules=[
-                    ('-', 'thumbs/**'),  # CLI would normalize 'thumbs/' to this
-                ],
-            )
-
-        with Barecat(target_path, readonly=True) as bc:
-            # thumbs directory and all contents excluded
-            assert 'thumbs/a.jpg' not in bc
-            assert 'thumbs/b.jpg' not in bc
-            assert 'thumbs/sub/c.jpg' not in bc
-            # Everything else included
-            assert bc['images/photo.jpg'] == b'photo'
-            assert bc['docs/readme.txt'] == b'readme'
-            assert bc['root.txt'] == b'root'
-            assert bc.verify_integrity()
-
-
-def test_filter_trailing_slash_include():
+    source_path = osp.join(tmp_path, 'source.barecat')
+    target_path = osp.join(tmp_path, 'target.barecat')
+
+    with Barecat(source_path, readonly=False) as bc:
+        bc['thumbs/a.jpg'] = b'thumb_a'
+        bc['thumbs/b.jpg'] = b'thumb_b'
+        bc['thumbs/sub/c.jpg'] = b'thumb_c'
+        bc['images/photo.jpg'] = b'photo'
+        bc['docs/readme.txt'] = b'readme'
+        bc['root.txt'] = b'root'
+
+    # Exclude thumbs/ (normalized to thumbs/**)
+    with Barecat(target_path, readonly=False) as bc:
+        bc.merge_from_other_barecat(
+            source_path,
+            filter_rules=[
+                ('-', 'thumbs/**'),  # CLI would normalize 'thumbs/' to this
+            ],
+        )
+
+    with Barecat(target_path, readonly=True) as bc:
+        # thumbs directory and all contents excluded
+        assert 'thumbs/a.jpg' not in bc
+        assert 'thumbs/b.jpg' not in bc
+        assert 'thumbs/sub/c.jpg' not in bc
+        # Everything else included
+        assert bc['images/photo.jpg'] == b'photo'
+        assert bc['docs/readme.txt'] == b'readme'
+        assert bc['root.txt'] == b'root'
+        if _VERIFY:
+            assert bc.verify_integrity()
+
+
+def test_filter_trailing_slash_include(tmp_path):
     """Test trailing slash for include patterns."""
-    with tempfile.TemporaryDirectory() as tempdir:
-        source_path = osp.join(tempdir, 'source.barecat')
-        target_path = osp.join(tempdir, 'target.barecat')
-
-        with Barecat(source_path, readonly=False) as bc:
-            bc['keep/a.txt'] = b'a'
-            bc['keep/sub/b.txt'] = b'b'
-            bc['drop/c.txt'] = b'c'
-            bc['root.txt'] = b'root'
-
-        # Only include keep/ (normalized to keep/**)
-        with Barecat(target_path, readonly=False) as bc:
-            bc.merge_from_other_barecat(
-                source_path,
-                filter_rules=[
-                    ('+', 'keep/**'),  # CLI would normalize 'keep/' to this
-                    ('-', '**'),  # exclude everything else
-                ],
-            )
-
-        with Barecat(target_path, readonly=True) as bc:
-            assert bc['keep/a.txt'] == b'a'
-            assert bc['keep/sub/b.txt'] == b'b'
-            assert 'drop/c.txt' not in bc
-            assert 'root.txt' not in bc
+    source_path = osp.join(tmp_path, 'source.barecat')
+    target_path = osp.join(tmp_path, 'target.barecat')
+
+    with Barecat(source_path, readonly=False) as bc:
+        bc['keep/a.txt'] = b'a'
+        bc['keep/sub/b.txt'] = b'b'
+        bc['drop/c.txt'] = b'c'
+        bc['root.txt'] = b'root'
+
+    # Only include keep/ (normalized to keep/**)
+    with Barecat(target_path, readonly=False) as bc:
+        bc.merge_from_other_barecat(
+            source_path,
+            filter_rules=[
+                ('+', 'keep/**'),  # CLI would normalize 'keep/' to this
+                ('-', '**'),  # exclude everything else
+            ],
+        )
+
+    with Barecat(target_path, readonly=True) as bc:
+        assert bc['keep/a.txt'] == b'a'
+        assert bc['keep/sub/b.txt'] == b'b'
+        assert 'drop/c.txt' not in bc
+        assert 'root.txt' not in bc
+        if _VERIFY:
             assert bc.verify_integrity()
@@ -1,83 +1,131 @@
 import os
-import tempfile
+import re
+
+import crc32c as crc32c_lib
 import pytest
 from barecat import Barecat
 from barecat.exceptions import FileNotFoundBarecatError, FileExistsBarecatError
 
+# Under pytest-xdist with --dist loadgroup, run these on one worker, so that the session directory
+# and the module-scoped archive are created once
+pytestmark = pytest.mark.xdist_group(name='test_open')
+
 
 @pytest.fixture
-def bc_path():
-    with tempfile.TemporaryDirectory() as tmpdir:
-        yield os.path.join(tmpdir, 'test.barecat')
+def bc_path(_bc_root, request):
+    # Named after the test (class and function), which also keeps it unique within the session
+    name = re.sub(r'[^\w.-]+', '_', request.node.nodeid.split('::', 1)[1])
+    return os.path.join(_bc_root, f'{name}.barecat')
 
 
-class TestOpenReadOnly:
-    def test_read_existing_file(self, bc_path):
-        with Barecat(bc_path, readonly=False) as bc:
-            bc['file.txt'] = b'Hello, world!'
+# Contents shared by several tests, as inputs and as expected results
+_HELLO = b'Hello, world!'
+_DIGITS = b'0123456789'
+_BLOCKS = b'AAAABBBBCCCC'
 
-        with Barecat(bc_path, readonly=True) as bc:
-            with bc.open('file.txt', 'rb') as f:
-                assert f.read() == b'Hello, world!'
+_PAYLOAD_100K_A = b'A' * 100_000
+_VERSIONS = tuple(f'Version{i}'.encode() for i in range(1, 6))
+_EXPECTED_X_PLUS_100K_A = b'X' + _PAYLOAD_100K_A
 
-    def test_read_nonexistent_file_raises(self, bc_path):
-        with Barecat(bc_path, readonly=False) as bc:
-            pass
 
-        with Barecat(bc_path, readonly=True) as bc:
-            with pytest.raises(FileNotFoundBarecatError):
-                bc.open('nonexistent.txt', 'rb')
+def _assert_reads(f, expected):
+    """Check that the rest of f is exactly expected, reading it into a preallocated buffer."""
+    buf = bytearray(len(expected) + 1)
+    n = f.readinto(buf)
+    assert n == len(expected)
+    assert buf[:n] == expected
 
-    def test_read_with_seek(self, bc_path):
-        with Barecat(bc_path, readonly=False) as bc:
-            bc['file.txt'] = b'0123456789'
 
-        with Barecat(bc_path, readonly=True) as bc:
-            with bc.open('file.txt', 'rb') as f:
-                f.seek(5)
-                assert f.read(3) == b'567'
-                f.seek(-2, os.SEEK_CUR)
-                assert f.read(2) == b'67'
-                f.seek(-3, os.SEEK_END)
-                assert f.read() == b'789'
+def _read_and_crc(bc, path):
+    """Read a stored file into one buffer and return its data and its computed CRC32C."""
+    buf = bytearray(bc.index.lookup_file(path).size)
+    with bc.open(path, 'rb') as f:
+        assert f.readinto(buf) == len(buf)
+    return buf, crc32c_lib.crc32c(memoryview(buf))
 
-    def test_read_partial(self, bc_path):
-        with Barecat(bc_path, readonly=False) as bc:
-            bc['file.txt'] = b'AAAABBBBCCCC'
 
-        with Barecat(bc_path, readonly=True) as bc:
-            with bc.open('file.txt', 'rb') as f:
-                assert f.read(4) == b'AAAA'
-                assert f.read(4) == b'BBBB'
-                assert f.read(4) == b'CCCC'
-                assert f.read(4) == b''
+# Reference files for the read-only tests, written once into a shared archive
+_READ_FILES = {
+    'file.txt': _HELLO,
+    'digits.txt': _DIGITS,
+    'blocks.txt': _BLOCKS,
+    'binary.bin': b'\x00\x01\x02\xff',
+}
+
+
+@pytest.fixture(scope='module')
+def prepopulated_bc(_bc_root):
+    path = os.path.join(_bc_root, 'prepopulated.barecat')
+    with Barecat(path, readonly=False) as bc:
+        bc.update(_READ_FILES)
+
+    with Barecat(path, readonly=True) as bc:
+        yield bc
+
+
+def _read_all(f):
+    return f.read()
+
+
+def _read_partial(f):
+    # One partial read, then the tail, then a read at EOF
+    return [f.read(4), f.read(), f.read(4)]
+
+
+def _read_with_seek(f):
+    f.seek(5)
+    a = f.read(3)
+    f.seek(-2, os.SEEK_CUR)
+    b = f.read(2)
+    f.seek(-3, os.SEEK_END)
+    return [a, b, f.read()]
+
+
+class TestOpenReadOnly:
+    @pytest.mark.parametrize(
+        'name,op,expected',
+        [
+            ('file.txt', _read_all, _HELLO),
+            ('binary.bin', _read_all, b'\x00\x01\x02\xff'),
+            ('blocks.txt', _read_partial, [b'AAAA', b'BBBBCCCC', b'']),
+            ('digits.txt', _read_with_seek, [b'567', b'67', b'789']),
+        ],
+        ids=['existing_file', 'binary', 'partial', 'with_seek'],
+    )
+    def test_read(self, prepopulated_bc, name, op, expected):
+        with prepopulated_bc.open(name, 'rb') as f:
+            assert op(f) == expected
+
+    def test_readinto_bytearray(self, prepopulated_bc):
+        with prepopulated_bc.open('digits.txt', 'rb') as f:
+            f.seek(4)
+            _assert_reads(f, b'456789')
+
+    def test_read_nonexistent_file_raises(self, prepopulated_bc):
+        with pytest.raises(FileNotFoundBarecatError):
+            prepopulated_bc.open('nonexistent.txt', 'rb')
 
 
 class TestOpenReadWrite:
     def test_modify_in_place_same_size(self, bc_path):
         with Barecat(bc_path, readonly=False) as bc:
-            bc['file.txt'] = b'Hello, world!'
+            bc['file.txt'] = _HELLO
 
         with Barecat(bc_path, readonly=False) as bc:
             with bc.open('file.txt', 'r+b') as f:
                 f.seek(7)
                 f.write(b'WORLD!')
-
-        with Barecat(bc_path, readonly=True) as bc:
             assert bc['file.txt'] == b'Hello, WORLD!'
 
     def test_modify_in_place_partial_overwrite(self, bc_path):
         with Barecat(bc_path, readonly=False) as bc:
-            bc['file.txt'] = b'AAAABBBBCCCC'
-
-        with Barecat(bc_path, readonly=False) as bc:
+            bc['file.txt'] = _BLOCKS
             with bc.open('file.txt', 'r+b') as f:
                 f.seek(4)
                 f.write(b'XX')
-
-        with Barecat(bc_path, readonly=True) as bc:
             assert bc['file.txt'] == b'AAAAXXBBCCCC'
 
+    @pytest.mark.persistence
     def test_expand_file_into_spillover(self, bc_path):
         with Barecat(bc_path, readonly=False) as bc:
             bc['file.txt'] = b'Hello'
@@ -88,40 +136,34 @@ class TestOpenReadWrite:
                 f.write(b', world!')
 
         with Barecat(bc_path, readonly=True) as bc:
-            assert bc['file.txt'] == b'Hello, world!'
+            assert bc['file.txt'] == _HELLO
 
     def test_read_after_write_spanning_shard_and_spillover(self, bc_path):
         with Barecat(bc_path, readonly=False) as bc:
             bc['file.txt'] = b'AAAA'
-
-        with Barecat(bc_path, readonly=False) as bc:
             with bc.open('file.txt', 'r+b') as f:
                 f.seek(2)
                 f.write(b'BBBBBB')  # Overwrites AA, adds BBBB to spillover
                 f.seek(0)
-                assert f.read() == b'AABBBBBB'
+                _assert_reads(f, b'AABBBBBB')
 
     def test_interleaved_read_write(self, bc_path):
         with Barecat(bc_path, readonly=False) as bc:
-            bc['file.txt'] = b'0123456789'
-
-        with Barecat(bc_path, readonly=False) as bc:
+            bc['file.txt'] = _DIGITS
             with bc.open('file.txt', 'r+b') as f:
                 assert f.read(4) == b'0123'
                 f.write(b'XXXX')
                 f.seek(0)
-                assert f.read() == b'0123XXXX89'
+                _assert_reads(f, b'0123XXXX89')
 
     def test_rplus_nonexistent_raises(self, bc_path):
-        with Barecat(bc_path, readonly=False) as bc:
-            pass
-
         with Barecat(bc_path, readonly=False) as bc:
             with pytest.raises(FileNotFoundBarecatError):
                 bc.open('nonexistent.txt', 'r+b')
 
 
 class TestOpenWrite:
+    @pytest.mark.persistence
     def test_write_new_file(self, bc_path):
         with Barecat(bc_path, readonly=False) as bc:
             with bc.open('new.txt', 'wb') as f:
@@ -133,20 +175,14 @@ class TestOpenWrite:
     def test_write_truncates_existing(self, bc_path):
         with Barecat(bc_path, readonly=False) as bc:
             bc['file.txt'] = b'Original content that is long'
-
-        with Barecat(bc_path, readonly=False) as bc:
             with bc.open('file.txt', 'wb') as f:
                 f.write(b'Short')
-
-        with Barecat(bc_path, readonly=True) as bc:
             assert bc['file.txt'] == b'Short'
 
     def test_write_empty_file(self, bc_path):
         with Barecat(bc_path, readonly=False) as bc:
             with bc.open('empty.txt', 'wb') as _f:
                 pass  # Write nothing
-
-        with Barecat(bc_path, readonly=True) as bc:
             assert bc['empty.txt'] == b''
 
     def test_wplus_read_after_write(self, bc_path):
@@ -154,10 +190,10 @@ class TestOpenWrite:
             with bc.open('file.txt', 'w+b') as f:
                 f.write(b'Hello')
                 f.seek(0)
-                assert f.read() == b'Hello'
+                _assert_reads(f, b'Hello')
                 f.write(b', world!')
                 f.seek(0)
-                assert f.read() == b'Hello, world!'
+                _assert_reads(f, _HELLO)
 
 
 class TestOpenExclusive:
@@ -165,15 +201,11 @@ class TestOpenExclusive:
         with Barecat(bc_path, readonly=False) as bc:
             with bc.open('new.txt', 'xb') as f:
                 f.write(b'Exclusive!')
-
-        with Barecat(bc_path, readonly=True) as bc:
             assert bc['new.txt'] == b'Exclusive!'
 
     def test_exclusive_existing_raises(self, bc_path):
         with Barecat(bc_path, readonly=False) as bc:
             bc['file.txt'] = b'Already here'
-
-        with Barecat(bc_path, readonly=False) as bc:
             with pytest.raises(FileExistsBarecatError):
                 bc.open('file.txt', 'xb')
 
@@ -182,10 +214,11 @@ class TestOpenExclusive:
             with bc.open('new.txt', 'x+b') as f:
                 f.write(b'Data')
                 f.seek(0)
-                assert f.read() == b'Data'
+                _assert_reads(f, b'Data')
 
 
 class TestOpenAppend:
+    @pytest.mark.persistence
     def test_append_existing(self, bc_path):
         with Barecat(bc_path, readonly=False) as bc:
             bc['file.txt'] = b'Hello'
@@ -195,74 +228,55 @@ class TestOpenAppend:
                 f.write(b', world!')
 
         with Barecat(bc_path, readonly=True) as bc:
-            assert bc['file.txt'] == b'Hello, world!'
+            assert bc['file.txt'] == _HELLO
 
     def test_append_creates_new(self, bc_path):
         with Barecat(bc_path, readonly=False) as bc:
             with bc.open('new.txt', 'ab') as f:
                 f.write(b'Appended to new')
-
-        with Barecat(bc_path, readonly=True) as bc:
             assert bc['new.txt'] == b'Appended to new'
 
     def test_aplus_read_and_append(self, bc_path):
         with Barecat(bc_path, readonly=False) as bc:
             bc['file.txt'] = b'Start'
-
-        with Barecat(bc_path, readonly=False) as bc:
             with bc.open('file.txt', 'a+b') as f:
                 f.write(b'End')
                 f.seek(0)
-                assert f.read() == b'StartEnd'
+                _assert_reads(f, b'StartEnd')
 
 
 class TestTruncate:
     def test_truncate_shrink(self, bc_path):
         with Barecat(bc_path, readonly=False) as bc:
-            bc['file.txt'] = b'0123456789'
-
-        with Barecat(bc_path, readonly=False) as bc:
+            bc['file.txt'] = _DIGITS
             with bc.open('file.txt', 'r+b') as f:
                 f.truncate(5)
-
-        with Barecat(bc_path, readonly=True) as bc:
             assert bc['file.txt'] == b'01234'
 
     def test_truncate_expand_with_zeros(self, bc_path):
         with Barecat(bc_path, readonly=False) as bc:
             bc['file.txt'] = b'Hi'
-
-        with Barecat(bc_path, readonly=False) as bc:
             with bc.open('file.txt', 'r+b') as f:
                 f.truncate(10)
-
-        with Barecat(bc_path, readonly=True) as bc:
             assert bc['file.txt'] == b'Hi\x00\x00\x00\x00\x00\x00\x00\x00'
 
     def test_truncate_at_position(self, bc_path):
         with Barecat(bc_path, readonly=False) as bc:
-            bc['file.txt'] = b'0123456789'
-
-        with Barecat(bc_path, readonly=False) as bc:
+            bc['file.txt'] = _DIGITS
             with bc.open('file.txt', 'r+b') as f:
                 f.seek(3)
                 f.truncate()  # Truncate at current position
-
-        with Barecat(bc_path, readonly=True) as bc:
             assert bc['file.txt'] == b'012'
 
     def test_truncate_shrink_then_expand(self, bc_path):
         with Barecat(bc_path, readonly=False) as bc:
             bc['file.txt'] = b'AAAAAAAAAA'  # 10 bytes
-
-        with Barecat(bc_path, readonly=False) as bc:
             with bc.open('file.txt', 'r+b') as f:
                 f.truncate(3)
                 f.truncate(7)
-
-        with Barecat(bc_path, readonly=True) as bc:
             assert bc['file.txt'] == b'AAA\x00\x00\x00\x00'
 
+    @pytest.mark.persistence
     def test_truncate_expand_into_spillover(self, bc_path):
         with Barecat(bc_path, readonly=False) as bc:
             bc['file.txt'] = b'AAAA'
@@ -277,14 +291,10 @@ class TestTruncate:
     def test_truncate_shrink_from_spillover(self, bc_path):
         with Barecat(bc_path, readonly=False) as bc:
             bc['file.txt'] = b'AAAA'
-
-        with Barecat(bc_path, readonly=False) as bc:
             with bc.open('file.txt', 'r+b') as f:
                 f.seek(0, os.SEEK_END)
                 f.write(b'BBBBBB')  # Now 10 bytes, 6 in spillover
                 f.truncate(6)  # Shrink spillover to 2 bytes
-
-        with Barecat(bc_path, readonly=True) as bc:
             assert bc['file.txt'] == b'AAAABB'
 
 
@@ -292,9 +302,7 @@ class TestEdgeCases:
     def test_write_at_various_positions(self, bc_path):
         """Write at start, middle, end, and beyond end."""
         with Barecat(bc_path, readonly=False) as bc:
-            bc['file.txt'] = b'0123456789'
-
-        with Barecat(bc_path, readonly=False) as bc:
+            bc['file.txt'] = _DIGITS
             with bc.open('file.txt', 'r+b') as f:
                 f.seek(0)
                 f.write(b'A')  # Start
@@ -304,8 +312,6 @@ class TestEdgeCases:
                 f.write(b'C')  # Last byte
                 f.seek(10)
                 f.write(b'D')  # Beyond end (spillover)
-
-        with Barecat(bc_path, readonly=True) as bc:
             assert bc['file.txt'] == b'A1234B678CD'
 
     def test_seek_beyond_end_then_write(self, bc_path):
@@ -315,44 +321,36 @@ class TestEdgeCases:
                 f.write(b'Hi')
                 f.seek(10)
                 f.write(b'!')
-
-        with Barecat(bc_path, readonly=True) as bc:
-            result = bc['file.txt']
-            assert result == b'Hi\x00\x00\x00\x00\x00\x00\x00\x00!'
+            assert bc['file.txt'] == b'Hi\x00\x00\x00\x00\x00\x00\x00\x00!'
 
     def test_large_spillover(self, bc_path):
         """Write more to spillover than original file size."""
         with Barecat(bc_path, readonly=False) as bc:
             bc['file.txt'] = b'X'
-
-        large_data = b'A' * 100000
-        with Barecat(bc_path, readonly=False) as bc:
             with bc.open('file.txt', 'r+b') as f:
                 f.seek(0, os.SEEK_END)
-                f.write(large_data)
-
-        with Barecat(bc_path, readonly=True) as bc:
-            assert bc['file.txt'] == b'X' + large_data
+                # A single call writes the whole buffer, no short write to loop over
+                assert f.write(_PAYLOAD_100K_A) == len(_PAYLOAD_100K_A)
+            with bc.open('file.txt', 'rb') as f:
+                _assert_reads(f, _EXPECTED_X_PLUS_100K_A)
 
+    @pytest.mark.persistence
     def test_multiple_opens_same_file(self, bc_path):
         """Multiple sequential opens and modifications."""
         with Barecat(bc_path, readonly=False) as bc:
-            bc['file.txt'] = b'Version1'
-
-        for i in range(2, 6):
-            with Barecat(bc_path, readonly=False) as bc:
+            bc['file.txt'] = _VERSIONS[0]
+            for data in _VERSIONS[1:]:
                 with bc.open('file.txt', 'wb') as f:
-                    f.write(f'Version{i}'.encode())
+                    f.write(data)
+                assert bc['file.txt'] == data
 
         with Barecat(bc_path, readonly=True) as bc:
-            assert bc['file.txt'] == b'Version5'
+            assert bc['file.txt'] == _VERSIONS[-1]
 
     def test_read_spanning_shard_and_spillover(self, bc_path):
         """Read that spans both shard data and spillover."""
         with Barecat(bc_path, readonly=False) as bc:
             bc['file.txt'] = b'SHARD'
-
-        with Barecat(bc_path, readonly=False) as bc:
             with bc.open('file.txt', 'r+b') as f:
                 f.seek(0, os.SEEK_END)
                 f.write(b'SPILL')
@@ -363,7 +361,7 @@ class TestEdgeCases:
 
                 # Read all
                 f.seek(0)
-                assert f.read() == b'SHARDSPILL'
+                _assert_reads(f, b'SHARDSPILL')
 
     def test_no_modification_no_rewrite(self, bc_path):
         """Opening for write but not modifying shouldn't change anything."""
@@ -374,8 +372,6 @@ class TestEdgeCases:
             original_finfo = bc.index.lookup_file('file.txt')
             with bc.open('file.txt', 'r+b') as f:
                 _ = f.read()  # Just read, don't write
-
-        with Barecat(bc_path, readonly=False) as bc:
             new_finfo = bc.index.lookup_file('file.txt')
             assert new_finfo.shard == original_finfo.shard
             assert new_finfo.offset == original_finfo.offset
@@ -386,23 +382,71 @@ class TestEdgeCases:
         """Various empty operations."""
         with Barecat(bc_path, readonly=False) as bc:
             bc['file.txt'] = b'Data'
-
-        with Barecat(bc_path, readonly=False) as bc:
             with bc.open('file.txt', 'r+b') as f:
                 f.write(b'')  # Empty write
                 assert f.read(0) == b''  # Zero-length read
                 f.seek(0)
-                assert f.read() == b'Data'  # Original unchanged
+                _assert_reads(f, b'Data')  # Original unchanged
 
     def test_binary_mode_suffix(self, bc_path):
         """Test that 'rb', 'wb', etc. work same as 'r', 'w'."""
         with Barecat(bc_path, readonly=False) as bc:
             with bc.open('file.txt', 'wb') as f:
                 f.write(b'\x00\x01\x02\xff')
-
-        with Barecat(bc_path, readonly=True) as bc:
             with bc.open('file.txt', 'rb') as f:
-                assert f.read() == b'\x00\x01\x02\xff'
+                _assert_reads(f, b'\x00\x01\x02\xff')
+
+
+# Content after writing 'New' to a file containing 'Old', for each mode that accepts existing files
+_EXISTING_FILE_WRITE_RESULTS = {
+    'r+': b'New',
+    'w': b'New',
+    'w+': b'New',
+    'a': b'OldNew',
+    'a+': b'OldNew',
+}
+
+
+class TestModeMatrix:
+    """The same mode behaves the same in text ('', 't') and binary ('b') form."""
+
+    @pytest.mark.parametrize('mode', ['r', 'rt', 'rb'])
+    def test_read_modes(self, prepopulated_bc, mode):
+        with prepopulated_bc.open('file.txt', mode) as f:
+            data = f.read()
+        assert data == (_HELLO if 'b' in mode else _HELLO.decode())
+
+    @pytest.mark.parametrize('suffix', ['', 't', 'b'])
+    @pytest.mark.parametrize('base_mode', list(_EXISTING_FILE_WRITE_RESULTS))
+    def test_write_existing(self, bc_path, base_mode, suffix):
+        with Barecat(bc_path, readonly=False) as bc:
+            bc['file.txt'] = b'Old'
+            with bc.open('file.txt', base_mode + suffix) as f:
+                f.write(b'New' if suffix == 'b' else 'New')
+            assert bc['file.txt'] == _EXISTING_FILE_WRITE_RESULTS[base_mode]
+
+    @pytest.mark.parametrize('suffix', ['', 't', 'b'])
+    @pytest.mark.parametrize('base_mode', ['w', 'w+', 'x', 'x+', 'a', 'a+'])
+    def test_create(self, bc_path, base_mode, suffix):
+        with Barecat(bc_path, readonly=False) as bc:
+            with bc.open('new.txt', base_mode + suffix) as f:
+                f.write(b'New' if suffix == 'b' else 'New')
+            assert bc['new.txt'] == b'New'
+
+    @pytest.mark.parametrize('suffix', ['', 't', 'b'])
+    @pytest.mark.parametrize('base_mode', ['r', 'r+'])
+    def test_missing_file_raises(self, bc_path, base_mode, suffix):
+        with Barecat(bc_path, readonly=False) as bc:
+            with pytest.raises(FileNotFoundBarecatError):
+                bc.open('missing.txt', base_mode + suffix)
+
+    @pytest.mark.parametrize('suffix', ['', 't', 'b'])
+    @pytest.mark.parametrize('base_mode', ['x', 'x+'])
+    def test_exclusive_existing_raises(self, bc_path, base_mode, suffix):
+        with Barecat(bc_path, readonly=False) as bc:
+            bc['file.txt'] = b'Old'
+            with pytest.raises(FileExistsBarecatError):
+                bc.open('file.txt', base_mode + suffix)
 
 
 class TestCRC32CIntegrity:
@@ -410,17 +454,14 @@ class TestCRC32CIntegrity:
         with Barecat(bc_path, readonly=False) as bc:
             bc['file.txt'] = b'Original'
             crc1 = bc.index.lookup_file('file.txt').crc32c
-
-        with Barecat(bc_path, readonly=False) as bc:
             with bc.open('file.txt', 'r+b') as f:
                 f.write(b'Modified')
             crc2 = bc.index.lookup_file('file.txt').crc32c
 
         assert crc1 != crc2
 
+    @pytest.mark.persistence
     def test_crc_correct_after_expand(self, bc_path):
-        import crc32c as crc32c_lib
-
         with Barecat(bc_path, readonly=False) as bc:
             bc['file.txt'] = b'Hi'
 
@@ -430,10 +471,19 @@ class TestCRC32CIntegrity:
                 f.write(b' there!')
 
         with Barecat(bc_path, readonly=True) as bc:
-            data = bc['file.txt']
-            expected_crc = crc32c_lib.crc32c(data)
-            actual_crc = bc.index.lookup_file('file.txt').crc32c
-            assert actual_crc == expected_crc
+            data, expected_crc = _read_and_crc(bc, 'file.txt')
+            assert data == b'Hi there!'
+            assert bc.index.lookup_file('file.txt').crc32c == expected_crc
+
+    def test_crc_correct_after_large_spillover(self, bc_path):
+        with Barecat(bc_path, readonly=False) as bc:
+            bc['file.txt'] = b'X'
+            with bc.open('file.txt', 'r+b') as f:
+                f.seek(0, os.SEEK_END)
+                f.write(_PAYLOAD_100K_A)
+            data, expected_crc = _read_and_crc(bc, 'file.txt')
+            assert data == _EXPECTED_X_PLUS_100K_A
+            assert bc.index.lookup_file('file.txt').crc32c == expected_crc
 
 
 if __name__ == '__main__':
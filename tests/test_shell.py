@@ -2,36 +2,51 @@
 
 import os
 import shutil
-import tempfile
 
 import pytest
 
 import barecat
 from barecat.cli.shell import BarecatShell
+from barecat.util import glob_helper
+from barecat.util.glob_to_regex import glob_to_regex
+
+
+def _run(shell, capsys, *commands):
+    """Run shell commands in order and return everything they printed."""
+    for command in commands:
+        shell.onecmd(command)
+    return capsys.readouterr().out
+
+
+@pytest.fixture(scope='module')
+def shared_archive(tmp_path_factory):
+    """Create the test archive once; the shells of the tests below only read it."""
+    archive_path = str(tmp_path_factory.mktemp('shell_archive') / 'test')
+    with barecat.Barecat(archive_path, readonly=False) as bc:
+        bc.update(
+            {
+                'file1.txt': b'hello world',
+                'dir1/file2.txt': b'nested file content',
+                'dir1/subdir/file3.txt': b'deeply nested',
+                'dir2/another.txt': b'another file',
+            }
+        )
+    return archive_path
 
 
 @pytest.fixture
-def archive_with_shell():
-    """Create a test archive and shell."""
-    tmpdir = tempfile.mkdtemp()
-    archive_path = os.path.join(tmpdir, 'test')
+def archive_with_shell(shared_archive, tmp_path):
+    """Open a read-only shell on the shared archive, with its own local directory."""
+    tmpdir = str(tmp_path)
     extract_dir = os.path.join(tmpdir, 'extracted')
     os.makedirs(extract_dir)
 
-    # Create test archive
-    with barecat.Barecat(archive_path, readonly=False) as bc:
-        bc['file1.txt'] = b'hello world'
-        bc['dir1/file2.txt'] = b'nested file content'
-        bc['dir1/subdir/file3.txt'] = b'deeply nested'
-        bc['dir2/another.txt'] = b'another file'
-
-    shell = BarecatShell(archive_path)
+    shell = BarecatShell(shared_archive)
     shell.local_cwd = extract_dir
 
-    yield shell, archive_path, extract_dir, tmpdir
+    yield shell, shared_archive, extract_dir, tmpdir
 
     shell.close()
-    shutil.rmtree(tmpdir)
 
 
 class TestNavigation:
@@ -44,25 +59,18 @@ class TestNavigation:
 
     def test_cd_and_pwd(self, archive_with_shell, capsys):
         shell, _, _, _ = archive_with_shell
-        shell.onecmd('cd dir1')
-        shell.onecmd('pwd')
-        captured = capsys.readouterr()
-        assert '/dir1' in captured.out
+        out = _run(shell, capsys, 'cd dir1', 'pwd')
+        assert '/dir1' in out
 
     def test_cd_subdir(self, archive_with_shell, capsys):
         shell, _, _, _ = archive_with_shell
-        shell.onecmd('cd dir1/subdir')
-        shell.onecmd('pwd')
-        captured = capsys.readouterr()
-        assert '/dir1/subdir' in captured.out
+        out = _run(shell, capsys, 'cd dir1/subdir', 'pwd')
+        assert '/dir1/subdir' in out
 
     def test_cd_back_to_root(self, archive_with_shell, capsys):
         shell, _, _, _ = archive_with_shell
-        shell.onecmd('cd dir1')
-        shell.onecmd('cd /')
-        shell.onecmd('pwd')
-        captured = capsys.readouterr()
-        assert captured.out.strip() == '/'
+        out = _run(shell, capsys, 'cd dir1', 'cd /', 'pwd')
+        assert out.strip() == '/'
 
 
 class TestListing:
@@ -70,37 +78,33 @@ class TestListing:
 
     def test_ls_root(self, archive_with_shell, capsys):
         shell, _, _, _ = archive_with_shell
-        shell.onecmd('ls')
-        captured = capsys.readouterr()
-        assert 'dir1/' in captured.out
-        assert 'dir2/' in captured.out
-        assert 'file1.txt' in captured.out
+        out = _run(shell, capsys, 'ls')
+        assert 'dir1/' in out
+        assert 'dir2/' in out
+        assert 'file1.txt' in out
 
     def test_ls_long(self, archive_with_shell, capsys):
         shell, _, _, _ = archive_with_shell
-        shell.onecmd('ls -l')
-        captured = capsys.readouterr()
+        out = _run(shell, capsys, 'ls -l')
         # Long format should show total, permissions, sizes
-        assert 'total' in captured.out
-        assert 'dir1' in captured.out
-        assert 'file1.txt' in captured.out
+        assert 'total' in out
+        assert 'dir1' in out
+        assert 'file1.txt' in out
 
     def test_ls_subdir(self, archive_with_shell, capsys):
         shell, _, _, _ = archive_with_shell
-        shell.onecmd('ls dir1')
-        captured = capsys.readouterr()
-        assert 'file2.txt' in captured.out
-        assert 'subdir/' in captured.out
+        out = _run(shell, capsys, 'ls dir1')
+        assert 'file2.txt' in out
+        assert 'subdir/' in out
 
     def test_tree(self, archive_with_shell, capsys):
         shell, _, _, _ = archive_with_shell
-        shell.onecmd('tree')
-        captured = capsys.readouterr()
+        out = _run(shell, capsys, 'tree')
         # tree command doesn't add trailing slashes (like real /usr/bin/tree)
-        assert 'dir1' in captured.out
-        assert 'file2.txt' in captured.out
-        assert 'subdir' in captured.out
-        assert 'file3.txt' in captured.out
+        assert 'dir1' in out
+        assert 'file2.txt' in out
+        assert 'subdir' in out
+        assert 'file3.txt' in out
 
 
 class TestFileOperations:
@@ -108,36 +112,31 @@ class TestFileOperations:
 
     def test_cat(self, archive_with_shell, capsys):
         shell, _, _, _ = archive_with_shell
-        shell.onecmd('cat file1.txt')
-        captured = capsys.readouterr()
-        assert 'hello world' in captured.out
+        out = _run(shell, capsys, 'cat file1.txt')
+        assert 'hello world' in out
 
     def test_cat_nested(self, archive_with_shell, capsys):
         shell, _, _, _ = archive_with_shell
-        shell.onecmd('cat dir1/file2.txt')
-        captured = capsys.readouterr()
-        assert 'nested file content' in captured.out
+        out = _run(shell, capsys, 'cat dir1/file2.txt')
+        assert 'nested file content' in out
 
     def test_stat_file(self, archive_with_shell, capsys):
         shell, _, _, _ = archive_with_shell
-        shell.onecmd('stat file1.txt')
-        captured = capsys.readouterr()
-        assert 'File:' in captured.out
-        assert 'Size:' in captured.out
-        assert 'Shard:' in captured.out
+        out = _run(shell, capsys, 'stat file1.txt')
+        assert 'File:' in out
+        assert 'Size:' in out
+        assert 'Shard:' in out
 
     def test_stat_dir(self, archive_with_shell, capsys):
         shell, _, _, _ = archive_with_shell
-        shell.onecmd('stat dir1')
-        captured = capsys.readouterr()
-        assert 'Dir:' in captured.out
-        assert 'Files:' in captured.out
+        out = _run(shell, capsys, 'stat dir1')
+        assert 'Dir:' in out
+        assert 'Files:' in out
 
     def test_head(self, archive_with_shell, capsys):
         shell, _, _, _ = archive_with_shell
-        shell.onecmd('head -n 5 file1.txt')
-        captured = capsys.readouterr()
-        assert 'hello' in captured.out
+        out = _run(shell, capsys, 'head -n 5 file1.txt')
+        assert 'hello' in out
 
 
 class TestFind:
@@ -145,19 +144,17 @@ class TestFind:
 
     def test_find_by_name(self, archive_with_shell, capsys):
         shell, _, _, _ = archive_with_shell
-        shell.onecmd("find -name '*.txt'")
-        captured = capsys.readouterr()
-        assert 'dir1/file2.txt' in captured.out
-        assert 'dir1/subdir/file3.txt' in captured.out
-        assert 'file1.txt' in captured.out
+        out = _run(shell, capsys, "find -name '*.txt'")
+        assert 'dir1/file2.txt' in out
+        assert 'dir1/subdir/file3.txt' in out
+        assert 'file1.txt' in out
 
     def test_find_from_path(self, archive_with_shell, capsys):
         shell, _, _, _ = archive_with_shell
-        shell.onecmd("find dir1 -name '*.txt'")
-        captured = capsys.readouterr()
-        assert 'file2.txt' in captured.out
-        assert 'file3.txt' in captured.out
-        assert 'file1.txt' not in captured.out
+        out = _run(shell, capsys, "find dir1 -name '*.txt'")
+        assert 'file2.txt' in out
+        assert 'file3.txt' in out
+        assert 'file1.txt' not in out
 
 
 class TestInfo:
@@ -165,18 +162,16 @@ class TestInfo:
 
     def test_info(self, archive_with_shell, capsys):
         shell, _, _, _ = archive_with_shell
-        shell.onecmd('info')
-        captured = capsys.readouterr()
-        assert 'Archive:' in captured.out
-        assert 'Files:' in captured.out
-        assert '4' in captured.out  # 4 files
+        out = _run(shell, capsys, 'info')
+        assert 'Archive:' in out
+        assert 'Files:' in out
+        assert '4' in out  # 4 files
 
     def test_du(self, archive_with_shell, capsys):
         shell, _, _, _ = archive_with_shell
-        shell.onecmd('du dir1')
-        captured = capsys.readouterr()
+        out = _run(shell, capsys, 'du dir1')
         # Should show size and path
-        assert 'dir1' in captured.out
+        assert 'dir1' in out
 
 
 class TestLocalNavigation:
@@ -184,25 +179,21 @@ class TestLocalNavigation:
 
     def test_lpwd(self, archive_with_shell, capsys):
         shell, _, extract_dir, _ = archive_with_shell
-        shell.onecmd('lpwd')
-        captured = capsys.readouterr()
-        assert extract_dir in captured.out
+        out = _run(shell, capsys, 'lpwd')
+        assert extract_dir in out
 
     def test_lcd(self, archive_with_shell, capsys):
         shell, _, _, tmpdir = archive_with_shell
-        shell.onecmd(f'lcd {tmpdir}')
-        shell.onecmd('lpwd')
-        captured = capsys.readouterr()
-        assert tmpdir in captured.out
+        out = _run(shell, capsys, f'lcd {tmpdir}', 'lpwd')
+        assert tmpdir in out
 
     def test_lls(self, archive_with_shell, capsys):
         shell, _, extract_dir, _ = archive_with_shell
         # Create a local file
         with open(os.path.join(extract_dir, 'local.txt'), 'w') as f:
             f.write('test')
-        shell.onecmd('lls')
-        captured = capsys.readouterr()
-        assert 'local.txt' in captured.out
+        out = _run(shell, capsys, 'lls')
+        assert 'local.txt' in out
 
 
 class TestExtract:
@@ -211,7 +202,6 @@ class TestExtract:
     def test_get_single_file(self, archive_with_shell):
         shell, _, extract_dir, _ = archive_with_shell
         shell.onecmd('get file1.txt')
-        assert os.path.exists(os.path.join(extract_dir, 'file1.txt'))
         with open(os.path.join(extract_dir, 'file1.txt'), 'rb') as f:
             assert f.read() == b'hello world'
 
@@ -236,113 +226,113 @@ class TestExtract:
         assert os.path.exists(os.path.join(out_dir, 'file2.txt'))
         assert os.path.exists(os.path.join(out_dir, 'file3.txt'))
 
+    def test_mget_translates_pattern_once(self, archive_with_shell, monkeypatch):
+        shell, _, extract_dir, _ = archive_with_shell
+        calls = []
+
+        def counting_glob_to_regex(pattern, **kwargs):
+            calls.append(pattern)
+            return glob_to_regex(pattern, **kwargs)
+
+        monkeypatch.setattr(glob_helper, 'glob_to_regex', counting_glob_to_regex)
+        shell.onecmd(f'mget **/*.txt {extract_dir}')
+        # The pattern is compiled per mget call, not per candidate file
+        assert len(calls) == 1
+        assert len(os.listdir(extract_dir)) == 4
+
 
 class TestShellEscape:
     """Test shell escape command."""
 
+    @pytest.mark.skipif(shutil.which('ls') is None, reason='needs a POSIX shell with ls')
     def test_shell_escape(self, archive_with_shell):
         shell, _, extract_dir, _ = archive_with_shell
         # Create a file to list
-        test_file = os.path.join(extract_dir, 'test.txt')
-        with open(test_file, 'w') as f:
+        with open(os.path.join(extract_dir, 'test.txt'), 'w') as f:
             f.write('test')
-        # Shell escape runs in subprocess, output not captured by pytest
-        # Just verify it doesn't error
-        shell.onecmd('!ls')
-        # Verify command ran in correct directory by checking side effect
-        shell.onecmd(f'!touch {extract_dir}/touched.txt')
-        assert os.path.exists(os.path.join(extract_dir, 'touched.txt'))
+        # Shell escape runs in a subprocess, whose output is not captured by pytest.
+        # A relative redirect shows both that it ran and that it ran in the local cwd
+        shell.onecmd('!ls > listing.txt')
+        with open(os.path.join(extract_dir, 'listing.txt')) as f:
+            assert 'test.txt' in f.read().split()
 
 
 class TestWriteOperations:
     """Test write operations (put, rm, mv)."""
 
-    def test_put(self):
-        tmpdir = tempfile.mkdtemp()
-        try:
-            archive_path = os.path.join(tmpdir, 'test')
-            local_dir = os.path.join(tmpdir, 'local')
-            os.makedirs(local_dir)
-
-            # Create test archive
-            with barecat.Barecat(archive_path, readonly=False) as bc:
-                bc['existing.txt'] = b'existing content'
-
-            # Create local file to put
-            with open(os.path.join(local_dir, 'newfile.txt'), 'wb') as f:
-                f.write(b'new content')
-
-            # Run shell command and close to commit
-            with BarecatShell(archive_path, readonly=False) as shell:
-                shell.local_cwd = local_dir
-                shell.onecmd('put newfile.txt')
-
-            # Verify file was added
-            with barecat.Barecat(archive_path) as bc:
-                assert bc['newfile.txt'] == b'new content'
-        finally:
-            shutil.rmtree(tmpdir)
-
-    def test_put_with_dest(self):
-        tmpdir = tempfile.mkdtemp()
-        try:
-            archive_path = os.path.join(tmpdir, 'test')
-            local_dir = os.path.join(tmpdir, 'local')
-            os.makedirs(local_dir)
-
-            with barecat.Barecat(archive_path, readonly=False) as bc:
-                bc['existing.txt'] = b'existing content'
-
-            with open(os.path.join(local_dir, 'newfile.txt'), 'wb') as f:
-                f.write(b'new content')
-
-            with BarecatShell(archive_path, readonly=False) as shell:
-                shell.local_cwd = local_dir
-                shell.onecmd('put newfile.txt subdir/renamed.txt')
-
-            with barecat.Barecat(archive_path) as bc:
-                assert bc['subdir/renamed.txt'] == b'new content'
-        finally:
-            shutil.rmtree(tmpdir)
-
-    def test_rm(self):
-        tmpdir = tempfile.mkdtemp()
-        try:
-            archive_path = os.path.join(tmpdir, 'test')
-
-            with barecat.Barecat(archive_path, readonly=False) as bc:
-                bc['existing.txt'] = b'existing content'
-
-            with BarecatShell(archive_path, readonly=False) as shell:
-                shell.onecmd('rm existing.txt')
-
-            with barecat.Barecat(archive_path) as bc:
-                assert 'existing.txt' not in bc
-        finally:
-            shutil.rmtree(tmpdir)
-
-    def test_mv(self):
-        tmpdir = tempfile.mkdtemp()
-        try:
-            archive_path = os.path.join(tmpdir, 'test')
-
-            with barecat.Barecat(archive_path, readonly=False) as bc:
-                bc['existing.txt'] = b'existing content'
-
-            with BarecatShell(archive_path, readonly=False) as shell:
-                shell.onecmd('mv existing.txt renamed.txt')
-
-            with barecat.Barecat(archive_path) as bc:
-                assert 'existing.txt' not in bc
-                assert bc['renamed.txt'] == b'existing content'
-        finally:
-            shutil.rmtree(tmpdir)
+    def test_put(self, tmp_path):
+        tmpdir = str(tmp_path)
+        archive_path = os.path.join(tmpdir, 'test')
+        local_dir = os.path.join(tmpdir, 'local')
+        os.makedirs(local_dir)
+
+        # Create test archive
+        with barecat.Barecat(archive_path, readonly=False) as bc:
+            bc['existing.txt'] = b'existing content'
+
+        # Create local file to put
+        with open(os.path.join(local_dir, 'newfile.txt'), 'wb') as f:
+            f.write(b'new content')
+
+        # Run shell command and close to commit
+        with BarecatShell(archive_path, readonly=False) as shell:
+            shell.local_cwd = local_dir
+            shell.onecmd('put newfile.txt')
+
+        # Verify file was added
+        with barecat.Barecat(archive_path) as bc:
+            assert bc['newfile.txt'] == b'new content'
+
+    def test_put_with_dest(self, tmp_path):
+        tmpdir = str(tmp_path)
+        archive_path = os.path.join(tmpdir, 'test')
+        local_dir = os.path.join(tmpdir, 'local')
+        os.makedirs(local_dir)
+
+        with barecat.Barecat(archive_path, readonly=False) as bc:
+            bc['existing.txt'] = b'existing content'
+
+        with open(os.path.join(local_dir, 'newfile.txt'), 'wb') as f:
+            f.write(b'new content')
+
+        with BarecatShell(archive_path, readonly=False) as shell:
+            shell.local_cwd = local_dir
+            shell.onecmd('put newfile.txt subdir/renamed.txt')
+
+        with barecat.Barecat(archive_path) as bc:
+            assert bc['subdir/renamed.txt'] == b'new content'
+
+    def test_rm(self, tmp_path):
+        tmpdir = str(tmp_path)
+        archive_path = os.path.join(tmpdir, 'test')
+
+        with barecat.Barecat(archive_path, readonly=False) as bc:
+            bc['existing.txt'] = b'existing content'
+
+        with BarecatShell(archive_path, readonly=False) as shell:
+            shell.onecmd('rm existing.txt')
+
+        with barecat.Barecat(archive_path) as bc:
+            assert 'existing.txt' not in bc
+
+    def test_mv(self, tmp_path):
+        tmpdir = str(tmp_path)
+        archive_path = os.path.join(tmpdir, 'test')
+
+        with barecat.Barecat(archive_path, readonly=False) as bc:
+            bc['existing.txt'] = b'existing content'
+
+        with BarecatShell(archive_path, readonly=False) as shell:
+            shell.onecmd('mv existing.txt renamed.txt')
+
+        with barecat.Barecat(archive_path) as bc:
+            assert 'existing.txt' not in bc
+            assert bc['renamed.txt'] == b'existing content'
 
     def test_readonly_rejects_write(self, archive_with_shell, capsys):
         shell, _, _, _ = archive_with_shell
-        shell.onecmd('put nonexistent.txt')
-        captured = capsys.readouterr()
-        assert 'read-only' in captured.out
+        out = _run(shell, capsys, 'put nonexistent.txt')
+        assert 'read-only' in out
 
 
 class TestDotCommands:
@@ -355,6 +345,5 @@ class TestDotCommands:
 
     def test_dot_ls(self, archive_with_shell, capsys):
         shell, _, _, _ = archive_with_shell
-        shell.onecmd('.ls')
-        captured = capsys.readouterr()
-        assert 'dir1/' in captured.out
+        out = _run(shell, capsys, '.ls')
+        assert 'dir1/' in out